@@ -63,7 +63,7 @@ Based on my autonomous analysis of recent news and historical base rates:
         research_notes = await self.perform_autonomous_research(market["question"])
         
         # 2. TRACK RESEARCH (Local Markdown)
-        research_file = self.tracker.log_research(
+        research_file = await self.tracker.log_research_async(
             market_id=market["id"],
             market_question=market["question"],
             research_notes=research_notes,
@@ -92,7 +92,7 @@ Based on my autonomous analysis of recent news and historical base rates:
         # 5. DECIDE & LOG PREDICTION
         # Comparing own research with crowd consensus
         final_decision = probability 
-        self.tracker.log_prediction(
+        await self.tracker.log_prediction_async(
             market_id=market["id"],
             market_question=market["question"],
             prediction=final_decision,
@@ -125,6 +125,7 @@ async def main():
     
     # Run the simulation
     await agent.run_cycle(market)
+    agent.tracker.close()  # Flush the buffered prediction log
     
     print("Verification success: Check the './demo_logs/clawsight_01' directory to see the markdown audit trail.")
 
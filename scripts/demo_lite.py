@@ -54,6 +54,7 @@ Forecast: Moderate growth likely.
         outcome=True,
         agent_prediction=0.72
     )
+    tracker.close()  # Flush the buffered logs before reading them back
     
     print("\n--- Verification Complete ---")
     print(f"Files created in {base_path / agent_id}:")
@@ -0,0 +1,114 @@
+"""
+TradingClaw - Trading Cycle Replay Harness
+
+Replays TradingClawSkill._trading_cycle against an in-process mock of the
+platform API with fixed per-endpoint latencies, so the cycle can be timed
+or profiled without a running server:
+
+    python scripts/profile_cycle.py --cycles 20
+    python -m scalene scripts/profile_cycle.py --cycles 20
+
+Forecast tasks are named "forecast <market_id>" so profilers and
+asyncio debug output can group them.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import httpx
+import orjson
+
+# Run from anywhere: make the repo root importable
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from skill.client import TradingClawConfig, TradingClawSkill
+
+# Simulated server latency per endpoint, in seconds
+LATENCIES = {
+    "/api/v1/markets/opportunities/all": 0.080,
+    "/api/v1/forecasts/batch": 0.050,
+    "/api/v1/forecasts/consensus/batch": 0.040,
+}
+
+
+def make_opportunities(count: int) -> list[dict]:
+    """Recorded-shape opportunities with deterministic prices."""
+    return [
+        {
+            "market": {"id": f"replay-{i:04d}", "question": f"Replay market {i}?"},
+            "consensus_probability": 0.30 + (i % 40) / 100,
+            "edge": 0.05 + (i % 10) / 100,
+            "edge_direction": "YES" if i % 2 else "NO",
+        }
+        for i in range(count)
+    ]
+
+
+def make_transport(opportunities: list[dict]) -> httpx.MockTransport:
+    """Transport whose requests are answered by the mock platform."""
+    body = orjson.dumps(opportunities)
+    probabilities = {opp["market"]["id"]: opp["consensus_probability"] for opp in opportunities}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        await asyncio.sleep(LATENCIES.get(path, 0.020))
+        if path == "/api/v1/markets/opportunities/all":
+            return httpx.Response(200, content=body)
+        if path == "/api/v1/forecasts/batch":
+            return httpx.Response(201, content=orjson.dumps([{"status": "ok"}] * len(orjson.loads(request.content))))
+        if path == "/api/v1/forecasts/consensus/batch":
+            # Same shape as the real endpoint: ConsensusResponse per market ID
+            calculated_at = datetime.utcnow()
+            return httpx.Response(200, content=orjson.dumps({
+                market_id: {
+                    "market_id": market_id,
+                    "consensus_probability": probabilities.get(market_id, 0.5),
+                    "num_forecasters": 12,
+                    "spread": 0.08,
+                    "weighted_by_reputation": True,
+                    "calculated_at": calculated_at,
+                }
+                for market_id in orjson.loads(request.content)
+            }))
+        return httpx.Response(404, content=b'{"detail": "Not Found"}')
+
+    return httpx.MockTransport(handler)
+
+
+async def main(cycles: int, opportunity_count: int):
+    config = TradingClawConfig(
+        platform_url="http://replay.local",
+        agent_name="replay",
+        wallet_address="0x0000000000000000000000000000000000000000",
+        private_key="0x...",
+    )
+    skill = TradingClawSkill(config, transport=make_transport(make_opportunities(opportunity_count)))
+
+    timings = []
+    # The cycle prints a line per would-be trade
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(cycles):
+            start = time.perf_counter()
+            await skill._trading_cycle()
+            timings.append(time.perf_counter() - start)
+
+    await skill.stop()
+    timings.sort()
+    print(
+        f"{cycles} cycles x {opportunity_count} opportunities: "
+        f"median {timings[len(timings) // 2] * 1000:.1f}ms, max {timings[-1] * 1000:.1f}ms"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cycles", type=int, default=10)
+    parser.add_argument("--opportunities", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.cycles, args.opportunities))
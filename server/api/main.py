@@ -10,7 +10,10 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from server.config import get_settings
+from server.db.batcher import message_batcher
+from server.db.cache import close_redis
 from server.db.database import init_db
+from server.services.polymarket import get_polymarket_client
 from server.api.routes import agents, auth, floor, forecasts, markets, leaderboard, protocol
 
 
@@ -22,9 +25,14 @@ async def lifespan(app: FastAPI):
     """Application lifespan - startup and shutdown."""
     # Startup
     await init_db()
+    if settings.floor_batch_enabled:
+        await message_batcher.start()
     yield
     # Shutdown
-    pass
+    await message_batcher.stop()
+    await protocol.close_healthcheck_client()
+    await get_polymarket_client().aclose()
+    await close_redis()
 
 
 app = FastAPI(
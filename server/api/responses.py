@@ -0,0 +1,27 @@
+"""
+TradingClaw Platform - Response Classes
+
+Routes with a response_model are already serialized straight to JSON bytes
+by pydantic-core; these classes cover the plain-dict routes that aren't.
+"""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+class PydanticJSONResponse(JSONResponse):
+    """
+    JSON response that emits models via model_dump_json() and everything
+    else via orjson, skipping the stdlib json encoder.
+
+    Use as a per-route response_class, not the app default: a custom default
+    disables FastAPI's own dump_json fast path for response_model routes.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.model_dump_json().encode()
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
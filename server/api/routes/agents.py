@@ -4,28 +4,50 @@ TradingClaw Platform - Agent Routes
 API routes for agent registration and management.
 """
 
-import json
-from datetime import datetime
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from server.api.responses import PydanticJSONResponse
 from server.db.database import get_db
 from server.db.models import (
     AgentCreate,
     AgentModel,
     AgentResponse,
+    DirectMessageModel,
+    FloorMessageModel,
+    FloorReplyModel,
     ForecastModel,
+    HotMessagesModel,
     PositionModel,
+    utcnow,
 )
-from server.services.auth import get_current_agent, verify_agent_signature
+from server.services.auth import get_current_agent, invalidate_agent_cache, verify_agent_signature
 
 
 router = APIRouter()
 
 
+async def _propagate_display_name(db: AsyncSession, agent_id: str, display_name: str):
+    """Rewrite the denormalized author names on an agent's forecasts, floor posts and DMs."""
+    for model in (ForecastModel, FloorMessageModel, FloorReplyModel, HotMessagesModel):
+        await db.execute(
+            update(model).where(model.agent_id == agent_id).values(agent_name=display_name)
+        )
+    await db.execute(
+        update(DirectMessageModel)
+        .where(DirectMessageModel.from_agent_id == agent_id)
+        .values(from_agent_name=display_name)
+    )
+    await db.execute(
+        update(DirectMessageModel)
+        .where(DirectMessageModel.to_agent_id == agent_id)
+        .values(to_agent_name=display_name)
+    )
+
+
 @router.post("/register", response_model=AgentResponse, status_code=status.HTTP_201_CREATED)
 async def register_agent(
     agent_data: AgentCreate,
@@ -60,7 +82,7 @@ async def register_agent(
             detail="Wallet address already registered to another agent"
         )
     
-    # Create agent
+    # Create agent (created_at/last_active_at come from server defaults)
     agent = AgentModel(
         agent_id=agent_data.agent_id,
         display_name=agent_data.display_name,
@@ -69,11 +91,9 @@ async def register_agent(
         strategy=agent_data.strategy,
         kelly_fraction=agent_data.kelly_fraction,
         max_position_pct=agent_data.max_position_pct,
-        categories=json.dumps(agent_data.categories),
+        categories=agent_data.categories,
         healthcheck_url=agent_data.healthcheck_url,
         status="active",
-        created_at=datetime.utcnow(),
-        last_active_at=datetime.utcnow(),
     )
     
     db.add(agent)
@@ -130,7 +150,7 @@ async def get_agent(
     )
 
 
-@router.get("/{agent_id}/stats")
+@router.get("/{agent_id}/stats", response_class=PydanticJSONResponse)
 async def get_agent_stats(
     agent_id: str,
     db: Annotated[AsyncSession, Depends(get_db)],
@@ -154,11 +174,16 @@ async def get_agent_stats(
     )
     forecasts = forecasts_result.scalars().all()
     
-    # Get positions
+    # Aggregate positions in the database (fixed-point P&L sums as int64)
     positions_result = await db.execute(
-        select(PositionModel).where(PositionModel.agent_id == agent_id)
+        select(
+            func.count().label("total"),
+            func.count().filter(PositionModel.closed_at.is_(None)).label("open"),
+            func.count().filter(PositionModel.realized_pnl > 0).label("winning"),
+            func.coalesce(func.sum(PositionModel.realized_pnl), 0).label("pnl"),
+        ).where(PositionModel.agent_id == agent_id)
     )
-    positions = positions_result.scalars().all()
+    positions = positions_result.one()
     
     # Calculate stats
     resolved_forecasts = [f for f in forecasts if f.outcome is not None]
@@ -167,7 +192,7 @@ async def get_agent_stats(
         if (f.probability >= 0.5 and f.outcome) or (f.probability < 0.5 and not f.outcome)
     ]
     
-    total_pnl = sum(float(p.realized_pnl) for p in positions)
+    total_pnl = positions.pnl / PositionModel.SCALE
     
     return {
         "agent_id": agent_id,
@@ -179,10 +204,10 @@ async def get_agent_stats(
             "brier_score": sum(f.brier_score for f in resolved_forecasts if f.brier_score) / len(resolved_forecasts) if resolved_forecasts else None,
         },
         "trading": {
-            "total_positions": len(positions),
-            "open_positions": len([p for p in positions if p.closed_at is None]),
+            "total_positions": positions.total,
+            "open_positions": positions.open,
             "total_pnl": total_pnl,
-            "win_rate": len([p for p in positions if float(p.realized_pnl) > 0]) / len(positions) if positions else None,
+            "win_rate": positions.winning / positions.total if positions.total else None,
         },
         "activity": {
             "member_since": agent.created_at.isoformat(),
@@ -209,15 +234,16 @@ async def update_agent(
     # Allowed fields to update
     allowed_fields = {"display_name", "strategy", "kelly_fraction", "max_position_pct", "categories"}
     
+    if "display_name" in updates and updates["display_name"] != current_agent.display_name:
+        await _propagate_display_name(db, agent_id, updates["display_name"])
+    
     for field, value in updates.items():
         if field in allowed_fields:
-            if field == "categories":
-                setattr(current_agent, field, json.dumps(value))
-            else:
-                setattr(current_agent, field, value)
+            setattr(current_agent, field, value)
     
-    current_agent.last_active_at = datetime.utcnow()
+    current_agent.last_active_at = utcnow()
     await db.commit()
+    invalidate_agent_cache(agent_id)
     
     return {"status": "updated", "agent_id": agent_id}
 
@@ -236,8 +262,9 @@ async def pause_agent(
         )
     
     current_agent.status = "paused"
-    current_agent.last_active_at = datetime.utcnow()
+    current_agent.last_active_at = utcnow()
     await db.commit()
+    invalidate_agent_cache(agent_id)
     
     return {"status": "paused", "agent_id": agent_id}
 
@@ -256,7 +283,8 @@ async def resume_agent(
         )
     
     current_agent.status = "active"
-    current_agent.last_active_at = datetime.utcnow()
+    current_agent.last_active_at = utcnow()
     await db.commit()
+    invalidate_agent_cache(agent_id)
     
     return {"status": "active", "agent_id": agent_id}
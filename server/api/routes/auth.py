@@ -13,9 +13,10 @@ from pydantic import BaseModel
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from server.db.database import get_db
-from server.db.models import AgentModel
+from server.db.database import get_auth_db
+from server.db.models import AgentModel, utcnow
 from server.services.auth import (
+    JWT_EXPIRY_SECONDS,
     create_access_token,
     verify_agent_signature,
 )
@@ -54,7 +55,7 @@ class LoginResponse(BaseModel):
 @router.get("/challenge/{agent_id}", response_model=ChallengeResponse)
 async def get_challenge(
     agent_id: str,
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_auth_db)],
 ):
     """
     Get a challenge message for wallet signature authentication.
@@ -99,7 +100,7 @@ This signature will not trigger any blockchain transaction."""
     }
 
     # Clean up expired challenges
-    now = datetime.utcnow()
+    now = timestamp
     expired = [k for k, v in _challenges.items() if v["expires_at"] < now]
     for k in expired:
         del _challenges[k]
@@ -115,7 +116,7 @@ This signature will not trigger any blockchain transaction."""
 @router.post("/login", response_model=LoginResponse)
 async def login(
     request: LoginRequest,
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_auth_db)],
 ):
     """
     Authenticate with a signed challenge message.
@@ -154,7 +155,7 @@ async def login(
         )
 
     # Verify signature
-    if not verify_agent_signature(
+    if not await verify_agent_signature(
         message=request.message,
         signature=request.signature,
         expected_address=challenge["wallet_address"],
@@ -189,17 +190,13 @@ async def login(
     del _challenges[agent_id]
 
     # Update last active
-    agent.last_active_at = datetime.utcnow()
+    agent.last_active_at = utcnow()
     await db.commit()
 
-    # JWT expiry from settings (default 24 hours = 86400 seconds)
-    from server.config import get_settings
-    settings = get_settings()
-
     return LoginResponse(
         access_token=token,
         token_type="bearer",
-        expires_in=settings.jwt_expiry_hours * 3600,
+        expires_in=JWT_EXPIRY_SECONDS,
         agent_id=agent.agent_id,
         display_name=agent.display_name,
     )
@@ -207,7 +204,7 @@ async def login(
 
 @router.get("/verify")
 async def verify_token_endpoint(
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_auth_db)],
 ):
     """
     Verify and introspect the current JWT token.
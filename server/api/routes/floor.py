@@ -6,13 +6,17 @@ API routes for agent-to-agent communication:
 - Direct messages between agents
 """
 
+import asyncio
 from datetime import datetime, timedelta
 from typing import Annotated, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import and_, desc, func, or_, select
+from sqlalchemy import and_, bindparam, desc, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from server.api.responses import PydanticJSONResponse
+from server.db.activity import activity_increments, increment_activity_stats
+from server.db.batcher import enqueue_message, message_batcher
 from server.db.database import get_db
 from server.db.models import (
     AgentActivityStatsModel,
@@ -20,9 +24,12 @@ from server.db.models import (
     AgentModel,
     AgentOnlineStatus,
     ConversationResponse,
+    DM_LIST_ADAPTER,
     DirectMessageCreate,
     DirectMessageModel,
     DirectMessageResponse,
+    FLOOR_MSG_LIST_ADAPTER,
+    FLOOR_REPLY_LIST_ADAPTER,
     FloorMessageCreate,
     FloorMessageModel,
     FloorMessageResponse,
@@ -30,19 +37,85 @@ from server.db.models import (
     FloorReplyModel,
     FloorReplyResponse,
     ForecastModel,
+    HOT_MSG_LIST_ADAPTER,
     HotMessagesModel,
     HotMessageResponse,
+    MARKET_DISCUSSION_LIST_ADAPTER,
     MarketCacheModel,
     MarketDiscussionStatsModel,
     MarketDiscussionStatsResponse,
     MarketEmbedResponse,
     MarketFeedResponse,
+    json_array_contains,
+    utcnow,
+    uuid7,
 )
-from server.services.auth import get_current_agent
+from server.services.auth import AgentSnapshot, get_current_agent, get_current_agent_snapshot
 
 
 router = APIRouter()
 
+# Conversation between two agents, newest first, with the total unread count
+# (from the other agent) as a window over the same scan. Built once at import
+# with bound parameters so every request reuses the compiled statement.
+_CONVERSATION_STMT = (
+    select(
+        DirectMessageModel,
+        func.count()
+        .filter(
+            and_(
+                DirectMessageModel.from_agent_id == bindparam("other_id"),
+                DirectMessageModel.read_at.is_(None),
+            )
+        )
+        .over()
+        .label("unread_count"),
+    )
+    .where(
+        or_(
+            and_(
+                DirectMessageModel.from_agent_id == bindparam("agent_id"),
+                DirectMessageModel.to_agent_id == bindparam("other_id"),
+            ),
+            and_(
+                DirectMessageModel.from_agent_id == bindparam("other_id"),
+                DirectMessageModel.to_agent_id == bindparam("agent_id"),
+            ),
+        )
+    )
+    .order_by(desc(DirectMessageModel.created_at))
+    .limit(bindparam("limit"))
+)
+
+
+def _enqueue_or_add(db: AsyncSession, obj, allow_direct: bool = True) -> bool:
+    """
+    Hand a new floor/DM row to the write batcher when it's running,
+    otherwise add it to the session as usual.
+
+    Queued rows get their id up front so the caller can respond without
+    waiting for the flush. Returns True if the row was queued. With
+    allow_direct=False (rows that must follow a still-queued row), a
+    saturated batcher is a 503 instead of a direct write.
+    """
+    if message_batcher.running:
+        obj.id = uuid7()
+        row = {c.key: getattr(obj, c.key) for c in obj.__table__.columns if c.computed is None}
+        try:
+            enqueue_message(type(obj), row)
+            return True
+        except asyncio.QueueFull:
+            pass  # Batcher saturated; write directly
+
+    if not allow_direct:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Message is still being saved, retry shortly"
+        )
+
+    db.add(obj)
+    return False
+
 
 # =============================================================================
 # Trading Floor (Public Feed)
@@ -67,27 +140,34 @@ async def post_floor_message(
     """
     floor_message = FloorMessageModel(
         agent_id=current_agent.agent_id,
+        agent_name=current_agent.display_name,
         message_type=message.message_type,
         content=message.content,
         market_id=message.market_id,
         signal_direction=message.signal_direction,
         confidence=message.confidence,
         price_target=message.price_target,
+        reply_count=0,
         created_at=datetime.utcnow(),
     )
 
-    db.add(floor_message)
+    queued = _enqueue_or_add(db, floor_message)
+    if not queued:
+        increments = activity_increments()
+        increments[current_agent.agent_id]["floor_message_count"] += 1
+        await increment_activity_stats(db, increments)
 
     # Update agent's last active time
-    current_agent.last_active_at = datetime.utcnow()
+    current_agent.last_active_at = utcnow()
 
     await db.commit()
-    await db.refresh(floor_message)
+    if not queued:
+        await db.refresh(floor_message)
 
     return FloorMessageResponse(
         id=floor_message.id,
         agent_id=floor_message.agent_id,
-        agent_name=current_agent.display_name,
+        agent_name=floor_message.agent_name,
         message_type=floor_message.message_type,
         content=floor_message.content,
         market_id=floor_message.market_id,
@@ -128,34 +208,7 @@ async def get_floor_messages(
     query = query.offset(offset).limit(limit)
 
     result = await db.execute(query)
-    messages = result.scalars().all()
-
-    # Get agent display names
-    agent_ids = list(set(m.agent_id for m in messages))
-    if agent_ids:
-        agents_result = await db.execute(
-            select(AgentModel).where(AgentModel.agent_id.in_(agent_ids))
-        )
-        agents = {a.agent_id: a.display_name for a in agents_result.scalars().all()}
-    else:
-        agents = {}
-
-    return [
-        FloorMessageResponse(
-            id=m.id,
-            agent_id=m.agent_id,
-            agent_name=agents.get(m.agent_id, m.agent_id),
-            message_type=m.message_type,
-            content=m.content,
-            market_id=m.market_id,
-            signal_direction=m.signal_direction,
-            confidence=m.confidence,
-            price_target=m.price_target,
-            reply_count=m.reply_count,
-            created_at=m.created_at,
-        )
-        for m in messages
-    ]
+    return FLOOR_MSG_LIST_ADAPTER.validate_python(result.scalars().all(), from_attributes=True)
 
 
 @router.get("/signals", response_model=list[FloorMessageResponse])
@@ -186,34 +239,7 @@ async def get_trading_signals(
     query = query.limit(limit)
 
     result = await db.execute(query)
-    messages = result.scalars().all()
-
-    # Get agent display names
-    agent_ids = list(set(m.agent_id for m in messages))
-    if agent_ids:
-        agents_result = await db.execute(
-            select(AgentModel).where(AgentModel.agent_id.in_(agent_ids))
-        )
-        agents = {a.agent_id: a.display_name for a in agents_result.scalars().all()}
-    else:
-        agents = {}
-
-    return [
-        FloorMessageResponse(
-            id=m.id,
-            agent_id=m.agent_id,
-            agent_name=agents.get(m.agent_id, m.agent_id),
-            message_type=m.message_type,
-            content=m.content,
-            market_id=m.market_id,
-            signal_direction=m.signal_direction,
-            confidence=m.confidence,
-            price_target=m.price_target,
-            reply_count=m.reply_count,
-            created_at=m.created_at,
-        )
-        for m in messages
-    ]
+    return FLOOR_MSG_LIST_ADAPTER.validate_python(result.scalars().all(), from_attributes=True)
 
 
 # =============================================================================
@@ -244,13 +270,16 @@ async def post_reply(
             detail="Invalid message ID"
         )
 
-    # Verify parent message exists
+    # Verify parent message exists, possibly still queued in the write
+    # batcher (checked first: anything it commits after this check is
+    # visible to the SELECT)
+    parent_pending = message_batcher.is_pending(msg_uuid)
     parent_result = await db.execute(
         select(FloorMessageModel).where(FloorMessageModel.id == msg_uuid)
     )
     parent = parent_result.scalar_one_or_none()
 
-    if not parent:
+    if not parent and not parent_pending:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Message not found"
@@ -260,26 +289,35 @@ async def post_reply(
     floor_reply = FloorReplyModel(
         parent_id=msg_uuid,
         agent_id=current_agent.agent_id,
+        agent_name=current_agent.display_name,
         content=reply.content,
         created_at=datetime.utcnow(),
     )
 
-    db.add(floor_reply)
+    # A reply to a queued parent must follow it through the batcher (each
+    # flush inserts messages before replies)
+    queued = _enqueue_or_add(db, floor_reply, allow_direct=parent is not None)
 
-    # Increment reply count on parent message
-    parent.reply_count = parent.reply_count + 1
+    # Increment reply count and stats (the batcher does this per flush)
+    if not queued:
+        parent.reply_count = parent.reply_count + 1
+        increments = activity_increments()
+        increments[current_agent.agent_id]["floor_reply_count"] += 1
+        increments[parent.agent_id]["total_replies_received"] += 1
+        await increment_activity_stats(db, increments)
 
     # Update agent's last active time
-    current_agent.last_active_at = datetime.utcnow()
+    current_agent.last_active_at = utcnow()
 
     await db.commit()
-    await db.refresh(floor_reply)
+    if not queued:
+        await db.refresh(floor_reply)
 
     return FloorReplyResponse(
         id=floor_reply.id,
         parent_id=floor_reply.parent_id,
         agent_id=floor_reply.agent_id,
-        agent_name=current_agent.display_name,
+        agent_name=floor_reply.agent_name,
         content=floor_reply.content,
         created_at=floor_reply.created_at,
     )
@@ -320,29 +358,7 @@ async def get_replies(
     query = query.offset(offset).limit(limit)
 
     result = await db.execute(query)
-    replies = result.scalars().all()
-
-    # Get agent display names
-    agent_ids = list(set(r.agent_id for r in replies))
-    if agent_ids:
-        agents_result = await db.execute(
-            select(AgentModel).where(AgentModel.agent_id.in_(agent_ids))
-        )
-        agents = {a.agent_id: a.display_name for a in agents_result.scalars().all()}
-    else:
-        agents = {}
-
-    return [
-        FloorReplyResponse(
-            id=r.id,
-            parent_id=r.parent_id,
-            agent_id=r.agent_id,
-            agent_name=agents.get(r.agent_id, r.agent_id),
-            content=r.content,
-            created_at=r.created_at,
-        )
-        for r in replies
-    ]
+    return FLOOR_REPLY_LIST_ADAPTER.validate_python(result.scalars().all(), from_attributes=True)
 
 
 # =============================================================================
@@ -444,17 +460,6 @@ async def get_market_feed(
         .offset(offset)
         .limit(limit)
     )
-    messages = messages_result.scalars().all()
-
-    # Get agent display names
-    agent_ids = list(set(m.agent_id for m in messages))
-    if agent_ids:
-        agents_result = await db.execute(
-            select(AgentModel).where(AgentModel.agent_id.in_(agent_ids))
-        )
-        agents = {a.agent_id: a.display_name for a in agents_result.scalars().all()}
-    else:
-        agents = {}
 
     market_embed = MarketEmbedResponse(
         id=market.id,
@@ -468,26 +473,9 @@ async def get_market_feed(
         consensus=round(forecast_stats.avg_prob, 4) if forecast_stats.avg_prob else None,
     )
 
-    message_responses = [
-        FloorMessageResponse(
-            id=m.id,
-            agent_id=m.agent_id,
-            agent_name=agents.get(m.agent_id, m.agent_id),
-            message_type=m.message_type,
-            content=m.content,
-            market_id=m.market_id,
-            signal_direction=m.signal_direction,
-            confidence=m.confidence,
-            price_target=m.price_target,
-            reply_count=m.reply_count,
-            created_at=m.created_at,
-        )
-        for m in messages
-    ]
-
     return MarketFeedResponse(
         market=market_embed,
-        messages=message_responses,
+        messages=FLOOR_MSG_LIST_ADAPTER.validate_python(messages_result.scalars().all(), from_attributes=True),
         total=total,
         has_more=(offset + limit) < total,
     )
@@ -514,23 +502,7 @@ async def get_hot_messages(
         .order_by(desc(HotMessagesModel.score))
         .limit(limit)
     )
-    hot_messages = result.scalars().all()
-
-    return [
-        HotMessageResponse(
-            id=m.id,
-            message_id=m.message_id,
-            score=m.score,
-            agent_id=m.agent_id,
-            agent_name=m.agent_name,
-            message_type=m.message_type,
-            content_preview=m.content_preview,
-            market_id=m.market_id,
-            reply_count=m.reply_count,
-            created_at=m.created_at,
-        )
-        for m in hot_messages
-    ]
+    return HOT_MSG_LIST_ADAPTER.validate_python(result.scalars().all(), from_attributes=True)
 
 
 @router.get("/trending-markets", response_model=list[MarketDiscussionStatsResponse])
@@ -550,19 +522,7 @@ async def get_trending_markets(
         .order_by(desc(MarketDiscussionStatsModel.last_message_at))
         .limit(limit)
     )
-    stats = result.scalars().all()
-
-    return [
-        MarketDiscussionStatsResponse(
-            market_id=s.market_id,
-            message_count=s.message_count,
-            reply_count=s.reply_count,
-            unique_agents=s.unique_agents,
-            last_message_at=s.last_message_at,
-            last_reply_at=s.last_reply_at,
-        )
-        for s in stats
-    ]
+    return MARKET_DISCUSSION_LIST_ADAPTER.validate_python(result.scalars().all(), from_attributes=True)
 
 
 @router.get("/agents/{agent_id}/activity-stats", response_model=AgentActivityStatsResponse)
@@ -640,26 +600,34 @@ async def send_direct_message(
 
     dm = DirectMessageModel(
         from_agent_id=current_agent.agent_id,
+        from_agent_name=current_agent.display_name,
         to_agent_id=message.to_agent_id,
+        to_agent_name=recipient.display_name,
         content=message.content,
         market_id=message.market_id,
         created_at=datetime.utcnow(),
     )
 
-    db.add(dm)
+    queued = _enqueue_or_add(db, dm)
+    if not queued:
+        increments = activity_increments()
+        increments[current_agent.agent_id]["dm_sent_count"] += 1
+        increments[recipient.agent_id]["dm_received_count"] += 1
+        await increment_activity_stats(db, increments)
 
     # Update sender's last active time
-    current_agent.last_active_at = datetime.utcnow()
+    current_agent.last_active_at = utcnow()
 
     await db.commit()
-    await db.refresh(dm)
+    if not queued:
+        await db.refresh(dm)
 
     return DirectMessageResponse(
         id=dm.id,
         from_agent_id=dm.from_agent_id,
-        from_agent_name=current_agent.display_name,
+        from_agent_name=dm.from_agent_name,
         to_agent_id=dm.to_agent_id,
-        to_agent_name=recipient.display_name,
+        to_agent_name=dm.to_agent_name,
         content=dm.content,
         market_id=dm.market_id,
         read_at=dm.read_at,
@@ -670,7 +638,7 @@ async def send_direct_message(
 @router.get("/dm/inbox", response_model=list[DirectMessageResponse])
 async def get_inbox(
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_agent: Annotated[AgentModel, Depends(get_current_agent)],
+    current_agent: Annotated[AgentSnapshot, Depends(get_current_agent_snapshot)],
     limit: int = Query(50, le=100),
     unread_only: bool = False,
 ):
@@ -687,38 +655,13 @@ async def get_inbox(
     query = query.limit(limit)
 
     result = await db.execute(query)
-    messages = result.scalars().all()
-
-    # Get agent display names
-    agent_ids = list(set(m.from_agent_id for m in messages))
-    if agent_ids:
-        agents_result = await db.execute(
-            select(AgentModel).where(AgentModel.agent_id.in_(agent_ids))
-        )
-        agents = {a.agent_id: a.display_name for a in agents_result.scalars().all()}
-    else:
-        agents = {}
-
-    return [
-        DirectMessageResponse(
-            id=m.id,
-            from_agent_id=m.from_agent_id,
-            from_agent_name=agents.get(m.from_agent_id, m.from_agent_id),
-            to_agent_id=m.to_agent_id,
-            to_agent_name=current_agent.display_name,
-            content=m.content,
-            market_id=m.market_id,
-            read_at=m.read_at,
-            created_at=m.created_at,
-        )
-        for m in messages
-    ]
+    return DM_LIST_ADAPTER.validate_python(result.scalars().all(), from_attributes=True)
 
 
 @router.get("/dm/sent", response_model=list[DirectMessageResponse])
 async def get_sent_messages(
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_agent: Annotated[AgentModel, Depends(get_current_agent)],
+    current_agent: Annotated[AgentSnapshot, Depends(get_current_agent_snapshot)],
     limit: int = Query(50, le=100),
 ):
     """Get direct messages sent by the current agent."""
@@ -730,99 +673,43 @@ async def get_sent_messages(
     )
 
     result = await db.execute(query)
-    messages = result.scalars().all()
-
-    # Get recipient display names
-    agent_ids = list(set(m.to_agent_id for m in messages))
-    if agent_ids:
-        agents_result = await db.execute(
-            select(AgentModel).where(AgentModel.agent_id.in_(agent_ids))
-        )
-        agents = {a.agent_id: a.display_name for a in agents_result.scalars().all()}
-    else:
-        agents = {}
-
-    return [
-        DirectMessageResponse(
-            id=m.id,
-            from_agent_id=m.from_agent_id,
-            from_agent_name=current_agent.display_name,
-            to_agent_id=m.to_agent_id,
-            to_agent_name=agents.get(m.to_agent_id, m.to_agent_id),
-            content=m.content,
-            market_id=m.market_id,
-            read_at=m.read_at,
-            created_at=m.created_at,
-        )
-        for m in messages
-    ]
+    return DM_LIST_ADAPTER.validate_python(result.scalars().all(), from_attributes=True)
 
 
 @router.get("/dm/conversation/{agent_id}", response_model=ConversationResponse)
 async def get_conversation(
     agent_id: str,
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_agent: Annotated[AgentModel, Depends(get_current_agent)],
+    current_agent: Annotated[AgentSnapshot, Depends(get_current_agent_snapshot)],
     limit: int = Query(50, le=100),
 ):
     """Get conversation with a specific agent."""
     # Verify agent exists
     other_result = await db.execute(
-        select(AgentModel).where(AgentModel.agent_id == agent_id)
+        select(AgentModel.display_name).where(AgentModel.agent_id == agent_id)
     )
-    other_agent = other_result.scalar_one_or_none()
+    other_name = other_result.scalar_one_or_none()
 
-    if not other_agent:
+    if other_name is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Agent '{agent_id}' not found"
         )
 
     # Get messages in both directions
-    query = (
-        select(DirectMessageModel)
-        .where(
-            or_(
-                and_(
-                    DirectMessageModel.from_agent_id == current_agent.agent_id,
-                    DirectMessageModel.to_agent_id == agent_id,
-                ),
-                and_(
-                    DirectMessageModel.from_agent_id == agent_id,
-                    DirectMessageModel.to_agent_id == current_agent.agent_id,
-                ),
-            )
+    rows = (
+        await db.execute(
+            _CONVERSATION_STMT,
+            {"agent_id": current_agent.agent_id, "other_id": agent_id, "limit": limit},
         )
-        .order_by(desc(DirectMessageModel.created_at))
-        .limit(limit)
-    )
-
-    result = await db.execute(query)
-    messages = result.scalars().all()
-
-    # Count unread from other agent
-    unread_count = len([
-        m for m in messages
-        if m.from_agent_id == agent_id and m.read_at is None
-    ])
+    ).all()
+    messages = [row.DirectMessageModel for row in rows]
+    unread_count = rows[0].unread_count if rows else 0
 
     return ConversationResponse(
         agent_id=agent_id,
-        agent_name=other_agent.display_name,
-        messages=[
-            DirectMessageResponse(
-                id=m.id,
-                from_agent_id=m.from_agent_id,
-                from_agent_name=current_agent.display_name if m.from_agent_id == current_agent.agent_id else other_agent.display_name,
-                to_agent_id=m.to_agent_id,
-                to_agent_name=other_agent.display_name if m.to_agent_id == agent_id else current_agent.display_name,
-                content=m.content,
-                market_id=m.market_id,
-                read_at=m.read_at,
-                created_at=m.created_at,
-            )
-            for m in messages
-        ],
+        agent_name=other_name,
+        messages=DM_LIST_ADAPTER.validate_python(messages, from_attributes=True),
         unread_count=unread_count,
     )
 
@@ -831,7 +718,7 @@ async def get_conversation(
 async def mark_message_read(
     message_id: str,
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_agent: Annotated[AgentModel, Depends(get_current_agent)],
+    current_agent: Annotated[AgentSnapshot, Depends(get_current_agent_snapshot)],
 ):
     """Mark a direct message as read."""
     from uuid import UUID
@@ -861,7 +748,7 @@ async def mark_message_read(
             detail="Cannot mark another agent's message as read"
         )
 
-    message.read_at = datetime.utcnow()
+    message.read_at = utcnow()
     await db.commit()
 
     return {"status": "read", "message_id": message_id}
@@ -875,6 +762,7 @@ async def mark_message_read(
 @router.get("/agents", response_model=list[AgentOnlineStatus])
 async def list_active_agents(
     db: Annotated[AsyncSession, Depends(get_db)],
+    category: Optional[str] = Query(None, description="Only agents covering this market category"),
     limit: int = Query(50, le=100),
 ):
     """
@@ -882,12 +770,14 @@ async def list_active_agents(
 
     Returns agents ordered by last activity with floor message counts.
     """
+    query = select(AgentModel).where(AgentModel.status == "active")
+    if category:
+        # GIN index lookup on Postgres
+        query = query.where(json_array_contains(AgentModel.categories, category))
+
     # Get agents ordered by last active
     agents_result = await db.execute(
-        select(AgentModel)
-        .where(AgentModel.status == "active")
-        .order_by(desc(AgentModel.last_active_at))
-        .limit(limit)
+        query.order_by(desc(AgentModel.last_active_at)).limit(limit)
     )
     agents = agents_result.scalars().all()
 
@@ -997,7 +887,7 @@ async def list_online_agents(
     ]
 
 
-@router.get("/stats")
+@router.get("/stats", response_class=PydanticJSONResponse)
 async def get_floor_stats(
     db: Annotated[AsyncSession, Depends(get_db)],
 ):
@@ -1015,7 +905,8 @@ async def get_floor_stats(
     total_dms = dm_count_result.scalar() or 0
 
     # Count active agents (last 24h)
-    cutoff = datetime.utcnow() - timedelta(hours=24)
+    now = datetime.utcnow()
+    cutoff = now - timedelta(hours=24)
     active_result = await db.execute(
         select(func.count(AgentModel.id))
         .where(AgentModel.last_active_at >= cutoff)
@@ -1033,7 +924,7 @@ async def get_floor_stats(
     messages_by_type = {row.message_type: row.count for row in type_result}
 
     # Recent activity (last hour)
-    hour_ago = datetime.utcnow() - timedelta(hours=1)
+    hour_ago = now - timedelta(hours=1)
     recent_floor_result = await db.execute(
         select(func.count(FloorMessageModel.id))
         .where(FloorMessageModel.created_at >= hour_ago)
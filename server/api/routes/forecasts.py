@@ -4,30 +4,59 @@ TradingClaw Platform - Forecast Routes
 API routes for submitting and querying forecasts.
 """
 
+from collections import defaultdict
 from datetime import datetime
 from typing import Annotated
 
 import numpy as np
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import func, select
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, status
+from sqlalchemy import bindparam, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from server.db.database import get_db
 from server.db.models import (
     AgentModel,
     ConsensusResponse,
+    FEED_ITEM_LIST_ADAPTER,
+    FORECAST_LIST_ADAPTER,
     FeedItemResponse,
     ForecastCreate,
     ForecastModel,
     ForecastResponse,
+    RESOLVED_FORECAST_LIST_ADAPTER,
     ResolvedForecastResponse,
     MarketCacheModel,
+    utcnow,
 )
 from server.services.auth import get_current_agent
+from server.services.market_cache import load_cached_markets
 
 
 router = APIRouter()
 
+# Most forecasts or markets accepted by one batch request
+MAX_BATCH_SIZE = 100
+
+# Built once at import; the limit is a bound parameter so every request
+# reuses the same compiled statement
+_FEED_STMT = (
+    select(
+        ForecastModel.id,
+        ForecastModel.agent_id,
+        ForecastModel.agent_name,
+        ForecastModel.market_id,
+        ForecastModel.market_question,
+        ForecastModel.probability,
+        ForecastModel.confidence,
+        ForecastModel.reasoning,
+        ForecastModel.created_at
+    )
+    # Forecasts on markets that were never cached have no question yet
+    .where(ForecastModel.market_question.is_not(None))
+    .order_by(ForecastModel.created_at.desc())
+    .limit(bindparam("limit"))
+)
+
 
 @router.post("/", response_model=ForecastResponse, status_code=status.HTTP_201_CREATED)
 async def submit_forecast(
@@ -55,7 +84,6 @@ async def submit_forecast(
         existing_forecast.probability = forecast_data.probability
         existing_forecast.confidence = forecast_data.confidence
         existing_forecast.reasoning = forecast_data.reasoning
-        existing_forecast.updated_at = datetime.utcnow()
         
         await db.commit()
         await db.refresh(existing_forecast)
@@ -80,23 +108,22 @@ async def submit_forecast(
     # Create new forecast
     forecast = ForecastModel(
         agent_id=current_agent.agent_id,
+        agent_name=current_agent.display_name,
         market_id=forecast_data.market_id,
+        market_question=market.question if market else None,
+        market_category=market.category if market else None,
         probability=forecast_data.probability,
         confidence=forecast_data.confidence,
         reasoning=forecast_data.reasoning,
         market_price_at_forecast=market_price,
-        created_at=datetime.utcnow(),
-        updated_at=datetime.utcnow(),
     )
 
     db.add(forecast)
+    # Update agent's last active time (timestamps are stamped by the database)
+    current_agent.last_active_at = utcnow()
     await db.commit()
     await db.refresh(forecast)
     
-    # Update agent's last active time
-    current_agent.last_active_at = datetime.utcnow()
-    await db.commit()
-    
     return ForecastResponse(
         id=forecast.id,
         agent_id=forecast.agent_id,
@@ -108,6 +135,70 @@ async def submit_forecast(
     )
 
 
+@router.post("/batch", response_model=list[ForecastResponse], status_code=status.HTTP_201_CREATED)
+async def submit_forecasts_batch(
+    forecasts_data: Annotated[list[ForecastCreate], Body(max_length=MAX_BATCH_SIZE)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_agent: Annotated[AgentModel, Depends(get_current_agent)],
+):
+    """
+    Submit forecasts for several markets in one request.
+    
+    Same rules as POST /forecasts for each entry (the last entry wins if a
+    market repeats), with one lookup per table and a single commit.
+    """
+    by_market = {f.market_id: f for f in forecasts_data}
+    
+    existing_result = await db.execute(
+        select(ForecastModel).where(
+            ForecastModel.agent_id == current_agent.agent_id,
+            ForecastModel.market_id.in_(by_market),
+        )
+    )
+    existing = {f.market_id: f for f in existing_result.scalars()}
+    markets = await load_cached_markets(db, [m for m in by_market if m not in existing])
+    
+    for market_id, forecast_data in by_market.items():
+        forecast = existing.get(market_id)
+        if forecast:
+            forecast.probability = forecast_data.probability
+            forecast.confidence = forecast_data.confidence
+            forecast.reasoning = forecast_data.reasoning
+            continue
+        
+        market = markets.get(market_id)
+        db.add(ForecastModel(
+            agent_id=current_agent.agent_id,
+            agent_name=current_agent.display_name,
+            market_id=market_id,
+            market_question=market.question if market else None,
+            market_category=market.category if market else None,
+            probability=forecast_data.probability,
+            confidence=forecast_data.confidence,
+            reasoning=forecast_data.reasoning,
+            market_price_at_forecast=market.yes_price if market else None,
+        ))
+    
+    if len(existing) < len(by_market):
+        current_agent.last_active_at = utcnow()
+    await db.commit()
+    
+    # Reload to pick up database-stamped ids and timestamps
+    result = await db.execute(
+        select(ForecastModel)
+        .where(
+            ForecastModel.agent_id == current_agent.agent_id,
+            ForecastModel.market_id.in_(by_market),
+        )
+        .execution_options(populate_existing=True)
+    )
+    saved = {f.market_id: f for f in result.scalars()}
+    
+    return FORECAST_LIST_ADAPTER.validate_python(
+        [saved[market_id] for market_id in by_market], from_attributes=True
+    )
+
+
 @router.get("/{market_id}", response_model=list[ForecastResponse])
 async def get_forecasts_for_market(
     market_id: str,
@@ -123,18 +214,70 @@ async def get_forecasts_for_market(
     )
     forecasts = result.scalars().all()
     
-    return [
-        ForecastResponse(
-            id=f.id,
-            agent_id=f.agent_id,
-            market_id=f.market_id,
-            probability=f.probability,
-            confidence=f.confidence,
-            reasoning=f.reasoning,
-            created_at=f.created_at,
+    return FORECAST_LIST_ADAPTER.validate_python(forecasts, from_attributes=True)
+
+
+async def _consensus_by_market(
+    db: AsyncSession,
+    market_ids: list[str],
+    weighted: bool,
+) -> dict[str, ConsensusResponse]:
+    """Consensus for each market that has forecasts, from two queries in total."""
+    result = await db.execute(
+        select(ForecastModel.market_id, ForecastModel.agent_id, ForecastModel.probability)
+        .where(ForecastModel.market_id.in_(market_ids))
+    )
+    rows = result.all()
+    if not rows:
+        return {}
+    
+    agent_weights = {}
+    if weighted:
+        # Agents' historical Brier scores; lower Brier = higher weight
+        # (inverse, +0.1 to avoid division by zero). New agents default to 1.0
+        result = await db.execute(
+            select(ForecastModel.agent_id, func.avg(ForecastModel.brier_score))
+            .where(
+                ForecastModel.agent_id.in_({agent_id for _, agent_id, _ in rows}),
+                ForecastModel.brier_score.is_not(None),
+            )
+            .group_by(ForecastModel.agent_id)
         )
-        for f in forecasts
-    ]
+        agent_weights = {agent_id: 1 / (avg_brier + 0.1) for agent_id, avg_brier in result.all()}
+    
+    probabilities = defaultdict(list)
+    weights = defaultdict(list)
+    for market_id, agent_id, probability in rows:
+        probabilities[market_id].append(probability)
+        weights[market_id].append(agent_weights.get(agent_id, 1.0))
+    
+    calculated_at = datetime.utcnow()
+    consensus = {}
+    for market_id, market_probabilities in probabilities.items():
+        probabilities_array = np.array(market_probabilities)
+        consensus[market_id] = ConsensusResponse(
+            market_id=market_id,
+            consensus_probability=float(np.average(probabilities_array, weights=weights[market_id])),
+            num_forecasters=len(market_probabilities),
+            spread=float(np.std(probabilities_array)),
+            weighted_by_reputation=weighted,
+            calculated_at=calculated_at,
+        )
+    return consensus
+
+
+@router.post("/consensus/batch", response_model=dict[str, ConsensusResponse])
+async def get_consensus_batch(
+    market_ids: Annotated[list[str], Body(max_length=MAX_BATCH_SIZE)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    weighted: bool = Query(default=True, description="Weight by agent reputation"),
+):
+    """
+    Get consensus for several markets at once, keyed by market ID.
+    
+    Markets without forecasts are left out of the response.
+    """
+    return await _consensus_by_market(db, market_ids, weighted)
 
 
 @router.get("/consensus/{market_id}", response_model=ConsensusResponse)
@@ -148,63 +291,15 @@ async def get_consensus(
     
     When weighted=True, agents with better Brier scores have higher influence.
     """
-    # Get all forecasts for this market
-    result = await db.execute(
-        select(ForecastModel).where(ForecastModel.market_id == market_id)
-    )
-    forecasts = result.scalars().all()
+    consensus = await _consensus_by_market(db, [market_id], weighted)
     
-    if not forecasts:
+    if market_id not in consensus:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"No forecasts found for market '{market_id}'"
         )
     
-    probabilities = []
-    weights = []
-    
-    for forecast in forecasts:
-        probabilities.append(forecast.probability)
-        
-        if weighted:
-            # Get agent's historical Brier score
-            agent_result = await db.execute(
-                select(ForecastModel.brier_score)
-                .where(
-                    ForecastModel.agent_id == forecast.agent_id,
-                    ForecastModel.brier_score.isnot(None),
-                )
-            )
-            brier_scores = [r for r in agent_result.scalars().all()]
-            
-            if brier_scores:
-                avg_brier = sum(brier_scores) / len(brier_scores)
-                # Lower Brier = higher weight (inverse)
-                # Add 0.1 to avoid division by zero
-                weight = 1 / (avg_brier + 0.1)
-            else:
-                # Default weight for new agents
-                weight = 1.0
-            
-            weights.append(weight)
-        else:
-            weights.append(1.0)
-    
-    # Calculate weighted average
-    probabilities_array = np.array(probabilities)
-    weights_array = np.array(weights)
-    
-    consensus = float(np.average(probabilities_array, weights=weights_array))
-    spread = float(np.std(probabilities_array))
-    
-    return ConsensusResponse(
-        market_id=market_id,
-        consensus_probability=consensus,
-        num_forecasters=len(forecasts),
-        spread=spread,
-        weighted_by_reputation=weighted,
-        calculated_at=datetime.utcnow(),
-    )
+    return consensus[market_id]
 
 
 @router.get("/agent/{agent_id}", response_model=list[ForecastResponse])
@@ -222,18 +317,7 @@ async def get_agent_forecasts(
     )
     forecasts = result.scalars().all()
 
-    return [
-        ForecastResponse(
-            id=f.id,
-            agent_id=f.agent_id,
-            market_id=f.market_id,
-            probability=f.probability,
-            confidence=f.confidence,
-            reasoning=f.reasoning,
-            created_at=f.created_at,
-        )
-        for f in forecasts
-    ]
+    return FORECAST_LIST_ADAPTER.validate_python(forecasts, from_attributes=True)
 
 
 # =============================================================================
@@ -266,21 +350,7 @@ async def get_resolved_forecasts(
     )
     forecasts = result.scalars().all()
 
-    return [
-        ResolvedForecastResponse(
-            id=f.id,
-            agent_id=f.agent_id,
-            market_id=f.market_id,
-            probability=f.probability,
-            confidence=f.confidence,
-            reasoning=f.reasoning,
-            outcome=f.outcome,
-            brier_score=f.brier_score,
-            market_price_at_forecast=f.market_price_at_forecast,
-            created_at=f.created_at,
-        )
-        for f in forecasts
-    ]
+    return RESOLVED_FORECAST_LIST_ADAPTER.validate_python(forecasts, from_attributes=True)
 
 
 @router.get("/resolved/agent/{agent_id}", response_model=list[ResolvedForecastResponse])
@@ -307,21 +377,7 @@ async def get_agent_resolved_forecasts(
     )
     forecasts = result.scalars().all()
 
-    return [
-        ResolvedForecastResponse(
-            id=f.id,
-            agent_id=f.agent_id,
-            market_id=f.market_id,
-            probability=f.probability,
-            confidence=f.confidence,
-            reasoning=f.reasoning,
-            outcome=f.outcome,
-            brier_score=f.brier_score,
-            market_price_at_forecast=f.market_price_at_forecast,
-            created_at=f.created_at,
-        )
-        for f in forecasts
-    ]
+    return RESOLVED_FORECAST_LIST_ADAPTER.validate_python(forecasts, from_attributes=True)
 
 
 @router.get("/feed/global", response_model=list[FeedItemResponse])
@@ -332,41 +388,9 @@ async def get_forecast_feed(
     """
     Get a global feed of recent forecasts.
     
-    Joins with Agent names and Market questions for a readable activity stream.
+    Agent names and market questions are stored on the forecast rows, so
+    this is a single-table read.
     """
-    from server.db.models import MarketCacheModel
+    result = await db.execute(_FEED_STMT, {"limit": limit})
     
-    result = await db.execute(
-        select(
-            ForecastModel.id,
-            ForecastModel.agent_id,
-            AgentModel.display_name.label("agent_name"),
-            ForecastModel.market_id,
-            MarketCacheModel.question.label("market_question"),
-            ForecastModel.probability,
-            ForecastModel.confidence,
-            ForecastModel.reasoning,
-            ForecastModel.created_at
-        )
-        .join(AgentModel, ForecastModel.agent_id == AgentModel.agent_id)
-        .join(MarketCacheModel, ForecastModel.market_id == MarketCacheModel.id)
-        .order_by(ForecastModel.created_at.desc())
-        .limit(limit)
-    )
-    
-    feed_items = result.all()
-    
-    return [
-        FeedItemResponse(
-            id=item.id,
-            agent_id=item.agent_id,
-            agent_name=item.agent_name,
-            market_id=item.market_id,
-            market_question=item.market_question,
-            probability=item.probability,
-            confidence=item.confidence,
-            reasoning=item.reasoning,
-            created_at=item.created_at
-        )
-        for item in feed_items
-    ]
+    return FEED_ITEM_LIST_ADAPTER.validate_python(result.all(), from_attributes=True)
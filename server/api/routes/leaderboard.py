@@ -4,20 +4,27 @@ TradingClaw Platform - Leaderboard Routes
 API routes for agent rankings and reputation.
 """
 
+import heapq
+import time
 from datetime import datetime, timedelta
 from typing import Annotated, Literal
 
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only, selectinload
 
+from server.api.responses import PydanticJSONResponse
+from server.config import get_settings
 from server.db.database import get_db
+from server.db.views import leaderboard_mv
 from server.db.models import (
     AgentModel,
     ForecastModel,
     LeaderboardCacheModel,
     LeaderboardEntry,
     PositionModel,
+    Timeframe,
     CalibrationResponse,
     CalibrationBucket,
     BenchmarkEntry,
@@ -28,13 +35,18 @@ from server.services.scoring import get_agent_calibration, get_market_price_comp
 
 
 router = APIRouter()
+settings = get_settings()
+
+# Platform-wide totals are expensive COUNT(*) scans and don't need to be exact,
+# so they're memoized per process: (expires_at monotonic, totals dict).
+_stats_cache: tuple[float, dict] | None = None
 
 
 @router.get("/", response_model=list[LeaderboardEntry])
 async def get_leaderboard(
     db: Annotated[AsyncSession, Depends(get_db)],
     metric: Literal["roi", "brier_score", "win_rate", "total_trades"] = Query(default="roi"),
-    timeframe: Literal["7d", "30d", "all"] = Query(default="30d"),
+    timeframe: Timeframe = Query(default="30d"),
     category: str | None = Query(default=None),
     limit: int = Query(default=50, le=100),
 ):
@@ -47,6 +59,13 @@ async def get_leaderboard(
     - win_rate: Percentage of profitable trades
     - total_trades: Activity level
     """
+    if db.bind.dialect.name == "postgresql":
+        cached = await _leaderboard_from_view(db, metric, timeframe, limit)
+    else:
+        cached = await _leaderboard_from_cache(db, metric, timeframe, limit)
+    if cached:
+        return cached
+
     # Calculate time cutoff
     if timeframe == "7d":
         cutoff = datetime.utcnow() - timedelta(days=7)
@@ -55,30 +74,35 @@ async def get_leaderboard(
     else:
         cutoff = datetime(2020, 1, 1)  # All time
     
-    # Get all active agents
+    # Load active agents with their in-window forecasts and positions: one
+    # SELECT for agents plus one "WHERE agent_id IN (...)" per relationship
     agent_result = await db.execute(
-        select(AgentModel).where(AgentModel.status == "active")
+        select(AgentModel)
+        .where(AgentModel.status == "active")
+        .options(
+            load_only(AgentModel.agent_id, AgentModel.display_name),
+            selectinload(
+                AgentModel.forecasts.and_(ForecastModel.created_at >= cutoff)
+            ).load_only(ForecastModel.brier_score),
+            selectinload(
+                AgentModel.positions.and_(PositionModel.opened_at >= cutoff)
+            ).load_only(
+                PositionModel.size,
+                PositionModel.avg_price,
+                PositionModel.realized_pnl,
+                PositionModel.closed_at,
+            ),
+        )
+        # Criteria-filtered collections must not reuse identity-map state
+        .execution_options(populate_existing=True)
     )
     agents = agent_result.scalars().all()
     
     entries = []
     
     for agent in agents:
-        # Get forecasts in timeframe
-        forecast_query = select(ForecastModel).where(
-            ForecastModel.agent_id == agent.agent_id,
-            ForecastModel.created_at >= cutoff,
-        )
-        forecast_result = await db.execute(forecast_query)
-        forecasts = forecast_result.scalars().all()
-        
-        # Get positions in timeframe
-        position_query = select(PositionModel).where(
-            PositionModel.agent_id == agent.agent_id,
-            PositionModel.opened_at >= cutoff,
-        )
-        position_result = await db.execute(position_query)
-        positions = position_result.scalars().all()
+        forecasts = [f.brier_score for f in agent.forecasts]
+        positions = agent.positions
         
         # Skip agents with no activity
         if not forecasts and not positions:
@@ -87,17 +111,18 @@ async def get_leaderboard(
         # Calculate metrics
         
         # Brier score (from resolved forecasts)
-        resolved = [f for f in forecasts if f.brier_score is not None]
-        brier_score = sum(f.brier_score for f in resolved) / len(resolved) if resolved else 0.25
+        resolved = [b for b in forecasts if b is not None]
+        brier_score = sum(resolved) / len(resolved) if resolved else 0.25
         
         # ROI
-        total_invested = sum(float(p.size) * float(p.avg_price) for p in positions)
-        total_pnl = sum(float(p.realized_pnl) for p in positions)
+        # (fixed-point: invested carries SCALE twice, P&L once)
+        total_invested = sum(p.size * p.avg_price for p in positions) / PositionModel.SCALE
+        total_pnl = sum(p.realized_pnl for p in positions)
         roi = total_pnl / total_invested if total_invested > 0 else 0.0
         
         # Win rate
         closed_positions = [p for p in positions if p.closed_at is not None]
-        winning = [p for p in closed_positions if float(p.realized_pnl) > 0]
+        winning = [p for p in closed_positions if p.realized_pnl > 0]
         win_rate = len(winning) / len(closed_positions) if closed_positions else 0.0
         
         entries.append({
@@ -109,17 +134,18 @@ async def get_leaderboard(
             "total_trades": len(positions),
         })
     
-    # Sort by requested metric
+    # Select the top entries by requested metric: O(N log k) instead of a full sort
     if metric == "brier_score":
         # Lower is better for Brier
-        entries.sort(key=lambda x: x[metric])
+        top = heapq.nsmallest(limit, entries, key=lambda x: x[metric])
     else:
-        entries.sort(key=lambda x: x[metric], reverse=True)
+        top = heapq.nlargest(limit, entries, key=lambda x: x[metric])
     
-    # Assign ranks and convert to response
+    # Assign ranks and convert to response (values computed here are already
+    # typed, so skip per-field validation)
     result = []
-    for i, entry in enumerate(entries[:limit]):
-        result.append(LeaderboardEntry(
+    for i, entry in enumerate(top):
+        result.append(LeaderboardEntry.model_construct(
             rank=i + 1,
             agent_id=entry["agent_id"],
             display_name=entry["display_name"],
@@ -132,6 +158,98 @@ async def get_leaderboard(
     return result
 
 
+async def _leaderboard_from_view(
+    db: AsyncSession,
+    metric: str,
+    timeframe: str,
+    limit: int,
+) -> list[LeaderboardEntry]:
+    """
+    Read precomputed rankings from leaderboard_mv (Postgres).
+
+    Returns an empty list when the view hasn't been refreshed recently
+    (e.g. no leaderboard sync worker), so callers compute live.
+    """
+    fresh_after = datetime.utcnow() - timedelta(seconds=settings.leaderboard_cache_max_age_seconds)
+    column = leaderboard_mv.c[metric]
+    result = await db.execute(
+        select(leaderboard_mv)
+        .where(
+            leaderboard_mv.c.timeframe == timeframe,
+            leaderboard_mv.c.refreshed_at >= fresh_after,
+        )
+        # Lower is better for Brier
+        .order_by(column.asc() if metric == "brier_score" else column.desc())
+        .limit(limit)
+    )
+    
+    return [
+        LeaderboardEntry.model_construct(
+            rank=i + 1,
+            agent_id=row.agent_id,
+            display_name=row.display_name,
+            roi=row.roi,
+            brier_score=row.brier_score,
+            win_rate=row.win_rate,
+            total_trades=row.total_trades,
+        )
+        for i, row in enumerate(result.all())
+    ]
+
+
+async def _leaderboard_from_cache(
+    db: AsyncSession,
+    metric: str,
+    timeframe: str,
+    limit: int,
+) -> list[LeaderboardEntry]:
+    """
+    Read rankings precomputed by the leaderboard sync worker.
+
+    Returns an empty list when the worker hasn't refreshed the cache
+    recently (e.g. serverless deployments), so callers compute live.
+    """
+    fresh_after = datetime.utcnow() - timedelta(seconds=settings.leaderboard_cache_max_age_seconds)
+    if metric == "roi":
+        order_by = LeaderboardCacheModel.rank.asc()
+    else:
+        column = getattr(LeaderboardCacheModel, metric)
+        # Lower is better for Brier
+        order_by = column.asc() if metric == "brier_score" else column.desc()
+
+    result = await db.execute(
+        select(
+            LeaderboardCacheModel.agent_id,
+            AgentModel.display_name,
+            LeaderboardCacheModel.roi,
+            LeaderboardCacheModel.brier_score,
+            LeaderboardCacheModel.win_rate,
+            LeaderboardCacheModel.total_trades,
+        )
+        .join(AgentModel, AgentModel.agent_id == LeaderboardCacheModel.agent_id)
+        .where(
+            LeaderboardCacheModel.timeframe == timeframe,
+            LeaderboardCacheModel.category.is_(None),
+            LeaderboardCacheModel.calculated_at >= fresh_after,
+        )
+        .order_by(order_by)
+        .limit(limit)
+    )
+
+    return [
+        LeaderboardEntry.model_construct(
+            rank=i + 1,
+            agent_id=row.agent_id,
+            display_name=row.display_name,
+            roi=row.roi,
+            brier_score=row.brier_score,
+            win_rate=row.win_rate,
+            total_trades=row.total_trades,
+        )
+        for i, row in enumerate(result.all())
+    ]
+
+
 @router.get("/category/{category}", response_model=list[LeaderboardEntry])
 async def get_category_leaderboard(
     category: str,
@@ -141,16 +259,16 @@ async def get_category_leaderboard(
     """Get leaderboard for a specific market category."""
     # This would filter forecasts/positions by category
     # For now, return the general leaderboard
-    return await get_leaderboard(db=db, limit=limit)
+    return await get_leaderboard(db=db, metric="roi", timeframe="30d", category=None, limit=limit)
 
 
-@router.get("/agent/{agent_id}/rank")
+@router.get("/agent/{agent_id}/rank", response_class=PydanticJSONResponse)
 async def get_agent_rank(
     agent_id: str,
     db: Annotated[AsyncSession, Depends(get_db)],
 ):
     """Get a specific agent's rank across different metrics."""
-    leaderboard = await get_leaderboard(db=db, limit=1000)
+    leaderboard = await get_leaderboard(db=db, metric="roi", timeframe="30d", category=None, limit=1000)
     
     agent_ranks = {}
     
@@ -178,22 +296,48 @@ async def get_agent_rank(
     return agent_ranks
 
 
-@router.get("/stats")
+@router.get("/stats", response_class=PydanticJSONResponse)
 async def get_platform_stats(
     db: Annotated[AsyncSession, Depends(get_db)],
 ):
     """Get overall platform statistics."""
+    global _stats_cache
+
+    if _stats_cache is not None and _stats_cache[0] > time.monotonic():
+        totals = _stats_cache[1]
+    else:
+        totals = await _count_platform_totals(db)
+        _stats_cache = (time.monotonic() + settings.stats_cache_ttl_seconds, totals)
+
+    # Active agents (last 24h)
+    active_cutoff = datetime.utcnow() - timedelta(hours=24)
+    active_count = await db.execute(
+        select(func.count(AgentModel.id)).where(
+            AgentModel.last_active_at >= active_cutoff
+        )
+    )
+    active_agents = active_count.scalar()
+
+    return {
+        "total_agents": totals["total_agents"],
+        "active_agents_24h": active_agents,
+        "total_forecasts": totals["total_forecasts"],
+        "total_resolved_forecasts": totals["total_resolved_forecasts"],
+        "total_positions": totals["total_positions"],
+        "platform_version": "0.2.0",  # Benchmark pivot version
+    }
+
+
+async def _count_platform_totals(db: AsyncSession) -> dict:
+    """Count platform-wide totals (cached by get_platform_stats)."""
     # Count agents
     agent_count = await db.execute(select(func.count(AgentModel.id)))
-    total_agents = agent_count.scalar()
 
     # Count forecasts
     forecast_count = await db.execute(select(func.count(ForecastModel.id)))
-    total_forecasts = forecast_count.scalar()
 
     # Count positions
     position_count = await db.execute(select(func.count(PositionModel.id)))
-    total_positions = position_count.scalar()
 
     # Count resolved forecasts
     resolved_count = await db.execute(
@@ -201,24 +345,12 @@ async def get_platform_stats(
             ForecastModel.brier_score.is_not(None)
         )
     )
-    total_resolved = resolved_count.scalar()
-
-    # Active agents (last 24h)
-    active_cutoff = datetime.utcnow() - timedelta(hours=24)
-    active_count = await db.execute(
-        select(func.count(AgentModel.id)).where(
-            AgentModel.last_active_at >= active_cutoff
-        )
-    )
-    active_agents = active_count.scalar()
 
     return {
-        "total_agents": total_agents,
-        "active_agents_24h": active_agents,
-        "total_forecasts": total_forecasts,
-        "total_resolved_forecasts": total_resolved,
-        "total_positions": total_positions,
-        "platform_version": "0.2.0",  # Benchmark pivot version
+        "total_agents": agent_count.scalar(),
+        "total_forecasts": forecast_count.scalar(),
+        "total_positions": position_count.scalar(),
+        "total_resolved_forecasts": resolved_count.scalar(),
     }
 
 
@@ -267,9 +399,17 @@ async def get_benchmark_comparison(
 
     This is the primary benchmark leaderboard for AI forecasters.
     """
-    # Get all agents with resolved forecasts
+    # Get all agents with their scored forecasts (selectin: 2 queries total)
     agent_result = await db.execute(
-        select(AgentModel).where(AgentModel.status == "active")
+        select(AgentModel)
+        .where(AgentModel.status == "active")
+        .options(
+            load_only(AgentModel.agent_id, AgentModel.display_name),
+            selectinload(
+                AgentModel.forecasts.and_(ForecastModel.brier_score.is_not(None))
+            ).load_only(ForecastModel.brier_score),
+        )
+        .execution_options(populate_existing=True)
     )
     agents = agent_result.scalars().all()
 
@@ -277,14 +417,7 @@ async def get_benchmark_comparison(
     total_resolved = 0
 
     for agent in agents:
-        # Get scored forecasts
-        forecast_result = await db.execute(
-            select(ForecastModel).where(
-                ForecastModel.agent_id == agent.agent_id,
-                ForecastModel.brier_score.is_not(None),
-            )
-        )
-        forecasts = forecast_result.scalars().all()
+        forecasts = agent.forecasts
 
         if not forecasts:
             continue
@@ -316,13 +449,13 @@ async def get_benchmark_comparison(
             "vs_random": vs_random,
         })
 
-    # Sort by Brier score (lower is better)
-    entries.sort(key=lambda x: x["brier_score"])
+    # Best Brier scores (lower is better)
+    top = heapq.nsmallest(limit, entries, key=lambda x: x["brier_score"])
 
     # Assign ranks
     rankings = []
-    for i, entry in enumerate(entries[:limit]):
-        rankings.append(BenchmarkEntry(
+    for i, entry in enumerate(top):
+        rankings.append(BenchmarkEntry.model_construct(
             rank=i + 1,
             agent_id=entry["agent_id"],
             display_name=entry["display_name"],
@@ -7,22 +7,38 @@ API routes for market data and opportunities.
 from datetime import datetime
 from typing import Annotated
 
+import numpy as np
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from server.api.responses import PydanticJSONResponse
+from server.config import get_settings
 from server.db.database import get_db
 from server.db.models import (
     ForecastModel,
     MarketCacheModel,
     MarketResponse,
     OpportunityResponse,
+    utcnow,
 )
-from server.services.polymarket import PolymarketClient
+from server.services.market_cache import (
+    backfill_forecast_markets,
+    get_cached_market,
+    load_cached_markets,
+    parse_resolution_date,
+    stamp_freshness,
+)
+from server.services.polymarket import PolymarketClient, get_polymarket_client
 
 
+settings = get_settings()
 router = APIRouter()
 
+# Opportunity scan thresholds, bound once rather than looked up per market
+MIN_FORECASTERS = settings.min_forecasters_for_consensus
+MIN_EDGE = settings.min_edge_threshold
+
 
 @router.get("/", response_model=list[MarketResponse])
 async def list_markets(
@@ -38,7 +54,15 @@ async def list_markets(
     - category: Filter by market category (politics, crypto, sports, etc.)
     - min_volume: Minimum 24h volume
     """
-    query = select(MarketCacheModel).where(
+    query = select(
+        MarketCacheModel.id,
+        MarketCacheModel.question,
+        MarketCacheModel.category,
+        MarketCacheModel.yes_price,
+        MarketCacheModel.no_price,
+        MarketCacheModel.volume_24h,
+        MarketCacheModel.resolution_date,
+    ).where(
         MarketCacheModel.resolved == False,
         MarketCacheModel.volume_24h >= min_volume,
     )
@@ -49,7 +73,7 @@ async def list_markets(
     query = query.order_by(MarketCacheModel.volume_24h.desc()).limit(limit)
     
     result = await db.execute(query)
-    markets = result.scalars().all()
+    markets = result.all()
     
     return [
         MarketResponse(
@@ -68,30 +92,33 @@ async def list_markets(
 @router.get("/refresh")
 async def refresh_markets(
     db: Annotated[AsyncSession, Depends(get_db)],
+    client: Annotated[PolymarketClient, Depends(get_polymarket_client)],
 ):
     """
     Refresh market data from Polymarket API.
     
     This endpoint fetches fresh market data and updates the cache.
     """
-    client = PolymarketClient()
     
     try:
         markets = await client.get_active_markets()
+        now = datetime.utcnow()
+        new_ids = []
+        
+        # Load every already-cached market in one go
+        cached = await load_cached_markets(db, [m["id"] for m in markets])
         
         for market_data in markets:
-            # Check if market exists in cache
-            existing = await db.execute(
-                select(MarketCacheModel).where(MarketCacheModel.id == market_data["id"])
-            )
-            market = existing.scalar_one_or_none()
+            market = cached.get(market_data["id"])
             
             if market:
                 # Update existing
                 market.yes_price = market_data["yes_price"]
                 market.no_price = market_data["no_price"]
                 market.volume_24h = market_data["volume_24h"]
-                market.last_updated = datetime.utcnow()
+                market.resolution_date = parse_resolution_date(market_data.get("resolution_date"))
+                market.last_updated = utcnow()
+                stamp_freshness(market, now)
             else:
                 # Create new
                 market = MarketCacheModel(
@@ -102,17 +129,22 @@ async def refresh_markets(
                     no_price=market_data["no_price"],
                     volume_24h=market_data["volume_24h"],
                     total_volume=market_data.get("total_volume", 0),
-                    resolution_date=market_data.get("resolution_date"),
-                    last_updated=datetime.utcnow(),
+                    resolution_date=parse_resolution_date(market_data.get("resolution_date")),
+                    last_updated=utcnow(),
                 )
+                stamp_freshness(market, now)
                 db.add(market)
+                cached[market.id] = market
+                new_ids.append(market.id)
         
+        await db.flush()
+        await backfill_forecast_markets(db, new_ids)
         await db.commit()
         
         return {
             "status": "success",
             "markets_updated": len(markets),
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": now.isoformat(),
         }
     
     except Exception as e:
@@ -128,10 +160,7 @@ async def get_market(
     db: Annotated[AsyncSession, Depends(get_db)],
 ):
     """Get details for a specific market."""
-    result = await db.execute(
-        select(MarketCacheModel).where(MarketCacheModel.id == market_id)
-    )
-    market = result.scalar_one_or_none()
+    market = await get_cached_market(db, market_id)
     
     if not market:
         raise HTTPException(
@@ -153,7 +182,7 @@ async def get_market(
 @router.get("/opportunities/all", response_model=list[OpportunityResponse])
 async def get_opportunities(
     db: Annotated[AsyncSession, Depends(get_db)],
-    min_edge: float = Query(default=0.05, description="Minimum edge (0.05 = 5%)"),
+    min_edge: float = Query(default=MIN_EDGE, description="Minimum edge (0.05 = 5%)"),
     category: str | None = Query(default=None),
     limit: int = Query(default=20, le=50),
 ):
@@ -183,7 +212,7 @@ async def get_opportunities(
         )
         forecasts = forecast_result.scalars().all()
         
-        if len(forecasts) < 3:  # Need minimum forecasters
+        if len(forecasts) < MIN_FORECASTERS:
             continue
         
         # Simple average for now
@@ -232,7 +261,7 @@ async def get_categories(
     return {"categories": categories}
 
 
-@router.get("/{market_id}/history")
+@router.get("/{market_id}/history", response_class=PydanticJSONResponse)
 async def get_market_history(
     market_id: str,
     db: Annotated[AsyncSession, Depends(get_db)],
@@ -244,9 +273,6 @@ async def get_market_history(
     Returns hourly data points with market price and consensus probability.
     This is used for the dashboard chart visualization.
     """
-    from datetime import timedelta
-    import random
-
     # Get market
     result = await db.execute(
         select(MarketCacheModel).where(MarketCacheModel.id == market_id)
@@ -275,34 +301,23 @@ async def get_market_history(
     # Generate historical data points
     # In production, this would come from a time-series database
     # For now, we generate synthetic data based on current values
-    data_points = []
     now = datetime.utcnow()
     current_price = market.yes_price
-
-    for i in range(hours, -1, -1):
-        timestamp = now - timedelta(hours=i)
-
-        # Simulate historical price with some variance
-        # Price moves toward current price as we get closer to now
-        progress = 1 - (i / hours) if hours > 0 else 1
-        base_price = 0.5 + (current_price - 0.5) * progress
-
-        # Add some noise
-        noise = random.uniform(-0.03, 0.03) * (1 - progress)
-        historical_price = max(0.01, min(0.99, base_price + noise))
-
-        # Simulate consensus (slightly different from price)
-        historical_consensus = None
-        if consensus_prob is not None:
-            base_consensus = 0.5 + (consensus_prob - 0.5) * progress
-            consensus_noise = random.uniform(-0.02, 0.02) * (1 - progress)
-            historical_consensus = max(0.01, min(0.99, base_consensus + consensus_noise))
-
-        data_points.append({
-            "timestamp": timestamp.isoformat(),
-            "market_price": round(historical_price, 4),
-            "consensus_probability": round(historical_consensus, 4) if historical_consensus else None,
-        })
+    prices, consensus = _synthetic_history(hours, current_price, consensus_prob)
+
+    # Hourly timestamps, oldest first
+    start = np.datetime64(now, "us") - np.timedelta64(hours, "h")
+    timestamps = np.datetime_as_string(start + np.arange(hours + 1) * np.timedelta64(1, "h"))
+
+    consensus_values = consensus.tolist() if consensus is not None else [None] * (hours + 1)
+    data_points = [
+        {
+            "timestamp": ts,
+            "market_price": price,
+            "consensus_probability": cons,
+        }
+        for ts, price, cons in zip(timestamps.tolist(), prices.tolist(), consensus_values)
+    ]
 
     return {
         "market_id": market_id,
@@ -311,3 +326,32 @@ async def get_market_history(
         "current_consensus": round(consensus_prob, 4) if consensus_prob else None,
         "data": data_points,
     }
+
+
+def _synthetic_history(
+    hours: int,
+    current_price: float,
+    consensus_prob: float | None,
+) -> tuple[np.ndarray, np.ndarray | None]:
+    """
+    Generate synthetic hourly price/consensus series ending at current values.
+
+    Vectorized over all points: values drift from 0.5 toward the current value
+    with noise that shrinks as they approach now. Returns arrays rounded to 4dp.
+    """
+    rng = np.random.default_rng()
+    i = np.arange(hours, -1, -1, dtype=np.float64)
+    progress = 1.0 - i / hours if hours > 0 else np.ones_like(i)
+    remaining = 1.0 - progress
+
+    base_price = 0.5 + (current_price - 0.5) * progress
+    noise = rng.uniform(-0.03, 0.03, i.size) * remaining
+    prices = np.round(np.clip(base_price + noise, 0.01, 0.99), 4)
+
+    consensus = None
+    if consensus_prob is not None:
+        base_consensus = 0.5 + (consensus_prob - 0.5) * progress
+        consensus_noise = rng.uniform(-0.02, 0.02, i.size) * remaining
+        consensus = np.round(np.clip(base_consensus + consensus_noise, 0.01, 0.99), 4)
+
+    return prices, consensus
@@ -5,44 +5,103 @@ Routes for heartbeat, autonomous agent coordination, and real-time WebSocket fee
 """
 
 import asyncio
-import json
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Annotated
 
 import httpx
+import orjson
 from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from server.db.database import get_db
-from server.db.models import AgentModel, ForecastModel, MarketCacheModel
+from server.api.responses import PydanticJSONResponse
+from server.db.database import async_session, get_db
+from server.db.models import AgentModel, ForecastModel, utcnow
 from server.services.auth import get_current_agent
 
 router = APIRouter()
 
+# Shared client for agent healthchecks: keeps connections alive per remote host
+# instead of paying a TCP+TLS handshake on every heartbeat
+_healthcheck_client = httpx.AsyncClient(
+    timeout=5.0,
+    http2=True,
+    limits=httpx.Limits(max_keepalive_connections=100, max_connections=200),
+)
+
+
+# Strong refs to in-flight probes so they aren't garbage collected mid-run
+_probe_tasks: set[asyncio.Task] = set()
+
+
+async def close_healthcheck_client():
+    """Close the shared healthcheck client (called on app shutdown)."""
+    await _healthcheck_client.aclose()
+
+
+async def _probe_and_store(agent_pk, healthcheck_url: str):
+    """Probe an agent's healthcheck URL and record the result on its row."""
+    try:
+        res = await _healthcheck_client.get(healthcheck_url)
+        if res.status_code == 200:
+            health_status = "healthy"
+        else:
+            health_status = f"unhealthy ({res.status_code})"
+            # Mark as degraded if failing for too long (future logic)
+    except Exception as e:
+        health_status = f"error: {str(e)}"
+
+    try:
+        async with async_session() as db:
+            await db.execute(
+                update(AgentModel)
+                .where(AgentModel.id == agent_pk)
+                .values(last_health_status=health_status[:100])
+            )
+            await db.commit()
+    except Exception as e:
+        print(f"Healthcheck store error for {agent_pk}: {e}")
+
 # WebSocket connection manager
 class ConnectionManager:
+    # Max time a single client may take to accept a frame before it's dropped
+    SEND_TIMEOUT = 2.0
+    HEARTBEAT_INTERVAL = 5.0
+
     def __init__(self):
-        self.active_connections: list[WebSocket] = []
+        self.active_connections: set[WebSocket] = set()
+        self._heartbeat_task: asyncio.Task | None = None
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections.append(websocket)
+        self.active_connections.add(websocket)
+        if self._heartbeat_task is None or self._heartbeat_task.done():
+            self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
 
     def disconnect(self, websocket: WebSocket):
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
+        self.active_connections.discard(websocket)
+
+    async def _heartbeat_loop(self):
+        """Send one shared heartbeat frame per tick to every client."""
+        while self.active_connections:
+            await asyncio.sleep(self.HEARTBEAT_INTERVAL)
+            await self.broadcast({
+                "type": "heartbeat",
+                "timestamp": datetime.utcnow().isoformat(),
+            })
 
     async def broadcast(self, message: dict):
-        """Broadcast message to all connected clients."""
-        disconnected = []
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(message)
-            except Exception:
-                disconnected.append(connection)
-        for conn in disconnected:
-            self.disconnect(conn)
+        """Broadcast message to all connected clients concurrently."""
+        # Encode once; every client receives the same (text) frame
+        payload = orjson.dumps(message).decode()
+        connections = list(self.active_connections)
+        results = await asyncio.gather(
+            *(asyncio.wait_for(c.send_text(payload), self.SEND_TIMEOUT) for c in connections),
+            return_exceptions=True,
+        )
+        for conn, result in zip(connections, results):
+            if isinstance(result, Exception):
+                self.disconnect(conn)
 
 manager = ConnectionManager()
 
@@ -56,23 +115,22 @@ async def agent_heartbeat(
     
     Agents call this to signal they are online and participating.
     Updates last_active_at and validates healthcheck_url if present.
+
+    The healthcheck runs in the background so heartbeat latency doesn't
+    depend on the agent's endpoint; the result is stored as last_health_status.
     """
-    current_agent.last_active_at = datetime.utcnow()
+    # Stamped by the database on commit
+    current_agent.last_active_at = utcnow()
+    await db.commit()
     
     health_status = "unknown"
     if current_agent.healthcheck_url:
-        try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                res = await client.get(current_agent.healthcheck_url)
-                if res.status_code == 200:
-                    health_status = "healthy"
-                else:
-                    health_status = f"unhealthy ({res.status_code})"
-                    # Mark as degraded if failing for too long (future logic)
-        except Exception as e:
-            health_status = f"error: {str(e)}"
-    
-    await db.commit()
+        health_status = "pending"
+        task = asyncio.create_task(
+            _probe_and_store(current_agent.id, current_agent.healthcheck_url)
+        )
+        _probe_tasks.add(task)
+        task.add_done_callback(_probe_tasks.discard)
     
     return {
         "status": "received",
@@ -81,12 +139,12 @@ async def agent_heartbeat(
         "timestamp": datetime.utcnow().isoformat()
     }
 
-@router.get("/status")
+@router.get("/status", response_class=PydanticJSONResponse)
 async def get_participation_status(
     db: Annotated[AsyncSession, Depends(get_db)],
 ):
     """Get overall participation status of the autonomous agent pool."""
-    active_limit = datetime.utcnow().replace(minute=datetime.utcnow().minute - 15) # Active in last 15 mins
+    active_limit = datetime.utcnow() - timedelta(minutes=15)  # Active in last 15 mins
     
     result = await db.execute(
         select(AgentModel).where(AgentModel.last_active_at >= active_limit)
@@ -111,82 +169,70 @@ async def websocket_feed(websocket: WebSocket):
     WebSocket endpoint for real-time forecast feed.
 
     Clients connect to receive live updates when new forecasts are submitted.
-    The connection also sends periodic heartbeats to keep the connection alive.
+    Heartbeats are sent to all clients by the connection manager; this loop
+    ends once the manager drops the connection.
     """
-    from server.db.database import async_session_maker
-
     await manager.connect(websocket)
 
     try:
         # Send initial connection confirmation
+        last_check = datetime.utcnow()
         await websocket.send_json({
             "type": "connected",
             "message": "Connected to TradingClaw real-time feed",
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": last_check.isoformat(),
         })
 
-        # Track last seen forecast for polling new ones
-        last_check = datetime.utcnow()
-
-        while True:
+        while websocket in manager.active_connections:
             # Check for new forecasts every 5 seconds
             await asyncio.sleep(5)
+            now = datetime.utcnow()
+            timestamp = now.isoformat()
 
             try:
-                async with async_session_maker() as db:
-                    # Get new forecasts since last check
+                async with async_session() as db:
+                    # New forecasts since last check, names included: one
+                    # single-table query, no per-forecast agent/market lookups
                     result = await db.execute(
-                        select(ForecastModel)
+                        select(
+                            ForecastModel.id,
+                            ForecastModel.agent_id,
+                            ForecastModel.agent_name,
+                            ForecastModel.market_id,
+                            ForecastModel.market_question,
+                            ForecastModel.probability,
+                            ForecastModel.confidence,
+                            ForecastModel.reasoning,
+                            ForecastModel.created_at,
+                        )
                         .where(ForecastModel.created_at > last_check)
                         .order_by(ForecastModel.created_at.desc())
                         .limit(10)
                     )
-                    new_forecasts = result.scalars().all()
-
-                    for forecast in new_forecasts:
-                        # Get agent info
-                        agent_result = await db.execute(
-                            select(AgentModel).where(AgentModel.agent_id == forecast.agent_id)
-                        )
-                        agent = agent_result.scalar_one_or_none()
 
-                        # Get market info
-                        market_result = await db.execute(
-                            select(MarketCacheModel).where(MarketCacheModel.id == forecast.market_id)
-                        )
-                        market = market_result.scalar_one_or_none()
-
-                        await websocket.send_json({
+                    for forecast in result.all():
+                        await websocket.send_text(orjson.dumps({
                             "type": "new_forecast",
                             "data": {
                                 "id": str(forecast.id),
                                 "agent_id": forecast.agent_id,
-                                "agent_name": agent.display_name if agent else forecast.agent_id,
+                                "agent_name": forecast.agent_name,
                                 "market_id": forecast.market_id,
-                                "market_question": market.question if market else forecast.market_id,
+                                "market_question": forecast.market_question or forecast.market_id,
                                 "probability": forecast.probability,
                                 "confidence": forecast.confidence,
                                 "reasoning": forecast.reasoning,
                                 "created_at": forecast.created_at.isoformat(),
                             },
-                            "timestamp": datetime.utcnow().isoformat(),
-                        })
+                            "timestamp": timestamp,
+                        }).decode())
 
-                    last_check = datetime.utcnow()
+                    last_check = now
 
             except Exception as e:
                 # Log but don't disconnect on DB errors
                 print(f"WebSocket feed error: {e}")
 
-            # Send heartbeat to keep connection alive
-            try:
-                await websocket.send_json({
-                    "type": "heartbeat",
-                    "timestamp": datetime.utcnow().isoformat(),
-                })
-            except Exception:
-                break
-
     except WebSocketDisconnect:
         manager.disconnect(websocket)
     except Exception as e:
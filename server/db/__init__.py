@@ -1,4 +1,5 @@
 """TradingClaw Platform - Database Package"""
+from server.db.batcher import enqueue_message, message_batcher
 from server.db.database import get_db, init_db
 from server.db.models import (
     AgentModel,
@@ -9,6 +10,8 @@ from server.db.models import (
 )
 
 __all__ = [
+    "enqueue_message",
+    "message_batcher",
     "get_db",
     "init_db",
     "AgentModel",
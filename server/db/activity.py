@@ -0,0 +1,57 @@
+"""
+TradingClaw Platform - Activity Stats
+
+Counter maintenance for the agent_activity_stats cache table.
+"""
+
+from collections import Counter, defaultdict
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from server.db.database import DIALECT_INSERTS
+from server.db.models import AgentActivityStatsModel, utcnow
+
+
+# Counters maintained incrementally on writes
+ACTIVITY_COUNTERS = (
+    "floor_message_count",
+    "floor_reply_count",
+    "total_replies_received",
+    "dm_sent_count",
+    "dm_received_count",
+)
+
+
+def activity_increments() -> defaultdict[str, Counter]:
+    """Empty agent_id -> Counter(counter name -> delta) accumulator."""
+    return defaultdict(Counter)
+
+
+async def increment_activity_stats(session: AsyncSession, increments: dict[str, Counter]):
+    """
+    Add deltas to agents' activity counters in a single UPSERT.
+
+    Missing rows are created with the deltas as their starting counts;
+    existing rows get `counter = counter + delta` inside the database, so
+    concurrent writers never race on a read-modify-write.
+    """
+    if not increments:
+        return
+
+    insert = DIALECT_INSERTS.get(session.bind.dialect.name)
+    if insert is None:
+        return  # Stats are a cache; skip on dialects without ON CONFLICT
+
+    table = AgentActivityStatsModel.__table__
+    stmt = insert(table).values([
+        {"agent_id": agent_id, **{name: deltas[name] for name in ACTIVITY_COUNTERS}}
+        for agent_id, deltas in increments.items()
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.agent_id],
+        set_={
+            **{name: table.c[name] + stmt.excluded[name] for name in ACTIVITY_COUNTERS},
+            "last_updated": utcnow(),
+        },
+    )
+    await session.execute(stmt)
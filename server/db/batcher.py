@@ -0,0 +1,191 @@
+"""
+TradingClaw Platform - Write Batching
+
+Buffers append-only trading floor writes (messages, replies, DMs) and flushes
+them as multi-row INSERTs, amortizing round trips and commits across requests.
+"""
+
+import asyncio
+import logging
+from collections import Counter
+
+from sqlalchemy import insert, select, update
+
+from server.config import get_settings
+from server.db.activity import activity_increments, increment_activity_stats
+from server.db.database import async_session
+from server.db.models import DirectMessageModel, FloorMessageModel, FloorReplyModel
+
+
+settings = get_settings()
+logger = logging.getLogger("message_batcher")
+
+# Flush order matters: replies reference floor messages
+BATCHED_MODELS = (FloorMessageModel, FloorReplyModel, DirectMessageModel)
+
+# Queued by stop(): the worker flushes what it holds and exits on reaching it
+_STOP = object()
+
+
+class MessageBatcher:
+    """
+    Bounded queue of pending rows drained by a background worker.
+
+    Rows are flushed when `batch_size` rows are pending or `flush_interval`
+    seconds have passed since the first one arrived, whichever comes first.
+    Callers pre-assign ids and timestamps so they can respond immediately.
+    """
+
+    def __init__(self, batch_size: int, flush_interval: float, maxsize: int = 10_000):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self._worker: asyncio.Task | None = None
+        self._stopping = False
+        # Floor messages accepted but not yet flushed, so replies to them can
+        # be queued behind them instead of 404ing
+        self._pending_messages: set = set()
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and not self._worker.done() and not self._stopping
+
+    async def start(self):
+        """Start the background flush worker."""
+        if not self.running:
+            self._stopping = False
+            self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """
+        Stop the worker once it has flushed everything queued.
+
+        The worker isn't cancelled: rows it holds mid-batch were already
+        acknowledged, so it finishes that batch and the queue before exiting.
+        """
+        if self._worker is not None:
+            # New rows are written directly from here on
+            self._stopping = True
+            await self._queue.put(_STOP)
+            await self._worker
+            self._worker = None
+            self._stopping = False
+
+        # Anything enqueued behind the sentinel, or with no worker running
+        pending = []
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is not _STOP:
+                pending.append(item)
+        if pending:
+            await self._flush(pending)
+
+    def enqueue(self, model: type, row: dict):
+        """
+        Queue a row for insertion.
+
+        Raises asyncio.QueueFull when the buffer is saturated so the caller
+        can fall back to a direct write.
+        """
+        self._queue.put_nowait((model, row))
+        if model is FloorMessageModel:
+            self._pending_messages.add(row["id"])
+
+    def is_pending(self, message_id) -> bool:
+        """Whether a floor message is queued or mid-flush (not yet committed)."""
+        return message_id in self._pending_messages
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            deadline = loop.time() + self.flush_interval
+
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            await self._flush(batch)
+
+    async def _flush(self, batch: list[tuple[type, dict]]):
+        """
+        Write a batch, falling back to one row per transaction if it fails so
+        a single bad row can't drop everyone else's already-acknowledged rows.
+        """
+        try:
+            await self._write(batch)
+        except Exception as e:
+            logger.warning(f"Message batch flush failed ({len(batch)} rows), retrying row by row: {e}")
+            for model, row in batch:
+                try:
+                    await self._write([(model, row)])
+                except Exception as e:
+                    logger.error(f"Dropped queued {model.__tablename__} row {row['id']}: {e}")
+        finally:
+            # Committed (or given up on): replies now see the table, not the queue
+            self._pending_messages.difference_update(
+                row["id"] for model, row in batch if model is FloorMessageModel
+            )
+
+    async def _write(self, batch: list[tuple[type, dict]]):
+        rows_by_model: dict[type, list[dict]] = {model: [] for model in BATCHED_MODELS}
+        for model, row in batch:
+            rows_by_model[model].append(row)
+
+        async with async_session() as session:
+            for model, rows in rows_by_model.items():
+                if rows:
+                    await session.execute(insert(model), rows)
+
+            # One reply_count bump per parent instead of one per reply
+            reply_counts = Counter(r["parent_id"] for r in rows_by_model[FloorReplyModel])
+            for parent_id, count in reply_counts.items():
+                await session.execute(
+                    update(FloorMessageModel)
+                    .where(FloorMessageModel.id == parent_id)
+                    .values(reply_count=FloorMessageModel.reply_count + count)
+                )
+
+            # One activity stats upsert for the whole batch
+            increments = activity_increments()
+            for row in rows_by_model[FloorMessageModel]:
+                increments[row["agent_id"]]["floor_message_count"] += 1
+            for row in rows_by_model[FloorReplyModel]:
+                increments[row["agent_id"]]["floor_reply_count"] += 1
+            for row in rows_by_model[DirectMessageModel]:
+                increments[row["from_agent_id"]]["dm_sent_count"] += 1
+                increments[row["to_agent_id"]]["dm_received_count"] += 1
+            if reply_counts:
+                parents = await session.execute(
+                    select(FloorMessageModel.id, FloorMessageModel.agent_id)
+                    .where(FloorMessageModel.id.in_(reply_counts))
+                )
+                for parent_id, author_id in parents.all():
+                    increments[author_id]["total_replies_received"] += reply_counts[parent_id]
+            await increment_activity_stats(session, increments)
+
+            await session.commit()
+
+
+message_batcher = MessageBatcher(
+    batch_size=settings.floor_batch_size,
+    flush_interval=settings.floor_batch_interval_ms / 1000,
+)
+
+
+def enqueue_message(model: type, row: dict):
+    """Queue a floor message, reply or DM row on the shared batcher."""
+    message_batcher.enqueue(model, row)
@@ -0,0 +1,22 @@
+"""
+TradingClaw Platform - Redis Cache
+
+Shared Redis connection for response caching. Redis is optional: when
+REDIS_URL is unset, redis_client is None and callers skip caching.
+"""
+
+from redis.asyncio import Redis
+
+from server.config import get_settings
+
+
+settings = get_settings()
+
+# Connects lazily on first command; the pool is shared by every caller
+redis_client: Redis | None = Redis.from_url(settings.redis_url) if settings.redis_url else None
+
+
+async def close_redis():
+    """Close the shared Redis connection pool (called on app shutdown)."""
+    if redis_client is not None:
+        await redis_client.aclose()
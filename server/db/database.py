@@ -4,21 +4,95 @@ TradingClaw Platform - Database Connection
 Async database engine and session management.
 """
 
+from sqlalchemy import event, make_url, text
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool, StaticPool
 
 from server.config import get_settings
 from server.db.models import Base
+from server.db.views import create_views
 
 
 settings = get_settings()
 
+url = make_url(settings.database_url)
+engine_kwargs = {}
+if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+    # An in-memory database only exists on its connection, so share one
+    engine_kwargs = {"poolclass": StaticPool, "connect_args": {"check_same_thread": False}}
+elif settings.environment == "production" and url.get_backend_name() == "postgresql":
+    # Pooling is delegated to PgBouncer so connections don't multiply with
+    # API workers. Transaction-mode pooling can hand each transaction a
+    # different server connection, so asyncpg must not cache prepared statements.
+    engine_kwargs = {"poolclass": NullPool}
+    if url.get_driver_name() == "asyncpg":
+        engine_kwargs["connect_args"] = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "server_settings": {"application_name": "tradingclaw"},
+        }
+
+# Direct Postgres connections are pooled here, so asyncpg can keep the hot
+# queries (bulk upserts, IN lookups) prepared per connection; pre-ping and
+# recycle so the pool doesn't hand out connections the server has dropped
+pool_kwargs = {}
+if not engine_kwargs and url.get_backend_name() == "postgresql":
+    pool_kwargs = {"pool_pre_ping": True, "pool_recycle": settings.db_pool_recycle_seconds}
+    if url.get_driver_name() == "asyncpg":
+        pool_kwargs["connect_args"] = {
+            "statement_cache_size": settings.db_statement_cache_size,
+            "prepared_statement_cache_size": settings.db_statement_cache_size,
+        }
+
 # Create async engine
 engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,
     future=True,
+    # Room for every distinct statement shape the app compiles, so hot
+    # queries are compiled once per process rather than on cache churn
+    query_cache_size=1200,
+    **engine_kwargs,
+    **pool_kwargs,
 )
 
+# Separate pool for authentication lookups (challenge/login, read-only agent
+# lookups), so login bursts queue on their own connections instead of
+# starving trading writes. When the main engine isn't pooling (in-memory
+# SQLite must share its one connection; PgBouncer does the pooling in
+# production) there is nothing to separate, so auth shares it.
+if engine_kwargs:
+    auth_engine = engine
+else:
+    auth_engine = create_async_engine(
+        settings.database_url,
+        echo=settings.debug,
+        future=True,
+        query_cache_size=1200,
+        pool_size=settings.auth_db_pool_size,
+        max_overflow=settings.auth_db_max_overflow,
+        **{"pool_pre_ping": True, **pool_kwargs},
+    )
+
+
+if url.get_backend_name() == "sqlite":
+    @event.listens_for(engine.sync_engine, "connect")
+    @event.listens_for(auth_engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """WAL lets readers run alongside the writer; NORMAL syncs per checkpoint, not per commit."""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA busy_timeout=5000")
+        cursor.close()
+
+# INSERT constructs with ON CONFLICT support, by dialect name
+DIALECT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
 # Session factory
 async_session = async_sessionmaker(
     engine,
@@ -26,11 +100,22 @@ async_session = async_sessionmaker(
     expire_on_commit=False,
 )
 
+auth_session = async_sessionmaker(
+    auth_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
+
 
 async def init_db():
     """Initialize database tables."""
     async with engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            # gen_random_uuid() for primary keys (built in from Postgres 13)
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pgcrypto"))
         await conn.run_sync(Base.metadata.create_all)
+        if conn.dialect.name == "postgresql":
+            await create_views(conn)
 
 
 async def get_db() -> AsyncSession:
@@ -44,3 +129,16 @@ async def get_db() -> AsyncSession:
             raise
         finally:
             await session.close()
+
+
+async def get_auth_db() -> AsyncSession:
+    """Dependency for getting a session from the authentication pool."""
+    async with auth_session() as session:
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
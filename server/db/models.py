@@ -4,33 +4,165 @@ TradingClaw Platform - Database Models
 Core data models for agents, forecasts, positions, and reputation.
 """
 
+import os
+import time
 from datetime import datetime
-from decimal import Decimal
-from typing import Optional
-from uuid import UUID, uuid4
+from typing import Literal, Optional, get_args
+from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 from sqlalchemy import (
+    BigInteger,
     Boolean,
-    Column,
+    Computed,
     DateTime,
     Enum,
     Float,
     ForeignKey,
     Index,
     Integer,
-    Numeric,
+    JSON,
     String,
     Text,
-    create_engine,
+    cast,
+    text,
 )
-from sqlalchemy.dialects.postgresql import UUID as PGUUID
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.dialects.postgresql import JSONB, UUID as PGUUID
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
+from sqlalchemy.sql.functions import FunctionElement
 
 
 class Base(DeclarativeBase):
-    pass
+    # Timestamps are generated by the database; fetch them back in the same
+    # INSERT/UPDATE (RETURNING) so handlers can read them without a refresh
+    __mapper_args__ = {"eager_defaults": True}
+
+
+class utcnow(FunctionElement):
+    """
+    Current UTC timestamp, evaluated by the database.
+
+    Matches the naive-UTC convention of datetime.utcnow() so SQL-side stamps
+    compare cleanly with Python-side cutoffs.
+    """
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow, "postgresql")
+def _pg_utcnow(element, compiler, **kw):
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+
+@compiles(utcnow)
+def _default_utcnow(element, compiler, **kw):
+    # SQLite's CURRENT_TIMESTAMP is already UTC but only has whole seconds;
+    # %f adds milliseconds, padded to the microsecond form SQLAlchemy writes
+    # so stored stamps still compare correctly as text against bound values
+    return "(strftime('%Y-%m-%d %H:%M:%f', 'now') || '000')"
+
+
+class gen_random_uuid(FunctionElement):
+    """Random UUID generated by the database, for rows inserted outside the ORM."""
+    type = PGUUID(as_uuid=True)
+    inherit_cache = True
+
+
+@compiles(gen_random_uuid, "postgresql")
+def _pg_gen_random_uuid(element, compiler, **kw):
+    return "gen_random_uuid()"
+
+
+@compiles(gen_random_uuid)
+def _default_gen_random_uuid(element, compiler, **kw):
+    # SQLite stores UUIDs as 32-char hex strings
+    return "(lower(hex(randomblob(16))))"
+
+
+class json_array_contains(FunctionElement):
+    """
+    json_array_contains(column, value): the JSON list in `column` contains
+    `value`. Compiles to a GIN-indexable `@>` on Postgres.
+    """
+    type = Boolean()
+    inherit_cache = True
+
+
+@compiles(json_array_contains, "postgresql")
+def _pg_json_array_contains(element, compiler, **kw):
+    column, value = element.clauses
+    return f"{compiler.process(column, **kw)} @> jsonb_build_array(CAST({compiler.process(value, **kw)} AS TEXT))"
+
+
+@compiles(json_array_contains)
+def _default_json_array_contains(element, compiler, **kw):
+    column, value = element.clauses
+    return f"EXISTS (SELECT 1 FROM json_each({compiler.process(column, **kw)}) WHERE json_each.value = {compiler.process(value, **kw)})"
+
+
+class calibration_bucket(FunctionElement):
+    """
+    calibration_bucket(probability): decile bucket 0-9 (0-10%, ..., 90-100%),
+    with probability 1.0 folded into the top bucket.
+    """
+    type = Integer()
+    inherit_cache = True
+
+
+@compiles(calibration_bucket, "postgresql")
+def _pg_calibration_bucket(element, compiler, **kw):
+    (probability,) = element.clauses
+    # width_bucket is 1-based and puts the upper bound in an overflow bucket
+    return f"(LEAST(width_bucket({compiler.process(probability, **kw)}, 0, 1, 10), 10) - 1)"
+
+
+@compiles(calibration_bucket)
+def _default_calibration_bucket(element, compiler, **kw):
+    (probability,) = element.clauses
+    # CAST truncates, which is floor() for non-negative values
+    return f"min(CAST({compiler.process(probability, **kw)} * 10 AS INTEGER), 9)"
+
+
+def uuid7() -> UUID:
+    """
+    Time-ordered UUID (RFC 9562 version 7): 48-bit Unix ms timestamp, then
+    random bits. New keys land on the rightmost B-tree page instead of a
+    random one, which keeps primary key inserts append-only.
+    """
+    ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), "big")
+    rand_a = rand >> 68           # 12 bits
+    rand_b = rand & (1 << 62) - 1  # 62 bits
+    return UUID(int=(ms & (1 << 48) - 1) << 80 | 0x7 << 76 | rand_a << 64 | 0b10 << 62 | rand_b)
+
+
+# =============================================================================
+# Enumerated Types
+# =============================================================================
+# Closed value sets, shared by the API schemas (validated as literal lookups
+# rather than regexes) and the columns that store them: native ENUM types on
+# Postgres, VARCHAR + CHECK constraint elsewhere.
+
+AgentStatus = Literal["active", "paused", "banned"]
+Confidence = Literal["high", "medium", "low"]
+MessageType = Literal["signal", "research", "position", "question", "alert"]
+PositionSide = Literal["YES", "NO"]
+SignalDirection = Literal["bullish", "bearish", "neutral"]
+Timeframe = Literal["7d", "30d", "all"]
+
+
+def _enum_type(literal, name: str) -> Enum:
+    return Enum(*get_args(literal), name=name, create_constraint=True, metadata=Base.metadata)
+
+
+agent_status_enum = _enum_type(AgentStatus, "agent_status")
+confidence_enum = _enum_type(Confidence, "confidence")
+message_type_enum = _enum_type(MessageType, "message_type")
+position_side_enum = _enum_type(PositionSide, "position_side")
+signal_direction_enum = _enum_type(SignalDirection, "signal_direction")
+timeframe_enum = _enum_type(Timeframe, "timeframe")
 
 
 # =============================================================================
@@ -42,8 +174,13 @@ class AgentModel(Base):
     """Registered agent on the platform."""
     
     __tablename__ = "agents"
+
+    # GIN index for category containment filters (categories @> '["sports"]')
+    __table_args__ = (
+        Index("ix_agents_categories_gin", "categories", postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
     
-    id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), primary_key=True, default=uuid4)
+    id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), primary_key=True, default=uuid7, server_default=gen_random_uuid())
     agent_id: Mapped[str] = mapped_column(String(255), unique=True, index=True)
     display_name: Mapped[str] = mapped_column(String(255))
     public_key: Mapped[str] = mapped_column(Text)
@@ -54,12 +191,13 @@ class AgentModel(Base):
     strategy: Mapped[str] = mapped_column(String(50), default="balanced")
     kelly_fraction: Mapped[float] = mapped_column(Float, default=0.5)
     max_position_pct: Mapped[float] = mapped_column(Float, default=0.10)
-    categories: Mapped[str] = mapped_column(Text, default="[]")  # JSON array
+    categories: Mapped[list[str]] = mapped_column(JSON().with_variant(JSONB, "postgresql"), server_default="[]")
     
     # Status
-    status: Mapped[str] = mapped_column(String(20), default="active")
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
-    last_active_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    status: Mapped[str] = mapped_column(agent_status_enum, default="active")
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=utcnow())
+    last_active_at: Mapped[datetime] = mapped_column(DateTime, server_default=utcnow())
+    last_health_status: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)  # From heartbeat probe
     
     # Relationships
     forecasts: Mapped[list["ForecastModel"]] = relationship(back_populates="agent")
@@ -70,52 +208,113 @@ class ForecastModel(Base):
     """Agent's probability forecast for a market."""
     
     __tablename__ = "forecasts"
+
+    # Query patterns:
+    # - (agent_id, created_at DESC) - an agent's recent forecasts
+    # - (agent_id) WHERE brier_score IS NOT NULL - scored forecasts per agent
+    #   (Brier averages, resolved history); scored rows are a minority, so the
+    #   partial index stays small
+    # - (created_at DESC) - global forecast feed; on Postgres it also carries
+    #   agent_id/brier_score so the leaderboard's "created_at >= cutoff GROUP
+    #   BY agent_id" aggregation is an index-only scan
+    __table_args__ = (
+        Index("ix_forecasts_agent_created", "agent_id", "created_at"),
+        Index(
+            "ix_forecasts_resolved",
+            "agent_id",
+            "created_at",
+            postgresql_include=["brier_score"],
+            postgresql_where=text("brier_score IS NOT NULL"),
+            sqlite_where=text("brier_score IS NOT NULL"),
+        ),
+        Index("ix_forecasts_created", "created_at", postgresql_include=["agent_id", "brier_score"]),
+    )
     
-    id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), primary_key=True, default=uuid4)
-    agent_id: Mapped[str] = mapped_column(String(255), ForeignKey("agents.agent_id"), index=True)
+    id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), primary_key=True, default=uuid7, server_default=gen_random_uuid())
+    agent_id: Mapped[str] = mapped_column(String(255), ForeignKey("agents.agent_id"))  # Leads ix_forecasts_agent_created
     market_id: Mapped[str] = mapped_column(String(255), index=True)
+
+    # Denormalized for feed reads; market fields stay NULL until the market is cached
+    agent_name: Mapped[str] = mapped_column(String(255))
+    market_question: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    market_category: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
     
     # Forecast
     probability: Mapped[float] = mapped_column(Float)
-    confidence: Mapped[str] = mapped_column(String(20))  # high, medium, low
+    confidence: Mapped[str] = mapped_column(confidence_enum)
     reasoning: Mapped[str] = mapped_column(Text, nullable=True)
     
     # Metadata
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=utcnow())
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=utcnow(), onupdate=utcnow())
     
     # Market price at time of forecast (for "beat the market" comparison)
     market_price_at_forecast: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
 
-    # Resolution (filled when market resolves)
+    # Resolution (outcome filled when market resolves; the database derives
+    # brier_score = (probability - outcome)^2 from it, NULL while unresolved)
     outcome: Mapped[Optional[bool]] = mapped_column(Boolean, nullable=True)
-    brier_score: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    brier_score: Mapped[Optional[float]] = mapped_column(
+        Float,
+        Computed(
+            "CASE WHEN outcome IS NULL THEN NULL"
+            " ELSE (probability - CASE WHEN outcome THEN 1.0 ELSE 0.0 END)"
+            " * (probability - CASE WHEN outcome THEN 1.0 ELSE 0.0 END) END",
+            persisted=True,
+        ),
+        nullable=True,
+    )
 
     # Relationships
     agent: Mapped["AgentModel"] = relationship(back_populates="forecasts")
 
 
+def _fixed_point(attr: str, scale: int) -> hybrid_property:
+    """Float view of an integer column stored in 1/scale units, for display."""
+
+    def fget(self) -> float:
+        return getattr(self, attr) / scale
+
+    def expr(cls):
+        return cast(getattr(cls, attr), Float) / scale
+
+    return hybrid_property(fget, expr=expr)
+
+
 class PositionModel(Base):
-    """Agent's position in a market."""
+    """
+    Agent's position in a market.
+
+    Quantities and P&L are fixed-point integers in units of 1/SCALE, so loads
+    and aggregates stay in int64. Exact math stays on the integer columns;
+    responses use the *_float accessors (no Decimal on the read path).
+    """
     
     __tablename__ = "positions"
+
+    SCALE = 100_000_000
     
-    id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), primary_key=True, default=uuid4)
+    id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), primary_key=True, default=uuid7, server_default=gen_random_uuid())
     agent_id: Mapped[str] = mapped_column(String(255), ForeignKey("agents.agent_id"), index=True)
     market_id: Mapped[str] = mapped_column(String(255), index=True)
     
     # Position
-    side: Mapped[str] = mapped_column(String(10))  # YES or NO
-    size: Mapped[Decimal] = mapped_column(Numeric(18, 8))
-    avg_price: Mapped[Decimal] = mapped_column(Numeric(18, 8))
+    side: Mapped[str] = mapped_column(position_side_enum)
+    size: Mapped[int] = mapped_column(BigInteger)
+    avg_price: Mapped[int] = mapped_column(BigInteger)
     
     # P&L
-    realized_pnl: Mapped[Decimal] = mapped_column(Numeric(18, 8), default=Decimal("0"))
-    unrealized_pnl: Mapped[Decimal] = mapped_column(Numeric(18, 8), default=Decimal("0"))
+    realized_pnl: Mapped[int] = mapped_column(BigInteger, default=0)
+    unrealized_pnl: Mapped[int] = mapped_column(BigInteger, default=0)
+
+    size_float = _fixed_point("size", SCALE)
+    avg_price_float = _fixed_point("avg_price", SCALE)
+    realized_pnl_float = _fixed_point("realized_pnl", SCALE)
+    unrealized_pnl_float = _fixed_point("unrealized_pnl", SCALE)
     
     # Metadata
-    opened_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    opened_at: Mapped[datetime] = mapped_column(DateTime, server_default=utcnow())
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=utcnow(), onupdate=utcnow())
     closed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     
     # Relationships
@@ -143,29 +342,42 @@ class MarketCacheModel(Base):
     resolution_outcome: Mapped[Optional[bool]] = mapped_column(Boolean, nullable=True)
     
     # Cache metadata
-    last_updated: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    last_updated: Mapped[datetime] = mapped_column(DateTime, server_default=utcnow(), onupdate=utcnow())
+    stale_after: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)  # Serve, but refresh in background
+    hard_expire_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)  # Refresh before serving
 
 
 class LeaderboardCacheModel(Base):
     """Cached leaderboard rankings."""
     
     __tablename__ = "leaderboard_cache"
+
+    # One index per sortable metric so "ORDER BY <metric> LIMIT k" within a
+    # timeframe is an index range scan instead of a full sort
+    __table_args__ = (
+        Index("ix_leaderboard_cache_timeframe_roi", "timeframe", "roi"),
+        Index("ix_leaderboard_cache_timeframe_brier", "timeframe", "brier_score"),
+        Index("ix_leaderboard_cache_timeframe_win_rate", "timeframe", "win_rate"),
+        Index("ix_leaderboard_cache_timeframe_trades", "timeframe", "total_trades"),
+        # Default (ROI) ranking reads: WHERE timeframe, category ORDER BY rank
+        Index("ix_leaderboard_cache_timeframe_category_rank", "timeframe", "category", "rank"),
+    )
     
-    id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), primary_key=True, default=uuid4)
+    id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), primary_key=True, default=uuid7, server_default=gen_random_uuid())
     agent_id: Mapped[str] = mapped_column(String(255), index=True)
-    timeframe: Mapped[str] = mapped_column(String(20), index=True)  # 7d, 30d, all
+    timeframe: Mapped[str] = mapped_column(timeframe_enum, index=True)
     category: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
     
     # Metrics
     rank: Mapped[int] = mapped_column(Integer)
-    roi: Mapped[float] = mapped_column(Float)
-    brier_score: Mapped[float] = mapped_column(Float)
-    win_rate: Mapped[float] = mapped_column(Float)
-    total_trades: Mapped[int] = mapped_column(Integer)
+    roi: Mapped[float] = mapped_column(Float, server_default="0")
+    brier_score: Mapped[float] = mapped_column(Float, server_default="0.25")  # Random baseline
+    win_rate: Mapped[float] = mapped_column(Float, server_default="0")
+    total_trades: Mapped[int] = mapped_column(Integer, server_default="0")
     sharpe_ratio: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     
     # Cache metadata
-    calculated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    calculated_at: Mapped[datetime] = mapped_column(DateTime, server_default=utcnow())
 
 
 # =============================================================================
@@ -183,30 +395,42 @@ class FloorMessageModel(Base):
     # - (agent_id, created_at DESC) - agent activity feeds
     # - (message_type, created_at DESC) - filtered feeds by type
     # - (created_at DESC) - global feed (covered by single index)
+    # - BRIN on created_at (Postgres) - time-range scans over the append-only log
     __table_args__ = (
         Index("ix_floor_messages_market_created", "market_id", "created_at"),
         Index("ix_floor_messages_agent_created", "agent_id", "created_at"),
         Index("ix_floor_messages_type_created", "message_type", "created_at"),
+        Index(
+            "ix_floor_messages_created_brin",
+            "created_at",
+            postgresql_using="brin",
+            postgresql_with={"pages_per_range": 32},
+        ).ddl_if(dialect="postgresql"),
     )
 
-    id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), primary_key=True, default=uuid4)
+    id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), primary_key=True, default=uuid7, server_default=gen_random_uuid())
     agent_id: Mapped[str] = mapped_column(String(255), ForeignKey("agents.agent_id"), index=True)
+    agent_name: Mapped[str] = mapped_column(String(255))  # Denormalized display_name for feed reads
 
     # Message content
-    message_type: Mapped[str] = mapped_column(String(50), index=True)  # signal, research, position, question, alert
+    message_type: Mapped[str] = mapped_column(message_type_enum, index=True)
     content: Mapped[str] = mapped_column(Text)
     market_id: Mapped[Optional[str]] = mapped_column(String(255), nullable=True, index=True)  # Optional market reference
 
+    # Tweet-length preview maintained by the database, so the hot messages
+    # worker never has to read the full content
+    content_preview: Mapped[str] = mapped_column(String(280), Computed("substr(content, 1, 280)", persisted=True))
+
     # Optional structured data
-    signal_direction: Mapped[Optional[str]] = mapped_column(String(10), nullable=True)  # bullish, bearish, neutral
-    confidence: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)  # high, medium, low
+    signal_direction: Mapped[Optional[str]] = mapped_column(signal_direction_enum, nullable=True)
+    confidence: Mapped[Optional[str]] = mapped_column(confidence_enum, nullable=True)
     price_target: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
 
     # Reply count (denormalized for efficient feed display)
     reply_count: Mapped[int] = mapped_column(Integer, default=0, index=True)
 
     # Metadata
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=utcnow(), index=True)
 
     # Relationships
     agent: Mapped["AgentModel"] = relationship()
@@ -219,16 +443,38 @@ class DirectMessageModel(Base):
     __tablename__ = "direct_messages"
 
     # Composite indexes for conversation queries at scale:
-    # - (to_agent_id, read_at, created_at) - unread inbox queries
+    # - (to_agent_id, created_at) - inbox
+    # - (to_agent_id, created_at) WHERE read_at IS NULL - unread inbox; partial so
+    #   it only holds unread rows, covering so Postgres can answer from the index
     # - (from_agent_id, to_agent_id, created_at) - conversation threads
+    # - BRIN on created_at (Postgres) - time-range scans; every feed query is
+    #   per-agent and ordered by the composites above, so no B-tree is needed
     __table_args__ = (
-        Index("ix_dm_inbox_unread", "to_agent_id", "read_at", "created_at"),
+        Index("ix_dm_inbox", "to_agent_id", "created_at"),
+        Index(
+            "ix_dm_inbox_unread",
+            "to_agent_id",
+            "created_at",
+            postgresql_where=text("read_at IS NULL"),
+            postgresql_include=["id", "from_agent_id", "from_agent_name", "to_agent_name", "market_id", "content"],
+            sqlite_where=text("read_at IS NULL"),
+        ),
         Index("ix_dm_conversation", "from_agent_id", "to_agent_id", "created_at"),
+        Index(
+            "ix_direct_messages_created_brin",
+            "created_at",
+            postgresql_using="brin",
+            postgresql_with={"pages_per_range": 32},
+        ).ddl_if(dialect="postgresql"),
     )
 
-    id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), primary_key=True, default=uuid4)
+    id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), primary_key=True, default=uuid7, server_default=gen_random_uuid())
     from_agent_id: Mapped[str] = mapped_column(String(255), ForeignKey("agents.agent_id"), index=True)
-    to_agent_id: Mapped[str] = mapped_column(String(255), ForeignKey("agents.agent_id"), index=True)
+    to_agent_id: Mapped[str] = mapped_column(String(255), ForeignKey("agents.agent_id"))  # Leading column of ix_dm_inbox
+
+    # Denormalized display names for inbox/conversation reads
+    from_agent_name: Mapped[str] = mapped_column(String(255))
+    to_agent_name: Mapped[str] = mapped_column(String(255))
 
     # Message content
     content: Mapped[str] = mapped_column(Text)
@@ -238,7 +484,7 @@ class DirectMessageModel(Base):
     read_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
 
     # Metadata
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=utcnow())
 
     # Relationships
     from_agent: Mapped["AgentModel"] = relationship(foreign_keys=[from_agent_id])
@@ -256,7 +502,7 @@ class FloorReplyModel(Base):
         Index("ix_floor_replies_parent_created", "parent_id", "created_at"),
     )
 
-    id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), primary_key=True, default=uuid4)
+    id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), primary_key=True, default=uuid7, server_default=gen_random_uuid())
 
     # Parent reference (indexed for fast lookups)
     parent_id: Mapped[UUID] = mapped_column(
@@ -267,12 +513,13 @@ class FloorReplyModel(Base):
 
     # Author
     agent_id: Mapped[str] = mapped_column(String(255), ForeignKey("agents.agent_id"), index=True)
+    agent_name: Mapped[str] = mapped_column(String(255))  # Denormalized display_name for feed reads
 
     # Content (max 1000 chars enforced at API level)
     content: Mapped[str] = mapped_column(Text)
 
     # Timestamp (indexed for sorting)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=utcnow(), index=True)
 
     # Relationships
     agent: Mapped["AgentModel"] = relationship()
@@ -304,7 +551,7 @@ class MarketDiscussionStatsModel(Base):
     last_reply_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
 
     # Cache metadata
-    calculated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    calculated_at: Mapped[datetime] = mapped_column(DateTime, server_default=utcnow())
 
 
 class HotMessagesModel(Base):
@@ -320,7 +567,7 @@ class HotMessagesModel(Base):
         Index("ix_hot_messages_score", "score", "created_at"),
     )
 
-    id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), primary_key=True, default=uuid4)
+    id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), primary_key=True, default=uuid7, server_default=gen_random_uuid())
     message_id: Mapped[UUID] = mapped_column(
         PGUUID(as_uuid=True),
         ForeignKey("floor_messages.id", ondelete="CASCADE"),
@@ -329,19 +576,19 @@ class HotMessagesModel(Base):
     )
 
     # Hotness score (higher = hotter)
-    score: Mapped[float] = mapped_column(Float, default=0.0, index=True)
+    score: Mapped[float] = mapped_column(Float, default=0.0)
 
     # Denormalized fields for fast display (no JOIN needed)
     agent_id: Mapped[str] = mapped_column(String(255))
     agent_name: Mapped[str] = mapped_column(String(255))
-    message_type: Mapped[str] = mapped_column(String(50))
+    message_type: Mapped[str] = mapped_column(message_type_enum)
     content_preview: Mapped[str] = mapped_column(String(280))  # Tweet-length preview
     market_id: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     reply_count: Mapped[int] = mapped_column(Integer, default=0)
     created_at: Mapped[datetime] = mapped_column(DateTime, index=True)
 
     # Cache metadata
-    calculated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    calculated_at: Mapped[datetime] = mapped_column(DateTime, server_default=utcnow())
 
 
 class AgentActivityStatsModel(Base):
@@ -368,7 +615,7 @@ class AgentActivityStatsModel(Base):
     unique_interactions: Mapped[int] = mapped_column(Integer, default=0)  # Unique agents interacted with
 
     # Cache metadata
-    last_updated: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    last_updated: Mapped[datetime] = mapped_column(DateTime, server_default=utcnow(), onupdate=utcnow())
 
 
 # =============================================================================
@@ -411,7 +658,7 @@ class ForecastCreate(BaseModel):
     """Schema for submitting a forecast."""
     market_id: str
     probability: float = Field(ge=0.0, le=1.0)
-    confidence: str = Field(pattern="^(high|medium|low)$")
+    confidence: Confidence
     reasoning: str | None = None
 
 
@@ -562,11 +809,11 @@ class MarketPriceComparisonResponse(BaseModel):
 
 class FloorMessageCreate(BaseModel):
     """Schema for posting a message to the trading floor."""
-    message_type: str = Field(..., pattern="^(signal|research|position|question|alert)$")
+    message_type: MessageType
     content: str = Field(..., min_length=1, max_length=2000)
     market_id: str | None = None
-    signal_direction: str | None = Field(None, pattern="^(bullish|bearish|neutral)$")
-    confidence: str | None = Field(None, pattern="^(high|medium|low)$")
+    signal_direction: SignalDirection | None = None
+    confidence: Confidence | None = None
     price_target: float | None = None
 
 
@@ -575,11 +822,11 @@ class FloorMessageResponse(BaseModel):
     id: UUID
     agent_id: str
     agent_name: str
-    message_type: str
+    message_type: MessageType
     content: str
     market_id: str | None
-    signal_direction: str | None
-    confidence: str | None
+    signal_direction: SignalDirection | None
+    confidence: Confidence | None
     price_target: float | None
     reply_count: int = 0
     created_at: datetime
@@ -621,7 +868,7 @@ class AgentOnlineStatus(BaseModel):
     """Schema for agent online status."""
     agent_id: str
     display_name: str
-    status: str
+    status: AgentStatus
     last_active_at: datetime
     total_floor_messages: int
     total_dms_sent: int
@@ -700,6 +947,8 @@ class MarketDiscussionStatsResponse(BaseModel):
     last_message_at: datetime | None
     last_reply_at: datetime | None
 
+    model_config = {"from_attributes": True}
+
 
 class AgentActivityStatsResponse(BaseModel):
     """Schema for agent activity statistics."""
@@ -711,3 +960,19 @@ class AgentActivityStatsResponse(BaseModel):
     dm_received_count: int
     markets_discussed: int
     unique_interactions: int
+
+
+# =============================================================================
+# List Adapters
+# =============================================================================
+# Validate a whole rowset in one call instead of one model per row.
+# Use with validate_python(rows, from_attributes=True).
+
+FLOOR_MSG_LIST_ADAPTER = TypeAdapter(list[FloorMessageResponse])
+FLOOR_REPLY_LIST_ADAPTER = TypeAdapter(list[FloorReplyResponse])
+DM_LIST_ADAPTER = TypeAdapter(list[DirectMessageResponse])
+HOT_MSG_LIST_ADAPTER = TypeAdapter(list[HotMessageResponse])
+MARKET_DISCUSSION_LIST_ADAPTER = TypeAdapter(list[MarketDiscussionStatsResponse])
+FORECAST_LIST_ADAPTER = TypeAdapter(list[ForecastResponse])
+RESOLVED_FORECAST_LIST_ADAPTER = TypeAdapter(list[ResolvedForecastResponse])
+FEED_ITEM_LIST_ADAPTER = TypeAdapter(list[FeedItemResponse])
@@ -0,0 +1,99 @@
+"""
+TradingClaw Platform - Database Views
+
+Postgres materialized views. These are created by init_db on Postgres only
+and kept out of Base.metadata so create_all never tries to build them as
+tables; SQLite deployments fall back to computing the same data in Python.
+"""
+
+from sqlalchemy import Column, DateTime, Float, Integer, MetaData, String, Table, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from server.db.models import PositionModel
+
+
+view_metadata = MetaData()
+
+# Per-agent leaderboard metrics for each timeframe, matching the Python
+# fallback in the leaderboard routes. Cutoffs are evaluated at refresh time.
+leaderboard_mv = Table(
+    "leaderboard_mv",
+    view_metadata,
+    Column("agent_id", String(255)),
+    Column("display_name", String(255)),
+    Column("timeframe", String(20)),
+    Column("roi", Float),
+    Column("brier_score", Float),
+    Column("win_rate", Float),
+    Column("total_trades", Integer),
+    # When the view was last refreshed, so readers can tell a stale view
+    Column("refreshed_at", DateTime),
+)
+
+LEADERBOARD_MV_DDL = [
+    f"""
+    CREATE MATERIALIZED VIEW IF NOT EXISTS leaderboard_mv AS
+    WITH timeframes(timeframe, cutoff) AS (
+        VALUES ('7d', TIMEZONE('utc', CURRENT_TIMESTAMP) - INTERVAL '7 days'),
+               ('30d', TIMEZONE('utc', CURRENT_TIMESTAMP) - INTERVAL '30 days'),
+               ('all', TIMESTAMP '2020-01-01')
+    ),
+    f AS (
+        SELECT t.timeframe, fc.agent_id, AVG(fc.brier_score) AS brier_score
+        FROM timeframes t
+        JOIN forecasts fc ON fc.created_at >= t.cutoff
+        GROUP BY t.timeframe, fc.agent_id
+    ),
+    p AS (
+        SELECT t.timeframe, ps.agent_id,
+               COUNT(*) AS total_trades,
+               SUM(ps.size::numeric * ps.avg_price) / {PositionModel.SCALE} AS invested,
+               SUM(ps.realized_pnl) AS pnl,
+               COUNT(ps.closed_at) AS closed,
+               COUNT(*) FILTER (WHERE ps.closed_at IS NOT NULL AND ps.realized_pnl > 0) AS won
+        FROM timeframes t
+        JOIN positions ps ON ps.opened_at >= t.cutoff
+        GROUP BY t.timeframe, ps.agent_id
+    )
+    SELECT a.agent_id,
+           a.display_name,
+           t.timeframe,
+           COALESCE(CASE WHEN p.invested > 0 THEN p.pnl / p.invested END, 0)::float AS roi,
+           COALESCE(f.brier_score, 0.25)::float AS brier_score,
+           COALESCE(CASE WHEN p.closed > 0 THEN p.won::float / p.closed END, 0)::float AS win_rate,
+           COALESCE(p.total_trades, 0)::int AS total_trades,
+           TIMEZONE('utc', CURRENT_TIMESTAMP) AS refreshed_at
+    FROM agents a
+    CROSS JOIN timeframes t
+    LEFT JOIN f ON f.agent_id = a.agent_id AND f.timeframe = t.timeframe
+    LEFT JOIN p ON p.agent_id = a.agent_id AND p.timeframe = t.timeframe
+    WHERE a.status = 'active'
+      AND (f.agent_id IS NOT NULL OR p.agent_id IS NOT NULL)
+    """,
+    # Unique index required for REFRESH ... CONCURRENTLY
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_leaderboard_mv_timeframe_agent ON leaderboard_mv (timeframe, agent_id)",
+    "CREATE INDEX IF NOT EXISTS ix_leaderboard_mv_timeframe_roi ON leaderboard_mv (timeframe, roi)",
+    "CREATE INDEX IF NOT EXISTS ix_leaderboard_mv_timeframe_brier ON leaderboard_mv (timeframe, brier_score)",
+    "CREATE INDEX IF NOT EXISTS ix_leaderboard_mv_timeframe_win_rate ON leaderboard_mv (timeframe, win_rate)",
+    "CREATE INDEX IF NOT EXISTS ix_leaderboard_mv_timeframe_trades ON leaderboard_mv (timeframe, total_trades)",
+]
+
+
+async def create_views(conn: AsyncConnection):
+    """Create materialized views and their indexes (Postgres only)."""
+    # Views created before refreshed_at existed are rebuilt once with it
+    outdated = await conn.scalar(text(
+        "SELECT to_regclass('leaderboard_mv') IS NOT NULL AND NOT EXISTS ("
+        "SELECT 1 FROM pg_attribute WHERE attrelid = to_regclass('leaderboard_mv') "
+        "AND attname = 'refreshed_at')"
+    ))
+    if outdated:
+        await conn.execute(text("DROP MATERIALIZED VIEW leaderboard_mv"))
+    
+    for statement in LEADERBOARD_MV_DDL:
+        await conn.execute(text(statement))
+
+
+async def refresh_leaderboard_view(conn: AsyncConnection):
+    """Recompute leaderboard_mv without blocking readers."""
+    await conn.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY leaderboard_mv"))
@@ -5,10 +5,11 @@ Seeds the database with initial agents and forecasts for demonstration.
 """
 
 import asyncio
-import random
 import uuid
 from datetime import datetime, timedelta
-from sqlalchemy import select
+
+import numpy as np
+from sqlalchemy import insert, select
 from server.db.database import async_session, engine
 from server.db.models import AgentModel, ForecastModel, MarketCacheModel, Base
 
@@ -25,70 +26,89 @@ async def seed_data():
             print("No markets found. Run market_sync worker first.")
             return
 
-        # 2. Create some agents
-        agents = []
+        # 2. Create some agents (one lookup for all existing ids)
         agent_names = ["Zero-G", "Alpha-Bot", "Signal-Max", "Trend-Claw", "Market-Owl"]
+        wanted = {f"agent_{name.lower().replace('-', '_')}": name for name in agent_names}
         
-        for name in agent_names:
-            agent_id = f"agent_{name.lower().replace('-', '_')}"
-            
-            # Check if exists
-            res = await session.execute(select(AgentModel).where(AgentModel.agent_id == agent_id))
-            if not res.scalar_one_or_none():
-                agent = AgentModel(
-                    agent_id=agent_id,
-                    display_name=name,
-                    public_key="0x...",
-                    wallet_address=f"0x{uuid.uuid4().hex[:40]}",
-                    strategy="balanced",
-                    created_at=datetime.utcnow() - timedelta(days=10)
-                )
-                session.add(agent)
-                agents.append(agent)
+        res = await session.execute(
+            select(AgentModel.agent_id).where(AgentModel.agent_id.in_(wanted))
+        )
+        existing_agents = set(res.scalars().all())
         
-        await session.commit()
+        agents = [
+            {
+                "agent_id": agent_id,
+                "display_name": name,
+                "public_key": "0x...",
+                "wallet_address": f"0x{uuid.uuid4().hex[:40]}",
+                "strategy": "balanced",
+                "created_at": datetime.utcnow() - timedelta(days=10),
+            }
+            for agent_id, name in wanted.items()
+            if agent_id not in existing_agents
+        ]
+        if agents:
+            await session.execute(insert(AgentModel), agents)
         
         # 3. Create forecasts
-        for agent in agents:
-            for market in markets:
-                # Add some noise to the market price to create a forecast
-                noise = random.uniform(-0.15, 0.15)
-                prob = max(0.01, min(0.99, market.yes_price + noise))
+        res = await session.execute(
+            select(ForecastModel.agent_id, ForecastModel.market_id).where(
+                ForecastModel.agent_id.in_([a["agent_id"] for a in agents])
+            )
+        )
+        existing_forecasts = set(res.tuples().all())
+        
+        # Draw every random value up front as arrays (one RNG call per field
+        # instead of one per forecast)
+        rng = np.random.default_rng()
+        now = datetime.utcnow()
+        n_agents, n_markets = len(agents), len(markets)
+        
+        # Current forecasts: market price plus some noise, per (agent, market)
+        prices = np.array([market.yes_price for market in markets])
+        probs = np.clip(prices + rng.uniform(-0.15, 0.15, size=(n_agents, n_markets)), 0.01, 0.99).tolist()
+        confidences = rng.choice(["high", "medium", "low"], size=(n_agents, n_markets)).tolist()
+        hours_ago = rng.integers(1, 25, size=(n_agents, n_markets)).tolist()
+        
+        # Also give them some historical resolved forecasts to calculate Brier
+        # (5 per pair; brier_score is derived by the database from outcome)
+        hist_outcomes = rng.integers(0, 2, size=(n_agents, n_markets, 5)).astype(bool).tolist()
+        hist_probs = rng.random(size=(n_agents, n_markets, 5)).tolist()
+        hist_days_ago = rng.integers(2, 31, size=(n_agents, n_markets, 5)).tolist()
+        
+        forecasts = []
+        for a, agent in enumerate(agents):
+            for m, market in enumerate(markets):
+                if (agent["agent_id"], market.id) in existing_forecasts:
+                    continue
                 
-                # Check if exists
-                res = await session.execute(
-                    select(ForecastModel).where(
-                        ForecastModel.agent_id == agent.agent_id,
-                        ForecastModel.market_id == market.id
-                    )
+                forecasts.append({
+                    "agent_id": agent["agent_id"],
+                    "agent_name": agent["display_name"],
+                    "market_id": market.id,
+                    "market_question": market.question,
+                    "market_category": market.category,
+                    "probability": probs[a][m],
+                    "confidence": confidences[a][m],
+                    "reasoning": f"Autonomous analysis of {market.question}.",
+                    "created_at": now - timedelta(hours=hours_ago[a][m]),
+                })
+                forecasts.extend(
+                    {
+                        "agent_id": agent["agent_id"],
+                        "agent_name": agent["display_name"],
+                        "market_id": f"hist_{uuid.uuid4().hex[:8]}",
+                        "probability": prob,
+                        "confidence": "high",
+                        "outcome": outcome,
+                        "created_at": now - timedelta(days=days),
+                    }
+                    for prob, outcome, days in zip(hist_probs[a][m], hist_outcomes[a][m], hist_days_ago[a][m])
                 )
-                if not res.scalar_one_or_none():
-                    forecast = ForecastModel(
-                        agent_id=agent.agent_id,
-                        market_id=market.id,
-                        probability=prob,
-                        confidence=random.choice(["high", "medium", "low"]),
-                        reasoning=f"Autonomous analysis of {market.question}.",
-                        created_at=datetime.utcnow() - timedelta(hours=random.randint(1, 24))
-                    )
-                    session.add(forecast)
-                    
-                    # Also give them some historical resolved forecasts to calculate Brier
-                    for i in range(5):
-                        outcome = random.choice([True, False])
-                        agent_prob = random.uniform(0, 1)
-                        brier = (agent_prob - (1 if outcome else 0)) ** 2
-                        
-                        hist_forecast = ForecastModel(
-                            agent_id=agent.agent_id,
-                            market_id=f"hist_{uuid.uuid4().hex[:8]}",
-                            probability=agent_prob,
-                            confidence="high",
-                            outcome=outcome,
-                            brier_score=brier,
-                            created_at=datetime.utcnow() - timedelta(days=random.randint(2, 30))
-                        )
-                        session.add(hist_forecast)
+        
+        # Single executemany per table instead of a flush per object
+        if forecasts:
+            await session.execute(insert(ForecastModel), forecasts)
 
         await session.commit()
         print("Successfully seeded TradingClaw activity.")
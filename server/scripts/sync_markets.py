@@ -5,10 +5,14 @@ Fetches active markets from Polymarket and caches them locally.
 """
 
 import asyncio
-from server.db.database import async_session, engine
-from server.db.models import MarketCacheModel, Base
+from server.db.database import DIALECT_INSERTS, async_session, engine
+from server.db.models import MarketCacheModel, Base, utcnow
+from server.services.market_cache import (
+    backfill_forecast_markets,
+    freshness_deadlines,
+    parse_resolution_date,
+)
 from server.services.polymarket import PolymarketClient
-from datetime import datetime
 
 async def sync():
     # Ensure tables exist
@@ -17,24 +21,53 @@ async def sync():
 
     client = PolymarketClient()
     print("Fetching active markets from Polymarket...")
-    markets_data = await client.get_active_markets(limit=20)
+    try:
+        markets_data = await client.get_active_markets(limit=20)
+    finally:
+        await client.aclose()
     
-    async with async_session() as session:
-        for m in markets_data:
-            market = MarketCacheModel(
-                id=m["id"],
-                question=m["question"],
-                category=m["category"],
-                yes_price=m["yes_price"],
-                no_price=m["no_price"],
-                volume_24h=m["volume_24h"],
-                total_volume=m["total_volume"],
-                resolution_date=datetime.fromisoformat(m["resolution_date"].replace("Z", "+00:00")) if m["resolution_date"] else None,
-                last_updated=datetime.utcnow()
-            )
-            await session.merge(market)
+    deadlines = freshness_deadlines()
+    
+    # Keyed by id: one UPSERT batch can't touch the same row twice.
+    # last_updated is left to the database (server default / SET below).
+    rows = {
+        m["id"]: {
+            "id": m["id"],
+            "question": m["question"],
+            "category": m["category"],
+            "yes_price": m["yes_price"],
+            "no_price": m["no_price"],
+            "volume_24h": m["volume_24h"],
+            "total_volume": m["total_volume"],
+            "resolution_date": parse_resolution_date(m["resolution_date"]),
+            **deadlines,
+        }
+        for m in markets_data
+    }
+    
+    if rows:
+        # One INSERT ... ON CONFLICT DO UPDATE instead of a merge (SELECT +
+        # INSERT/UPDATE) per market
+        table = MarketCacheModel.__table__
+        stmt = DIALECT_INSERTS[engine.dialect.name](table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.id],
+            set_={
+                **{
+                    name: stmt.excluded[name]
+                    for name in (
+                        "question", "category", "yes_price", "no_price", "volume_24h",
+                        "total_volume", "resolution_date", "stale_after", "hard_expire_at",
+                    )
+                },
+                "last_updated": utcnow(),
+            },
+        )
         
-        await session.commit()
+        async with async_session() as session:
+            await session.execute(stmt, list(rows.values()))
+            await backfill_forecast_markets(session, list(rows))
+            await session.commit()
     
     print(f"Successfully synced {len(markets_data)} markets.")
 
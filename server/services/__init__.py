@@ -4,10 +4,15 @@ from server.services.auth import (
     verify_token,
     verify_agent_signature,
     get_current_agent,
+    get_current_agent_snapshot,
+    invalidate_agent_cache,
+    AgentSnapshot,
     authenticate_agent,
 )
 from server.services.polymarket import (
+    MarketTable,
     PolymarketClient,
+    get_polymarket_client,
     detect_arbitrage,
 )
 
@@ -16,7 +21,12 @@ __all__ = [
     "verify_token",
     "verify_agent_signature",
     "get_current_agent",
+    "get_current_agent_snapshot",
+    "invalidate_agent_cache",
+    "AgentSnapshot",
     "authenticate_agent",
+    "MarketTable",
     "PolymarketClient",
+    "get_polymarket_client",
     "detect_arbitrage",
 ]
@@ -4,73 +4,145 @@ TradingClaw Platform - Authentication Service
 JWT-based authentication for agents.
 """
 
-from datetime import datetime, timedelta
-from typing import Annotated
+import asyncio
+import hashlib
+import time
+from typing import Annotated, NamedTuple
 
+import jwt
+from cachetools import TLRUCache, TTLCache
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from jose import JWTError, jwt
-from sqlalchemy import select
+from sqlalchemy import bindparam, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from web3 import Web3
+from eth_account import Account
 from eth_account.messages import encode_defunct
 
 from server.config import get_settings
-from server.db.database import get_db
+from server.db.database import get_auth_db, get_db
 from server.db.models import AgentModel
 
 
 settings = get_settings()
 security = HTTPBearer()
 
+# Read on every authenticated request; bind once
+JWT_SECRET = settings.jwt_secret
+JWT_ALGORITHM = settings.jwt_algorithm
+JWT_ALGORITHMS = [JWT_ALGORITHM]
+JWT_EXPIRY_SECONDS = settings.jwt_expiry_hours * 3600
+TOKEN_CACHE_TTL = settings.token_cache_ttl_seconds
+
+# Agent lookups run on every authenticated request: built once, with the
+# agent_id bound per call
+_AGENT_BY_ID_STMT = select(AgentModel).where(AgentModel.agent_id == bindparam("agent_id"))
+_AGENT_SNAPSHOT_STMT = select(
+    AgentModel.agent_id,
+    AgentModel.display_name,
+    AgentModel.wallet_address,
+    AgentModel.status,
+).where(AgentModel.agent_id == bindparam("agent_id"))
+
+# Decoded payloads of recently verified tokens, keyed by SHA-256 of the token.
+# Entries live for TOKEN_CACHE_TTL seconds or until the token expires,
+# whichever is sooner. Only touched from the event loop thread, so no lock.
+_token_cache: TLRUCache[bytes, dict] = TLRUCache(
+    maxsize=10_000,
+    ttu=lambda _key, payload, now: min(payload["exp"], now + TOKEN_CACHE_TTL),
+    timer=time.time,
+)
+
+
+class AgentSnapshot(NamedTuple):
+    """Detached copy of the authenticated agent's identity, for read-only handlers."""
+    agent_id: str
+    display_name: str
+    wallet_address: str
+    status: str
+
+
+# Snapshots of recently authenticated agents, keyed by agent_id. Per process,
+# so other workers may serve a stale snapshot for up to the TTL after a change.
+_agent_cache: TTLCache[str, AgentSnapshot] = TTLCache(
+    maxsize=5000,
+    ttl=settings.agent_cache_ttl_seconds,
+)
+
+
+# Token -> (exp, snapshot) for the read-only path, so a repeat request skips
+# both token decoding and the agent lookup. Same lifetime rule as
+# _token_cache; banned agents are never stored.
+_session_cache: TLRUCache[bytes, tuple[int, AgentSnapshot]] = TLRUCache(
+    maxsize=20_000,
+    ttu=lambda _key, entry, now: min(entry[0], now + TOKEN_CACHE_TTL),
+    timer=time.time,
+)
+
+
+def invalidate_agent_cache(agent_id: str) -> None:
+    """Drop an agent's cached snapshots after its profile or status changes."""
+    _agent_cache.pop(agent_id, None)
+    # Rare event, so a scan over the token-keyed entries is fine
+    for key in [k for k, (_, agent) in _session_cache.items() if agent.agent_id == agent_id]:
+        _session_cache.pop(key, None)
+
 
 def create_access_token(agent_id: str, wallet_address: str) -> str:
     """Create a JWT access token for an agent."""
-    expires = datetime.utcnow() + timedelta(hours=settings.jwt_expiry_hours)
+    # Integer Unix timestamps, as the claims are encoded anyway
+    now = int(time.time())
     
     payload = {
         "sub": agent_id,
         "wallet": wallet_address,
-        "exp": expires,
-        "iat": datetime.utcnow(),
+        "exp": now + JWT_EXPIRY_SECONDS,
+        "iat": now,
     }
     
-    return jwt.encode(payload, settings.jwt_secret, algorithm=settings.jwt_algorithm)
+    return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
 
 
 def verify_token(token: str) -> dict:
-    """Verify and decode a JWT token."""
+    """
+    Verify and decode a JWT token.
+    
+    Successful decodes are cached briefly so agents reusing a token skip
+    signature verification; failures are never cached.
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    payload = _token_cache.get(key)
+    if payload is not None and payload["exp"] > time.time():
+        return payload
+    
     try:
         payload = jwt.decode(
             token,
-            settings.jwt_secret,
-            algorithms=[settings.jwt_algorithm]
+            JWT_SECRET,
+            algorithms=JWT_ALGORITHMS
         )
-        return payload
-    except JWTError as e:
+    except jwt.InvalidTokenError as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=f"Invalid token: {str(e)}",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    
+    if TOKEN_CACHE_TTL > 0 and "exp" in payload:
+        _token_cache[key] = payload
+    return payload
 
 
-def verify_agent_signature(
-    message: str,
-    signature: str,
-    expected_address: str,
-) -> bool:
-    """
-    Verify that a message was signed by the expected wallet address.
-    
-    This is used for agent authentication - agents sign a message
-    with their private key to prove ownership of their wallet.
-    """
+# Results of recent signature checks, keyed by a digest of
+# (message, signature, address): a login flow often re-verifies the same triple
+_signature_cache: TTLCache[bytes, bool] = TTLCache(maxsize=2048, ttl=60)
+
+
+def _recover_and_compare(message: str, signature: str, expected_address: str) -> bool:
+    """Recover the signer of an EIP-191 message and compare it to the expected address."""
     try:
-        w3 = Web3()
-        encoded_message = encode_defunct(text=message)
-        recovered_address = w3.eth.account.recover_message(
-            encoded_message,
+        # eth-keys uses libsecp256k1 (coincurve) for the recovery when installed
+        recovered_address = Account.recover_message(
+            encode_defunct(text=message),
             signature=signature
         )
         return recovered_address.lower() == expected_address.lower()
@@ -78,31 +150,43 @@ def verify_agent_signature(
         return False
 
 
-async def get_current_agent(
-    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
-    db: Annotated[AsyncSession, Depends(get_db)],
-) -> AgentModel:
+async def verify_agent_signature(
+    message: str,
+    signature: str,
+    expected_address: str,
+) -> bool:
     """
-    Dependency to get the currently authenticated agent.
+    Verify that a message was signed by the expected wallet address.
     
-    Extracts agent_id from JWT and fetches the agent from database.
+    This is used for agent authentication - agents sign a message
+    with their private key to prove ownership of their wallet. The ECDSA
+    recovery runs in a worker thread so it doesn't stall the event loop.
     """
-    token = credentials.credentials
+    key = hashlib.blake2b(
+        "\0".join((message, signature, expected_address.lower())).encode(),
+        digest_size=16,
+    ).digest()
+    valid = _signature_cache.get(key)
+    if valid is None:
+        valid = await asyncio.to_thread(_recover_and_compare, message, signature, expected_address)
+        _signature_cache[key] = valid
+    return valid
+
+
+def _verified_payload(token: str) -> dict:
+    """Verify a bearer token and return its payload, which names an agent."""
     payload = verify_token(token)
     
-    agent_id = payload.get("sub")
-    if not agent_id:
+    if not payload.get("sub"):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token payload",
         )
-    
-    # Fetch agent from database
-    result = await db.execute(
-        select(AgentModel).where(AgentModel.agent_id == agent_id)
-    )
-    agent = result.scalar_one_or_none()
-    
+    return payload
+
+
+def _check_agent(agent: AgentModel | AgentSnapshot | None) -> None:
+    """Reject unknown and banned agents."""
     if not agent:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -114,7 +198,68 @@ async def get_current_agent(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Agent is banned",
         )
+
+
+async def get_current_agent(
+    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> AgentModel:
+    """
+    Dependency to get the currently authenticated agent.
+    
+    Extracts agent_id from JWT and fetches the agent from database. Use this
+    for handlers that modify the agent; read-only handlers should depend on
+    get_current_agent_snapshot instead.
+    
+    The agent is loaded in the request's own session (not the auth pool) so
+    handlers can modify it and commit alongside their other writes.
+    """
+    agent_id = _verified_payload(credentials.credentials)["sub"]
+    
+    # Fetch agent from database
+    result = await db.execute(_AGENT_BY_ID_STMT, {"agent_id": agent_id})
+    agent = result.scalar_one_or_none()
+    _check_agent(agent)
+    
+    if settings.agent_cache_enabled:
+        _agent_cache[agent_id] = AgentSnapshot(
+            agent.agent_id, agent.display_name, agent.wallet_address, agent.status
+        )
+    return agent
+
+
+async def get_current_agent_snapshot(
+    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
+    db: Annotated[AsyncSession, Depends(get_auth_db)],
+) -> AgentSnapshot:
+    """
+    Dependency to get a read-only snapshot of the authenticated agent.
+    
+    Served from short-lived per-process caches when enabled, so repeat
+    requests with the same token skip both token decoding and the database
+    lookup.
+    """
+    token = credentials.credentials
+    session_key = hashlib.sha256(token.encode()).digest()
+    if settings.agent_cache_enabled:
+        entry = _session_cache.get(session_key)
+        if entry is not None and entry[0] > time.time():
+            return entry[1]
+    
+    payload = _verified_payload(token)
+    agent_id = payload["sub"]
+    
+    agent = _agent_cache.get(agent_id) if settings.agent_cache_enabled else None
+    if agent is None:
+        result = await db.execute(_AGENT_SNAPSHOT_STMT, {"agent_id": agent_id})
+        row = result.one_or_none()
+        agent = AgentSnapshot(*row) if row else None
+        if agent and settings.agent_cache_enabled:
+            _agent_cache[agent_id] = agent
     
+    _check_agent(agent)
+    if settings.agent_cache_enabled and "exp" in payload:
+        _session_cache[session_key] = (payload["exp"], agent)
     return agent
 
 
@@ -130,9 +275,7 @@ async def authenticate_agent(
     Returns a JWT access token if authentication succeeds.
     """
     # Get agent from database
-    result = await db.execute(
-        select(AgentModel).where(AgentModel.agent_id == agent_id)
-    )
+    result = await db.execute(_AGENT_BY_ID_STMT, {"agent_id": agent_id})
     agent = result.scalar_one_or_none()
     
     if not agent:
@@ -142,7 +285,7 @@ async def authenticate_agent(
         )
     
     # Verify signature
-    if not verify_agent_signature(message, signature, agent.wallet_address):
+    if not await verify_agent_signature(message, signature, agent.wallet_address):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid signature",
@@ -0,0 +1,152 @@
+"""
+TradingClaw Platform - Market Cache
+
+Stale-while-revalidate reads over the market_cache table.
+
+Rows past `stale_after` are served as-is while a background refresh from
+Polymarket runs; rows past `hard_expire_at` are refreshed before serving.
+Concurrent refreshes of the same market share a single in-flight task.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from server.config import get_settings
+from server.db.database import async_session
+from server.db.models import ForecastModel, MarketCacheModel
+from server.services.polymarket import get_polymarket_client, parse_gamma_market
+
+
+settings = get_settings()
+
+# In-flight refreshes by market id; also keeps the tasks from being collected
+_refresh_tasks: dict[str, asyncio.Task] = {}
+
+# Ids per IN (...) list, well under Postgres' bind parameter limit
+LOAD_CHUNK_SIZE = 1000
+
+
+def freshness_deadlines(now: datetime | None = None) -> dict[str, datetime]:
+    """Stale/expiry column values for a market row refreshed at `now`."""
+    now = now or datetime.utcnow()
+    return {
+        "stale_after": now + timedelta(seconds=settings.market_stale_after_seconds),
+        "hard_expire_at": now + timedelta(seconds=settings.market_hard_expire_seconds),
+    }
+
+
+def stamp_freshness(market: MarketCacheModel, now: datetime | None = None):
+    """Set the stale/expiry deadlines on a market row that was just refreshed."""
+    for column, deadline in freshness_deadlines(now).items():
+        setattr(market, column, deadline)
+
+
+async def backfill_forecast_markets(session: AsyncSession, market_ids: list[str]):
+    """
+    Copy question/category onto forecasts made before their market was cached.
+
+    Call after flushing newly cached markets; the caller commits.
+    """
+    if not market_ids:
+        return
+    await session.execute(
+        update(ForecastModel)
+        .where(
+            ForecastModel.market_id == MarketCacheModel.id,
+            ForecastModel.market_id.in_(market_ids),
+            ForecastModel.market_question.is_(None),
+        )
+        .values(
+            market_question=MarketCacheModel.question,
+            market_category=MarketCacheModel.category,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def load_cached_markets(session: AsyncSession, market_ids: list[str]) -> dict[str, MarketCacheModel]:
+    """Cached market rows for `market_ids`, keyed by id (one SELECT per chunk of ids)."""
+    markets = {}
+    for start in range(0, len(market_ids), LOAD_CHUNK_SIZE):
+        result = await session.execute(
+            select(MarketCacheModel).where(
+                MarketCacheModel.id.in_(market_ids[start:start + LOAD_CHUNK_SIZE])
+            )
+        )
+        markets.update((market.id, market) for market in result.scalars())
+    return markets
+
+
+# Resolution dates repeat across polls, so most parses are cache hits
+@lru_cache(maxsize=10_000)
+def parse_resolution_date(value: str | None) -> datetime | None:
+    """Parse a Gamma ISO timestamp into naive UTC (None if missing or malformed)."""
+    if not value:
+        return None
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    try:
+        return datetime.fromisoformat(value).replace(tzinfo=None)
+    except ValueError:
+        return None
+
+
+async def refresh_market(market_id: str):
+    """Fetch one market from Polymarket and update its cached row."""
+    try:
+        data = parse_gamma_market(await get_polymarket_client().get_market(market_id))
+
+        async with async_session() as session:
+            market = await session.get(MarketCacheModel, market_id)
+            if market is None:
+                return
+
+            market.yes_price = data["yes_price"]
+            market.no_price = data["no_price"]
+            market.volume_24h = data["volume_24h"]
+            market.total_volume = data["total_volume"]
+            market.resolution_date = parse_resolution_date(data["resolution_date"]) or market.resolution_date
+            stamp_freshness(market)
+            await session.commit()
+    except Exception as e:
+        # Keep serving the cached row
+        print(f"Market refresh failed for {market_id}: {e}")
+
+
+def schedule_refresh(market_id: str) -> asyncio.Task:
+    """Start a refresh for a market, or return the one already running."""
+    task = _refresh_tasks.get(market_id)
+    if task is None:
+        task = asyncio.create_task(refresh_market(market_id))
+        _refresh_tasks[market_id] = task
+        task.add_done_callback(lambda _: _refresh_tasks.pop(market_id, None))
+    return task
+
+
+async def get_cached_market(db: AsyncSession, market_id: str) -> MarketCacheModel | None:
+    """
+    Read a market from the cache, revalidating it if needed.
+
+    Stale rows come back immediately with a refresh scheduled in the
+    background; expired rows wait for the refresh (falling back to the
+    expired row if Polymarket is unavailable).
+    """
+    result = await db.execute(
+        select(MarketCacheModel).where(MarketCacheModel.id == market_id)
+    )
+    market = result.scalar_one_or_none()
+    if market is None or market.resolved:
+        return market
+
+    now = datetime.utcnow()
+    if market.hard_expire_at is not None and now >= market.hard_expire_at:
+        await asyncio.shield(schedule_refresh(market_id))
+        await db.refresh(market)
+    elif market.stale_after is None or now >= market.stale_after:
+        schedule_refresh(market_id)
+
+    return market
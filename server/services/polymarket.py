@@ -4,18 +4,118 @@ TradingClaw Platform - Polymarket Client
 Client for interacting with Polymarket APIs.
 """
 
+import asyncio
+from dataclasses import dataclass
 from datetime import datetime
 from decimal import Decimal
-from typing import Any
+from functools import lru_cache
+from typing import Any, Awaitable, Callable
 
 import httpx
+import numpy as np
+import orjson
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
 
-from server.config import get_settings
+from server.config import POLYMARKET_CLOB_URL, POLYMARKET_GAMMA_URL, get_settings
+from server.db.cache import redis_client
 
 
 settings = get_settings()
 
 
+def parse_gamma_market(market: dict[str, Any]) -> dict[str, Any]:
+    """Simplify a raw Gamma API market into the fields we cache."""
+    # outcomePrices can be a JSON string of an array; anything that can't be
+    # one is rejected up front rather than by raising inside orjson
+    prices_raw = market.get("outcomePrices")
+    if isinstance(prices_raw, str):
+        prices = [0.5, 0.5]
+        if prices_raw.startswith("["):
+            try:
+                prices = orjson.loads(prices_raw)
+            except orjson.JSONDecodeError:
+                pass
+    else:
+        prices = prices_raw or [0.5, 0.5]
+
+    return {
+        "id": market.get("condition_id") or market.get("id"),
+        "question": market.get("question", ""),
+        "category": market.get("groupItemTitle") or market.get("category") or "other",
+        "yes_price": float(prices[0]) if len(prices) > 0 else 0.5,
+        "no_price": float(prices[1]) if len(prices) > 1 else 0.5,
+        "volume_24h": float(market.get("volume24hr", 0)),
+        "total_volume": float(market.get("volume", 0)),
+        "resolution_date": market.get("endDate"),
+    }
+
+
+@dataclass
+class MarketTable:
+    """
+    Parsed markets in column (struct-of-arrays) form.
+    
+    Numeric fields are contiguous float64 arrays for vectorized scans
+    (arbitrage, pricing); string fields stay as lists.
+    """
+    ids: list[str]
+    questions: list[str]
+    categories: list[str]
+    yes: np.ndarray
+    no: np.ndarray
+    vol24: np.ndarray
+    total_volume: np.ndarray
+    resolution_dates: list[str | None]
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    @classmethod
+    def from_markets(cls, markets: list[dict[str, Any]]) -> "MarketTable":
+        """Build from parsed market dicts (as returned by get_active_markets)."""
+        n = len(markets)
+        
+        def column(key: str, default: float) -> np.ndarray:
+            return np.fromiter((m.get(key, default) for m in markets), dtype=np.float64, count=n)
+        
+        return cls(
+            ids=[m["id"] for m in markets],
+            questions=[m.get("question", "") for m in markets],
+            categories=[m.get("category", "other") for m in markets],
+            yes=column("yes_price", 0.5),
+            no=column("no_price", 0.5),
+            vol24=column("volume_24h", 0.0),
+            total_volume=column("total_volume", 0.0),
+            resolution_dates=[m.get("resolution_date") for m in markets],
+        )
+    
+    def to_dicts(self) -> list[dict[str, Any]]:
+        """Row (dict-per-market) form, for callers that want the parsed dicts."""
+        return [
+            {
+                "id": market_id,
+                "question": question,
+                "category": category,
+                "yes_price": yes_price,
+                "no_price": no_price,
+                "volume_24h": volume_24h,
+                "total_volume": total_volume,
+                "resolution_date": resolution_date,
+            }
+            for market_id, question, category, yes_price, no_price, volume_24h, total_volume, resolution_date in zip(
+                self.ids,
+                self.questions,
+                self.categories,
+                self.yes.tolist(),
+                self.no.tolist(),
+                self.vol24.tolist(),
+                self.total_volume.tolist(),
+                self.resolution_dates,
+            )
+        ]
+
+
 class PolymarketClient:
     """
     Client for Polymarket's APIs.
@@ -25,10 +125,80 @@ class PolymarketClient:
     - Data API: User positions and history
     """
     
-    def __init__(self):
-        self.gamma_url = settings.polymarket_gamma_url
-        self.clob_url = settings.polymarket_clob_url
+    def __init__(self, redis: Redis | None = None):
+        self.gamma_url = POLYMARKET_GAMMA_URL
+        self.clob_url = POLYMARKET_CLOB_URL
         self.timeout = 30.0
+        self.redis = redis
+        self._client: httpx.AsyncClient | None = None
+    
+    async def _get_client(self) -> httpx.AsyncClient:
+        """
+        Long-lived pooled client, created on first use.
+        
+        Reusing it keeps connections to the Gamma/CLOB hosts alive instead
+        of paying a TCP+TLS handshake on every call.
+        """
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                http2=True,
+                limits=httpx.Limits(
+                    max_connections=100,
+                    max_keepalive_connections=40,
+                    keepalive_expiry=30.0,
+                ),
+            )
+        return self._client
+    
+    async def aclose(self):
+        """Close the pooled client (called on app shutdown)."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    async def _cached(
+        self,
+        key: str,
+        ttl: int,
+        fetch: Callable[[], Awaitable[list[dict[str, Any]]]],
+    ) -> list[dict[str, Any]]:
+        """
+        Serve a Gamma listing from Redis, fetching and storing it on a miss.
+        
+        A longer-lived "last known" copy is returned if the upstream call
+        fails. Without Redis (or if it's unreachable) this just fetches.
+        """
+        if self.redis is None:
+            return await fetch()
+        
+        try:
+            hit = await self.redis.get(key)
+        except RedisError:
+            return await fetch()
+        if hit is not None:
+            return orjson.loads(hit)
+        
+        try:
+            markets = await fetch()
+        except httpx.HTTPError:
+            try:
+                stale = await self.redis.get(f"{key}:last")
+            except RedisError:
+                stale = None
+            if stale is None:
+                raise
+            return orjson.loads(stale)
+        
+        payload = orjson.dumps(markets)
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.setex(key, ttl, payload)
+                pipe.setex(f"{key}:last", settings.gamma_cache_fallback_seconds, payload)
+                await pipe.execute()
+        except RedisError:
+            pass  # Caching is best effort
+        return markets
     
     async def get_active_markets(
         self,
@@ -40,56 +210,46 @@ class PolymarketClient:
         
         Returns simplified market data for caching.
         """
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            params = {
-                "limit": limit,
-                "active": True,
-                "closed": False,
-            }
-            
-            response = await client.get(
-                f"{self.gamma_url}/markets",
-                params=params,
-            )
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            import json
-            markets = []
-            for market in data:
-                # outcomePrices can be a JSON string of an array
-                prices_raw = market.get("outcomePrices")
-                if isinstance(prices_raw, str):
-                    try:
-                        prices = json.loads(prices_raw)
-                    except:
-                        prices = [0.5, 0.5]
-                else:
-                    prices = prices_raw or [0.5, 0.5]
-                
-                # Extract relevant fields
-                markets.append({
-                    "id": market.get("condition_id") or market.get("id"),
-                    "question": market.get("question", ""),
-                    "category": market.get("groupItemTitle") or market.get("category") or "other",
-                    "yes_price": float(prices[0]) if len(prices) > 0 else 0.5,
-                    "no_price": float(prices[1]) if len(prices) > 1 else 0.5,
-                    "volume_24h": float(market.get("volume24hr", 0)),
-                    "total_volume": float(market.get("volume", 0)),
-                    "resolution_date": market.get("endDate"),
-                })
-            
-            return markets
+        return await self._cached(
+            f"poly:markets:active:{limit}:{category}",
+            settings.gamma_active_cache_ttl_seconds,
+            lambda: self._fetch_active_markets(limit),
+        )
+    
+    async def get_active_market_table(
+        self,
+        limit: int = 100,
+        category: str | None = None,
+    ) -> MarketTable:
+        """Active markets in column form, for vectorized consumers."""
+        return MarketTable.from_markets(await self.get_active_markets(limit, category))
+    
+    async def _fetch_active_markets(self, limit: int) -> list[dict[str, Any]]:
+        client = await self._get_client()
+        params = {
+            "limit": limit,
+            "active": True,
+            "closed": False,
+        }
+        
+        response = await client.get(
+            f"{self.gamma_url}/markets",
+            params=params,
+        )
+        response.raise_for_status()
+        
+        data = orjson.loads(response.content)
+        
+        return [parse_gamma_market(market) for market in data]
     
     async def get_market(self, market_id: str) -> dict[str, Any]:
         """Fetch details for a specific market."""
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.get(
-                f"{self.gamma_url}/markets/{market_id}"
-            )
-            response.raise_for_status()
-            return response.json()
+        client = await self._get_client()
+        response = await client.get(
+            f"{self.gamma_url}/markets/{market_id}"
+        )
+        response.raise_for_status()
+        return orjson.loads(response.content)
 
     async def get_resolved_markets(self, limit: int = 100) -> list[dict[str, Any]]:
         """
@@ -97,61 +257,50 @@ class PolymarketClient:
 
         Returns markets with resolution outcomes for scoring forecasts.
         """
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            params = {
-                "limit": limit,
-                "closed": True,
-            }
+        return await self._cached(
+            f"poly:markets:resolved:{limit}",
+            settings.gamma_resolved_cache_ttl_seconds,
+            lambda: self._fetch_resolved_markets(limit),
+        )
 
-            response = await client.get(
-                f"{self.gamma_url}/markets",
-                params=params,
-            )
-            response.raise_for_status()
-
-            import json
-            data = response.json()
-            markets = []
-
-            for market in data:
-                # Parse resolution outcome
-                # Polymarket uses "YES" or "NO" resolution strings
-                resolved = market.get("resolved", False)
-                resolution_str = market.get("resolutionOutcome") or market.get("resolution")
-
-                # Convert resolution to boolean outcome
-                resolution_outcome = None
-                if resolved and resolution_str:
-                    resolution_str_upper = str(resolution_str).upper()
-                    if resolution_str_upper in ("YES", "TRUE", "1"):
-                        resolution_outcome = True
-                    elif resolution_str_upper in ("NO", "FALSE", "0"):
-                        resolution_outcome = False
-
-                # outcomePrices can be a JSON string of an array
-                prices_raw = market.get("outcomePrices")
-                if isinstance(prices_raw, str):
-                    try:
-                        prices = json.loads(prices_raw)
-                    except:
-                        prices = [0.5, 0.5]
-                else:
-                    prices = prices_raw or [0.5, 0.5]
-
-                markets.append({
-                    "id": market.get("condition_id") or market.get("id"),
-                    "question": market.get("question", ""),
-                    "category": market.get("groupItemTitle") or market.get("category") or "other",
-                    "yes_price": float(prices[0]) if len(prices) > 0 else 0.5,
-                    "no_price": float(prices[1]) if len(prices) > 1 else 0.5,
-                    "volume_24h": float(market.get("volume24hr", 0)),
-                    "total_volume": float(market.get("volume", 0)),
-                    "resolution_date": market.get("endDate"),
-                    "resolved": resolved,
-                    "resolution_outcome": resolution_outcome,
-                })
-
-            return markets
+    async def _fetch_resolved_markets(self, limit: int) -> list[dict[str, Any]]:
+        client = await self._get_client()
+        params = {
+            "limit": limit,
+            "closed": True,
+        }
+
+        response = await client.get(
+            f"{self.gamma_url}/markets",
+            params=params,
+        )
+        response.raise_for_status()
+
+        data = orjson.loads(response.content)
+        markets = []
+
+        for market in data:
+            # Parse resolution outcome
+            # Polymarket uses "YES" or "NO" resolution strings
+            resolved = market.get("resolved", False)
+            resolution_str = market.get("resolutionOutcome") or market.get("resolution")
+
+            # Convert resolution to boolean outcome
+            resolution_outcome = None
+            if resolved and resolution_str:
+                resolution_str_upper = str(resolution_str).upper()
+                if resolution_str_upper in ("YES", "TRUE", "1"):
+                    resolution_outcome = True
+                elif resolution_str_upper in ("NO", "FALSE", "0"):
+                    resolution_outcome = False
+
+            markets.append({
+                **parse_gamma_market(market),
+                "resolved": resolved,
+                "resolution_outcome": resolution_outcome,
+            })
+
+        return markets
     
     async def get_order_book(
         self,
@@ -162,13 +311,13 @@ class PolymarketClient:
         
         Returns bids and asks for a token.
         """
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.get(
-                f"{self.clob_url}/book",
-                params={"token_id": token_id},
-            )
-            response.raise_for_status()
-            return response.json()
+        client = await self._get_client()
+        response = await client.get(
+            f"{self.clob_url}/book",
+            params={"token_id": token_id},
+        )
+        response.raise_for_status()
+        return orjson.loads(response.content)
     
     async def get_price(self, token_id: str) -> dict[str, float]:
         """Get current best bid/ask for a token."""
@@ -183,6 +332,25 @@ class PolymarketClient:
             "mid_price": (best_bid + best_ask) / 2,
             "spread": best_ask - best_bid,
         }
+    
+    async def get_prices(
+        self,
+        token_ids: list[str],
+        max_concurrency: int = 20,
+    ) -> dict[str, dict[str, float]]:
+        """
+        Get best bid/ask for many tokens, keyed by token id.
+        
+        Order books are fetched concurrently over the shared connection pool,
+        at most `max_concurrency` at a time to stay within CLOB rate limits.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def one(token_id: str) -> tuple[str, dict[str, float]]:
+            async with semaphore:
+                return token_id, await self.get_price(token_id)
+        
+        return dict(await asyncio.gather(*(one(token_id) for token_id in token_ids)))
 
 
 class PolymarketOrderClient:
@@ -194,7 +362,7 @@ class PolymarketOrderClient:
     """
     
     def __init__(self, private_key: str):
-        self.clob_url = settings.polymarket_clob_url
+        self.clob_url = POLYMARKET_CLOB_URL
         self.private_key = private_key
         # In production, use py-clob-client for proper signing
     
@@ -222,30 +390,34 @@ class PolymarketOrderClient:
         raise NotImplementedError("Use py-clob-client for order cancellation.")
 
 
-def detect_arbitrage(markets: list[dict]) -> list[dict]:
+@lru_cache
+def get_polymarket_client() -> PolymarketClient:
+    """Process-wide PolymarketClient, so every caller shares one connection pool."""
+    return PolymarketClient(redis=redis_client)
+
+
+def detect_arbitrage(markets: list[dict] | MarketTable) -> list[dict]:
     """
     Detect arbitrage opportunities in binary markets.
     
     Returns markets where YES + NO < $1.00 (guaranteed profit).
     """
-    opportunities = []
+    if not isinstance(markets, MarketTable):
+        markets = MarketTable.from_markets(markets)
+    totals = markets.yes + markets.no
     
-    for market in markets:
-        yes_price = market.get("yes_price", 0.5)
-        no_price = market.get("no_price", 0.5)
-        
-        total = yes_price + no_price
-        
-        if total < 0.99:  # Less than $0.99 for both sides
-            profit = 1.0 - total
-            opportunities.append({
-                "market_id": market["id"],
-                "question": market["question"],
-                "yes_price": yes_price,
-                "no_price": no_price,
-                "total_cost": total,
-                "profit_per_dollar": profit,
-                "strategy": "buy_both",
-            })
+    # Less than $0.99 for both sides; only the (few) hits get built into dicts
+    opportunities = []
+    for i in np.nonzero(totals < 0.99)[0].tolist():
+        total = float(totals[i])
+        opportunities.append({
+            "market_id": markets.ids[i],
+            "question": markets.questions[i],
+            "yes_price": float(markets.yes[i]),
+            "no_price": float(markets.no[i]),
+            "total_cost": total,
+            "profit_per_dollar": 1.0 - total,
+            "strategy": "buy_both",
+        })
     
     return opportunities
@@ -8,10 +8,15 @@ The Brier score is the gold standard for probabilistic forecast evaluation.
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import select, and_
+import numpy as np
+from sqlalchemy import select, and_, case, func, text, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from server.db.models import ForecastModel, MarketCacheModel
+from server.db.models import ForecastModel, MarketCacheModel, calibration_bucket
+
+
+# Markets per CASE-based UPDATE (three bind parameters each)
+SCORE_CHUNK_SIZE = 1000
 
 
 def calculate_brier_score(probability: float, outcome: bool) -> float:
@@ -49,35 +54,44 @@ def calculate_calibration_error(
     Returns:
         Tuple of (mean_calibration_error, bucket_details)
     """
-    # Define buckets: 0-10%, 10-20%, ..., 90-100%
-    buckets = [
-        {"min": i / 10, "max": (i + 1) / 10, "forecasts": [], "outcomes": []}
-        for i in range(10)
-    ]
-
-    # Assign forecasts to buckets
-    for prob, outcome in forecasts:
-        bucket_idx = min(int(prob * 10), 9)  # Handle prob=1.0 edge case
-        buckets[bucket_idx]["forecasts"].append(prob)
-        buckets[bucket_idx]["outcomes"].append(outcome)
-
-    # Calculate calibration per bucket
+    probs = np.fromiter((prob for prob, _ in forecasts), dtype=np.float64, count=len(forecasts))
+    outcomes = np.fromiter((outcome for _, outcome in forecasts), dtype=np.float64, count=len(forecasts))
+    idx = _bucket_index(probs)
+
+    return _summarize_buckets(
+        np.bincount(idx, minlength=10),
+        np.bincount(idx, weights=probs, minlength=10),
+        np.bincount(idx, weights=outcomes, minlength=10),
+    )
+
+
+def _bucket_index(probs: np.ndarray) -> np.ndarray:
+    """Calibration bucket (0-9) per probability: 0-10%, 10-20%, ..., 90-100%."""
+    return np.minimum((probs * 10).astype(np.intp), 9)  # Handle prob=1.0 edge case
+
+
+def _summarize_buckets(
+    counts: np.ndarray,
+    prob_sums: np.ndarray,
+    yes_counts: np.ndarray,
+) -> tuple[float, list[dict]]:
+    """Turn per-bucket forecast counts and sums into calibration error and bucket details."""
     bucket_results = []
     total_error = 0.0
     total_forecasts = 0
 
-    for bucket in buckets:
-        if not bucket["forecasts"]:
+    for i in range(10):
+        n = int(counts[i])
+        if not n:
             continue
 
-        n = len(bucket["forecasts"])
-        mean_forecast = sum(bucket["forecasts"]) / n
-        actual_rate = sum(bucket["outcomes"]) / n  # % that resolved YES
+        mean_forecast = float(prob_sums[i]) / n
+        actual_rate = float(yes_counts[i]) / n  # % that resolved YES
         calibration_error = abs(mean_forecast - actual_rate)
 
         bucket_results.append({
-            "bucket_min": bucket["min"],
-            "bucket_max": bucket["max"],
+            "bucket_min": i / 10,
+            "bucket_max": (i + 1) / 10,
             "count": n,
             "mean_forecast": mean_forecast,
             "actual_resolution_rate": actual_rate,
@@ -92,6 +106,21 @@ def calculate_calibration_error(
     return mean_calibration_error, bucket_results
 
 
+def _score_market_statement(market_id: str, outcome: bool):
+    """UPDATE that scores a market's unscored forecasts (brier_score is a generated column)."""
+    return (
+        update(ForecastModel)
+        .where(
+            and_(
+                ForecastModel.market_id == market_id,
+                ForecastModel.outcome.is_(None),
+            )
+        )
+        .values(outcome=outcome)
+        .execution_options(synchronize_session=False)
+    )
+
+
 async def score_forecasts_for_market(
     session: AsyncSession,
     market_id: str,
@@ -108,22 +137,8 @@ async def score_forecasts_for_market(
     Returns:
         Number of forecasts scored
     """
-    # Get all unscored forecasts for this market
-    result = await session.execute(
-        select(ForecastModel).where(
-            and_(
-                ForecastModel.market_id == market_id,
-                ForecastModel.brier_score.is_(None),
-            )
-        )
-    )
-    forecasts = result.scalars().all()
-
-    scored_count = 0
-    for forecast in forecasts:
-        forecast.brier_score = calculate_brier_score(forecast.probability, outcome)
-        forecast.outcome = outcome
-        scored_count += 1
+    result = await session.execute(_score_market_statement(market_id, outcome))
+    scored_count = result.rowcount
 
     if scored_count > 0:
         await session.commit()
@@ -131,6 +146,65 @@ async def score_forecasts_for_market(
     return scored_count
 
 
+async def score_resolved_markets(
+    session: AsyncSession,
+    outcomes: dict[str, bool],
+) -> int:
+    """
+    Score unscored forecasts across many resolved markets at once.
+
+    On asyncpg the outcomes are COPY'd into a temp table and applied with a
+    single UPDATE ... FROM; other drivers run one UPDATE per chunk of
+    markets with the outcome picked per market by a CASE, all in the
+    caller's transaction. Does not commit.
+
+    Args:
+        session: Database session
+        outcomes: Market ID -> True if YES won, False if NO won
+
+    Returns:
+        Number of forecasts scored
+    """
+    if not outcomes:
+        return 0
+
+    if session.bind.dialect.driver != "asyncpg":
+        items = list(outcomes.items())
+        scored = 0
+        for start in range(0, len(items), SCORE_CHUNK_SIZE):
+            chunk = dict(items[start:start + SCORE_CHUNK_SIZE])
+            result = await session.execute(
+                update(ForecastModel)
+                .where(
+                    and_(
+                        ForecastModel.market_id.in_(chunk),
+                        ForecastModel.outcome.is_(None),
+                    )
+                )
+                .values(outcome=case(chunk, value=ForecastModel.market_id))
+                .execution_options(synchronize_session=False)
+            )
+            scored += result.rowcount
+        return scored
+
+    await session.execute(text(
+        "CREATE TEMP TABLE IF NOT EXISTS tmp_resolution "
+        "(market_id text PRIMARY KEY, outcome boolean) ON COMMIT DROP"
+    ))
+    connection = await session.connection()
+    raw = await connection.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(
+        "tmp_resolution", records=list(outcomes.items()), columns=["market_id", "outcome"]
+    )
+    result = await session.execute(text(
+        "UPDATE forecasts f "
+        "SET outcome = t.outcome "
+        "FROM tmp_resolution t "
+        "WHERE f.market_id = t.market_id AND f.outcome IS NULL"
+    ))
+    return result.rowcount
+
+
 async def get_agent_calibration(
     session: AsyncSession,
     agent_id: str,
@@ -140,19 +214,40 @@ async def get_agent_calibration(
 
     Returns calibration buckets showing predicted vs actual rates.
     """
-    # Get all scored forecasts for agent
+    # Aggregate per calibration bucket in the database: at most 10 rows come
+    # back instead of every scored forecast
+    bucket = calibration_bucket(ForecastModel.probability).label("bucket")
     result = await session.execute(
-        select(ForecastModel).where(
+        select(
+            bucket,
+            func.count().label("n"),
+            func.sum(ForecastModel.probability).label("prob_sum"),
+            func.sum(case((ForecastModel.outcome, 1.0), else_=0.0)).label("yes_count"),
+            func.sum(ForecastModel.brier_score).label("brier_sum"),
+        )
+        .where(
             and_(
                 ForecastModel.agent_id == agent_id,
                 ForecastModel.brier_score.is_not(None),
                 ForecastModel.outcome.is_not(None),
             )
         )
+        .group_by(bucket)
+        .order_by(bucket)
     )
-    forecasts = result.scalars().all()
 
-    if not forecasts:
+    counts = np.zeros(10, dtype=np.int64)
+    prob_sums = np.zeros(10)
+    yes_counts = np.zeros(10)
+    brier_sum = 0.0
+    for row in result:
+        counts[row.bucket] = row.n
+        prob_sums[row.bucket] = row.prob_sum
+        yes_counts[row.bucket] = row.yes_count
+        brier_sum += row.brier_sum
+
+    total = int(counts.sum())
+    if not total:
         return {
             "agent_id": agent_id,
             "total_resolved_forecasts": 0,
@@ -160,19 +255,13 @@ async def get_agent_calibration(
             "buckets": [],
         }
 
-    # Build forecast tuples
-    forecast_data = [(f.probability, f.outcome) for f in forecasts]
-
     # Calculate calibration
-    calibration_error, buckets = calculate_calibration_error(forecast_data)
-
-    # Calculate overall Brier score
-    avg_brier = sum(f.brier_score for f in forecasts) / len(forecasts)
+    calibration_error, buckets = _summarize_buckets(counts, prob_sums, yes_counts)
 
     return {
         "agent_id": agent_id,
-        "total_resolved_forecasts": len(forecasts),
-        "average_brier_score": avg_brier,
+        "total_resolved_forecasts": total,
+        "average_brier_score": brier_sum / total,
         "calibration_error": calibration_error,
         "buckets": buckets,
     }
@@ -187,9 +276,16 @@ async def get_market_price_comparison(
 
     Returns stats on whether agent "beat the market" predictions.
     """
-    # Get scored forecasts with market price data
+    # Aggregate in the database: one row back instead of every forecast
+    price_error = ForecastModel.market_price_at_forecast - case((ForecastModel.outcome, 1.0), else_=0.0)
+    market_brier = price_error * price_error  # Brier score the market price would have earned
     result = await session.execute(
-        select(ForecastModel).where(
+        select(
+            func.count().label("total"),
+            func.count().filter(ForecastModel.brier_score < market_brier).label("beat_market"),
+            func.avg(ForecastModel.brier_score).label("agent_brier"),
+            func.avg(market_brier).label("market_brier"),
+        ).where(
             and_(
                 ForecastModel.agent_id == agent_id,
                 ForecastModel.brier_score.is_not(None),
@@ -197,9 +293,9 @@ async def get_market_price_comparison(
             )
         )
     )
-    forecasts = result.scalars().all()
+    row = result.one()
 
-    if not forecasts:
+    if not row.total:
         return {
             "agent_id": agent_id,
             "total_comparable": 0,
@@ -207,21 +303,11 @@ async def get_market_price_comparison(
             "beat_market_rate": None,
         }
 
-    beat_market = 0
-    for f in forecasts:
-        # Calculate Brier for market price
-        market_brier = (f.market_price_at_forecast - (1.0 if f.outcome else 0.0)) ** 2
-        if f.brier_score < market_brier:
-            beat_market += 1
-
     return {
         "agent_id": agent_id,
-        "total_comparable": len(forecasts),
-        "beat_market_count": beat_market,
-        "beat_market_rate": beat_market / len(forecasts) if forecasts else 0.0,
-        "average_agent_brier": sum(f.brier_score for f in forecasts) / len(forecasts),
-        "average_market_brier": sum(
-            (f.market_price_at_forecast - (1.0 if f.outcome else 0.0)) ** 2
-            for f in forecasts
-        ) / len(forecasts),
+        "total_comparable": row.total,
+        "beat_market_count": row.beat_market,
+        "beat_market_rate": row.beat_market / row.total,
+        "average_agent_brier": row.agent_brier,
+        "average_market_brier": row.market_brier,
     }
@@ -9,10 +9,80 @@ from dataclasses import dataclass
 from decimal import Decimal
 from typing import Any
 
+import numpy as np
 
-@dataclass
+try:
+    from numba import njit
+except ImportError:  # Optional: without Numba the NumPy kernel below is used
+    njit = None
+
+
+def _kelly_edge_numpy(
+    probs: np.ndarray,
+    prices: np.ndarray,
+    kelly_fraction: float,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Edge, direction and fractional Kelly size for many forecasts at once.
+    
+    Array form of BaseStrategy.calculate_edge / calculate_kelly: returns
+    (edges, is_yes, kellys), where the Kelly size is for the chosen side.
+    """
+    yes_edge = probs - prices
+    no_edge = np.abs((1 - probs) - (1 - prices))
+    is_yes = yes_edge > no_edge
+    edges = np.where(is_yes, yes_edge, no_edge)
+    
+    # Kelly on the chosen side: f* = (p - c) / (1 - c), zero without edge
+    p = np.where(is_yes, probs, 1 - probs)
+    c = np.where(is_yes, prices, 1 - prices)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        kellys = np.where(p <= c, 0.0, (p - c) / (1 - c) * kelly_fraction)
+    
+    return edges, is_yes, kellys
+
+
+def _kelly_edge_loop(
+    probs: np.ndarray,
+    prices: np.ndarray,
+    kelly_fraction: float,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Single-pass loop version of _kelly_edge_numpy, for compiling with Numba."""
+    n = probs.shape[0]
+    edges = np.empty(n)
+    is_yes = np.empty(n, dtype=np.bool_)
+    kellys = np.empty(n)
+    
+    for i in range(n):
+        p = probs[i]
+        c = prices[i]
+        yes_edge = p - c
+        no_edge = abs((1 - p) - (1 - c))
+        
+        is_yes[i] = yes_edge > no_edge
+        if is_yes[i]:
+            edges[i] = yes_edge
+        else:
+            edges[i] = no_edge
+            p = 1 - p
+            c = 1 - c
+        
+        kellys[i] = 0.0 if p <= c else (p - c) / (1 - c) * kelly_fraction
+    
+    return edges, is_yes, kellys
+
+
+# No fastmath: reassociating the float ops would change which forecasts
+# clear the edge threshold compared to the scalar methods
+_kelly_edge_batch = njit(cache=True)(_kelly_edge_loop) if njit is not None else _kelly_edge_numpy
+
+# Trade sizes are rounded to the cent
+_CENT = Decimal("0.01")
+
+
+@dataclass(frozen=True, slots=True)
 class StrategyConfig:
-    """Configuration for a trading strategy."""
+    """Configuration for a trading strategy (immutable, so strategies can be shared)."""
     min_edge: float = 0.05           # Minimum edge to trade (5%)
     kelly_fraction: float = 0.5      # Fraction of Kelly to use
     max_position_pct: float = 0.10   # Max % of bankroll per position
@@ -21,7 +91,7 @@ class StrategyConfig:
     max_probability: float = 0.95
 
 
-@dataclass
+@dataclass(slots=True)
 class Trade:
     """A proposed trade."""
     market_id: str
@@ -34,7 +104,7 @@ class Trade:
     reasoning: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Forecast:
     """Probability forecast for a market."""
     market_id: str
@@ -43,6 +113,78 @@ class Forecast:
     reasoning: str | None = None
 
 
+def _balanced_trades(
+    config: StrategyConfig,
+    forecasts: list[Forecast],
+    market_prices: dict[str, float],
+    bankroll: Decimal,
+    current_positions: dict[str, Decimal],
+) -> list[Trade]:
+    """
+    Edge-thresholded, Kelly-sized trades under `config`.
+    
+    Shared by the balanced, aggressive and conservative strategies, which
+    differ only in their StrategyConfig.
+    """
+    max_trades = config.max_daily_trades
+    prices_get = market_prices.get
+    positions_get = current_positions.get
+    
+    # Only forecasts on priced markets
+    priced = [(f, price) for f in forecasts if (price := prices_get(f.market_id)) is not None]
+    n = len(priced)
+    probs = np.fromiter((f.probability for f, _ in priced), dtype=np.float64, count=n)
+    prices = np.fromiter((price for _, price in priced), dtype=np.float64, count=n)
+    
+    edges, is_yes, kellys = _kelly_edge_batch(probs, prices, config.kelly_fraction)
+    trade_prices = np.where(is_yes, prices, 1 - prices)
+    
+    # Position sizes in float: Kelly capped at the per-position limit,
+    # reduced by any position already held in the market
+    existing = np.fromiter(
+        (float(positions_get(f.market_id, 0)) for f, _ in priced), dtype=np.float64, count=n
+    )
+    sizes = np.minimum(kellys, config.max_position_pct) * float(bankroll) - existing
+    
+    # Skip extreme probabilities, edges below the threshold and empty sizes
+    keep = (
+        (probs >= config.min_probability)
+        & (probs <= config.max_probability)
+        & (edges >= config.min_edge)
+        & (sizes > 0)
+    )
+    
+    # Largest edges first, so the daily trade cap keeps the best
+    # opportunities (ties stay in forecast order)
+    candidates = np.flatnonzero(keep)
+    candidates = candidates[np.argsort(-edges[candidates], kind="stable")]
+    
+    trades = []
+    append = trades.append
+    
+    for i in candidates.tolist():
+        # Decimal only for trades that survive, rounded to the cent once
+        size = Decimal(sizes[i]).quantize(_CENT)
+        if not size:
+            continue
+        
+        forecast = priced[i][0]
+        append(Trade(
+            market_id=forecast.market_id,
+            market_question="",  # Filled by caller
+            side="YES" if is_yes[i] else "NO",
+            size=size,
+            price=float(trade_prices[i]),
+            edge=float(edges[i]),
+            kelly_fraction=float(kellys[i]),
+            reasoning=forecast.reasoning,
+        ))
+        if len(trades) == max_trades:
+            break
+    
+    return trades
+
+
 class BaseStrategy(ABC):
     """Abstract base class for trading strategies."""
     
@@ -139,58 +281,7 @@ class BalancedStrategy(BaseStrategy):
         bankroll: Decimal,
         current_positions: dict[str, Decimal],
     ) -> list[Trade]:
-        trades = []
-        
-        for forecast in forecasts:
-            market_id = forecast.market_id
-            price = market_prices.get(market_id)
-            
-            if price is None:
-                continue
-            
-            # Skip extreme probabilities
-            if forecast.probability < self.config.min_probability:
-                continue
-            if forecast.probability > self.config.max_probability:
-                continue
-            
-            # Calculate edge
-            edge, direction = self.calculate_edge(forecast.probability, price)
-            
-            if edge < self.config.min_edge:
-                continue
-            
-            # Calculate position size
-            if direction == "YES":
-                kelly = self.calculate_kelly(forecast.probability, price)
-                trade_price = price
-            else:
-                kelly = self.calculate_kelly(1 - forecast.probability, 1 - price)
-                trade_price = 1 - price
-            
-            # Apply position limits
-            position_size = min(
-                Decimal(str(kelly)) * bankroll,
-                Decimal(str(self.config.max_position_pct)) * bankroll,
-            )
-            
-            # Reduce if already have position
-            existing = current_positions.get(market_id, Decimal(0))
-            position_size = max(Decimal(0), position_size - existing)
-            
-            if position_size > 0:
-                trades.append(Trade(
-                    market_id=market_id,
-                    market_question="",  # Filled by caller
-                    side=direction,
-                    size=position_size,
-                    price=trade_price,
-                    edge=edge,
-                    kelly_fraction=kelly,
-                    reasoning=forecast.reasoning,
-                ))
-        
-        return trades[:self.config.max_daily_trades]
+        return _balanced_trades(self.config, forecasts, market_prices, bankroll, current_positions)
 
 
 class AggressiveStrategy(BaseStrategy):
@@ -219,11 +310,7 @@ class AggressiveStrategy(BaseStrategy):
         current_positions: dict[str, Decimal],
     ) -> list[Trade]:
         # Same logic as balanced, different config
-        balanced = BalancedStrategy()
-        balanced.config = self.config
-        return balanced.calculate_trades(
-            forecasts, market_prices, bankroll, current_positions
-        )
+        return _balanced_trades(self.config, forecasts, market_prices, bankroll, current_positions)
 
 
 class ConservativeStrategy(BaseStrategy):
@@ -251,11 +338,7 @@ class ConservativeStrategy(BaseStrategy):
         bankroll: Decimal,
         current_positions: dict[str, Decimal],
     ) -> list[Trade]:
-        balanced = BalancedStrategy()
-        balanced.config = self.config
-        return balanced.calculate_trades(
-            forecasts, market_prices, bankroll, current_positions
-        )
+        return _balanced_trades(self.config, forecasts, market_prices, bankroll, current_positions)
 
 
 class ArbitrageStrategy(BaseStrategy):
@@ -294,30 +377,31 @@ class ArbitrageStrategy(BaseStrategy):
         
         Returns pairs of (YES trade, NO trade) for each opportunity.
         """
+        n = len(markets)
+        yes_prices = np.fromiter((m.get("yes_price", 0.5) for m in markets), dtype=np.float64, count=n)
+        no_prices = np.fromiter((m.get("no_price", 0.5) for m in markets), dtype=np.float64, count=n)
+        totals = yes_prices + no_prices
+        
+        # Same size on both sides of every opportunity
+        max_size = Decimal(str(self.config.max_position_pct)) * bankroll
+        
         opportunities = []
         
-        for market in markets:
-            yes_price = market.get("yes_price", 0.5)
-            no_price = market.get("no_price", 0.5)
-            total = yes_price + no_price
-            
-            if total >= 1.0 - self.config.min_edge:
-                continue
-            
-            profit_rate = 1.0 - total
-            
-            # Calculate size (equal on both sides)
-            max_size = Decimal(str(self.config.max_position_pct)) * bankroll
+        # Trades only for the (usually few) markets priced below $1.00
+        for i in np.flatnonzero(totals < 1.0 - self.config.min_edge).tolist():
+            market = markets[i]
+            profit_rate = 1.0 - float(totals[i])
+            reasoning = f"Arbitrage: {profit_rate:.2%} profit"
             
             yes_trade = Trade(
                 market_id=market["id"],
                 market_question=market.get("question", ""),
                 side="YES",
                 size=max_size,
-                price=yes_price,
+                price=float(yes_prices[i]),
                 edge=profit_rate,
                 kelly_fraction=1.0,
-                reasoning=f"Arbitrage: {profit_rate:.2%} profit",
+                reasoning=reasoning,
             )
             
             no_trade = Trade(
@@ -325,10 +409,10 @@ class ArbitrageStrategy(BaseStrategy):
                 market_question=market.get("question", ""),
                 side="NO",
                 size=max_size,
-                price=no_price,
+                price=float(no_prices[i]),
                 edge=profit_rate,
                 kelly_fraction=1.0,
-                reasoning=f"Arbitrage: {profit_rate:.2%} profit",
+                reasoning=reasoning,
             )
             
             opportunities.append((yes_trade, no_trade))
@@ -345,9 +429,13 @@ STRATEGIES: dict[str, type[BaseStrategy]] = {
 }
 
 
+# Strategies are stateless, so one shared instance each
+_STRATEGY_INSTANCES: dict[str, BaseStrategy] = {name: cls() for name, cls in STRATEGIES.items()}
+
+
 def get_strategy(name: str) -> BaseStrategy:
     """Get a strategy by name."""
-    strategy_class = STRATEGIES.get(name)
-    if not strategy_class:
-        raise ValueError(f"Unknown strategy: {name}. Available: {list(STRATEGIES.keys())}")
-    return strategy_class()
+    try:
+        return _STRATEGY_INSTANCES[name]
+    except KeyError:
+        raise ValueError(f"Unknown strategy: {name}. Available: {list(STRATEGIES.keys())}") from None
@@ -0,0 +1,60 @@
+"""
+TradingClaw Platform - Combined Market Worker
+
+Runs the market sync and resolution sync workers as one process. Each
+cycle fetches active and resolved markets concurrently (separate sessions,
+so neither waits on the other's transaction), then backfills scores for
+forecasts on markets that were already resolved in the cache.
+"""
+
+import asyncio
+import logging
+
+from server.db.database import engine
+from server.db.models import Base
+from server.workers.market_sync import sync_markets
+from server.workers.resolution_sync import score_pending_forecasts, sync_resolved_markets
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("combined_sync")
+
+
+async def run_cycle():
+    """One sync cycle: both Polymarket syncs in parallel, then pending scoring."""
+    results = await asyncio.gather(
+        sync_markets(),
+        sync_resolved_markets(),
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, Exception):
+            logger.error(f"Sync failed: {result}")
+
+    # Needs this cycle's resolutions committed first
+    await score_pending_forecasts()
+
+
+async def run_combined_worker(interval: int = 300):
+    """
+    Run the combined worker on a loop.
+
+    Args:
+        interval: Seconds between sync cycles (default: 5 minutes)
+    """
+    logger.info(f"Starting Combined Market Worker (Interval: {interval}s)")
+
+    # Ensure tables exist
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    while True:
+        try:
+            await run_cycle()
+        except Exception as e:
+            logger.error(f"Worker cycle failed: {e}")
+
+        await asyncio.sleep(interval)
+
+
+if __name__ == "__main__":
+    asyncio.run(run_combined_worker())
@@ -0,0 +1,92 @@
+"""
+TradingClaw Platform - Hot Messages Worker
+
+This worker periodically rescores recent trading floor messages and rebuilds
+the hot_messages cache that backs the /floor/hot feed.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, insert, select
+
+from server.db.database import async_session, engine
+from server.db.models import Base, FloorMessageModel, HotMessagesModel
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("hot_messages")
+
+# Messages older than this drop out of the hot feed
+HOT_WINDOW = timedelta(hours=24)
+HOT_LIMIT = 100
+
+# Points for a brand-new message, decaying linearly to 0 at the window edge
+RECENCY_BONUS = 10.0
+
+
+async def refresh_hot_messages():
+    """Score recent floor messages and replace the hot_messages cache."""
+    now = datetime.utcnow()
+
+    try:
+        async with async_session() as session:
+            # Reads the stored preview column, never the full content
+            result = await session.execute(
+                select(
+                    FloorMessageModel.id,
+                    FloorMessageModel.agent_id,
+                    FloorMessageModel.agent_name,
+                    FloorMessageModel.message_type,
+                    FloorMessageModel.content_preview,
+                    FloorMessageModel.market_id,
+                    FloorMessageModel.reply_count,
+                    FloorMessageModel.created_at,
+                ).where(FloorMessageModel.created_at > now - HOT_WINDOW)
+            )
+
+            window = HOT_WINDOW.total_seconds()
+            scored = sorted(
+                (
+                    {
+                        "message_id": m.id,
+                        "score": m.reply_count + RECENCY_BONUS * max(0.0, 1 - (now - m.created_at).total_seconds() / window),
+                        "agent_id": m.agent_id,
+                        "agent_name": m.agent_name,
+                        "message_type": m.message_type,
+                        "content_preview": m.content_preview,
+                        "market_id": m.market_id,
+                        "reply_count": m.reply_count,
+                        "created_at": m.created_at,
+                    }
+                    for m in result.all()
+                ),
+                key=lambda row: row["score"],
+                reverse=True,
+            )[:HOT_LIMIT]
+
+            await session.execute(delete(HotMessagesModel))
+            if scored:
+                await session.execute(insert(HotMessagesModel), scored)
+            await session.commit()
+            logger.info(f"Hot messages cache rebuilt ({len(scored)} messages).")
+
+    except Exception as e:
+        logger.error(f"Error refreshing hot messages: {e}")
+
+
+async def run_worker(interval: int = 60):
+    """Run the worker on a loop."""
+    logger.info(f"Starting Hot Messages Worker (Interval: {interval}s)")
+
+    # Ensure tables exist
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    while True:
+        await refresh_hot_messages()
+        await asyncio.sleep(interval)
+
+
+if __name__ == "__main__":
+    asyncio.run(run_worker())
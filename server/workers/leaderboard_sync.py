@@ -0,0 +1,135 @@
+"""
+TradingClaw Platform - Leaderboard Sync Worker
+
+This worker periodically precomputes leaderboard rankings so leaderboard
+reads stay index scans over precomputed rows: it refreshes the leaderboard_mv
+materialized view on Postgres and rebuilds the leaderboard_cache table on
+other backends.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+
+from sqlalchemy import Float, and_, case, cast, delete, func, insert, literal, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from server.db.database import async_session, engine, init_db
+from server.db.models import AgentModel, ForecastModel, LeaderboardCacheModel, PositionModel
+from server.db.views import refresh_leaderboard_view
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("leaderboard_sync")
+
+# Lookback per timeframe (None = all time)
+TIMEFRAMES = {
+    "7d": timedelta(days=7),
+    "30d": timedelta(days=30),
+    "all": None,
+}
+
+
+def _leaderboard_select(timeframe: str, cutoff: datetime):
+    """Per-agent metrics for one timeframe, ranked by ROI, as a single GROUP BY query."""
+    f = (
+        select(
+            ForecastModel.agent_id,
+            func.avg(ForecastModel.brier_score).label("brier_score"),
+        )
+        .where(ForecastModel.created_at >= cutoff)
+        .group_by(ForecastModel.agent_id)
+        .subquery("f")
+    )
+    p = (
+        select(
+            PositionModel.agent_id,
+            func.count().label("total_trades"),
+            # Fixed-point: invested carries SCALE twice, P&L once
+            func.sum(cast(PositionModel.size, Float) * PositionModel.avg_price / PositionModel.SCALE).label("invested"),
+            func.sum(PositionModel.realized_pnl).label("pnl"),
+            func.count(PositionModel.closed_at).label("closed"),
+            func.sum(
+                case((and_(PositionModel.closed_at.is_not(None), PositionModel.realized_pnl > 0), 1), else_=0)
+            ).label("won"),
+        )
+        .where(PositionModel.opened_at >= cutoff)
+        .group_by(PositionModel.agent_id)
+        .subquery("p")
+    )
+
+    roi = func.coalesce(case((p.c.invested > 0, p.c.pnl / p.c.invested)), 0.0)
+    win_rate = func.coalesce(case((p.c.closed > 0, cast(p.c.won, Float) / p.c.closed)), 0.0)
+
+    return (
+        select(
+            AgentModel.agent_id,
+            literal(timeframe),
+            func.rank().over(order_by=roi.desc()),
+            roi,
+            func.coalesce(f.c.brier_score, 0.25),
+            win_rate,
+            func.coalesce(p.c.total_trades, 0),
+        )
+        .select_from(AgentModel)
+        .outerjoin(f, f.c.agent_id == AgentModel.agent_id)
+        .outerjoin(p, p.c.agent_id == AgentModel.agent_id)
+        .where(
+            AgentModel.status == "active",
+            or_(f.c.agent_id.is_not(None), p.c.agent_id.is_not(None)),
+        )
+    )
+
+
+async def refresh_leaderboard_cache(session: AsyncSession):
+    """
+    Rebuild the overall (category-less) leaderboard_cache rows.
+
+    The delete and inserts share one transaction, so readers keep seeing
+    the previous rankings until the new ones commit.
+    """
+    now = datetime.utcnow()
+    columns = ["agent_id", "timeframe", "rank", "roi", "brier_score", "win_rate", "total_trades"]
+
+    await session.execute(
+        delete(LeaderboardCacheModel).where(LeaderboardCacheModel.category.is_(None))
+    )
+    for timeframe, lookback in TIMEFRAMES.items():
+        cutoff = now - lookback if lookback else datetime(2020, 1, 1)
+        # id and calculated_at come from their server defaults
+        await session.execute(
+            insert(LeaderboardCacheModel).from_select(
+                columns, _leaderboard_select(timeframe, cutoff), include_defaults=False
+            )
+        )
+    await session.commit()
+
+
+async def sync_leaderboard():
+    """Refresh precomputed leaderboard rankings."""
+    try:
+        if engine.dialect.name == "postgresql":
+            async with engine.begin() as conn:
+                await refresh_leaderboard_view(conn)
+            logger.info("Leaderboard view refreshed.")
+        else:
+            async with async_session() as session:
+                await refresh_leaderboard_cache(session)
+            logger.info("Leaderboard cache rebuilt.")
+    except Exception as e:
+        logger.error(f"Error refreshing leaderboard: {e}")
+
+
+async def run_worker(interval: int = 300):
+    """Run the worker on a loop."""
+    logger.info(f"Starting Leaderboard Sync Worker (Interval: {interval}s)")
+
+    # Ensure tables and views exist
+    await init_db()
+
+    while True:
+        await sync_leaderboard()
+        await asyncio.sleep(interval)
+
+
+if __name__ == "__main__":
+    asyncio.run(run_worker())
@@ -9,62 +9,98 @@ import asyncio
 import logging
 from datetime import datetime
 
-from sqlalchemy import select
-from server.db.database import async_session, engine
-from server.db.models import MarketCacheModel, Base
-from server.services.polymarket import PolymarketClient
+from sqlalchemy import update
+
+from server.db.database import DIALECT_INSERTS, async_session, engine
+from server.db.models import MarketCacheModel, Base, utcnow
+from server.services.market_cache import (
+    backfill_forecast_markets,
+    freshness_deadlines,
+    parse_resolution_date,
+)
+from server.services.polymarket import get_polymarket_client
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("market_sync")
 
+# Columns refreshed on existing rows, as last written per market id. Markets
+# that haven't ticked since then skip the upsert and only get their
+# freshness deadlines extended.
+PRICE_COLUMNS = ("yes_price", "no_price", "volume_24h", "total_volume")
+_last_written: dict[str, tuple] = {}
+
 async def sync_markets():
     """Fetch active markets and update database."""
-    client = PolymarketClient()
+    client = get_polymarket_client()
     
     try:
         logger.info("Fetching active markets from Polymarket...")
         markets = await client.get_active_markets(limit=200)
         logger.info(f"Retrieved {len(markets)} markets.")
         
+        # One timestamp for the whole cycle
+        deadlines = freshness_deadlines(datetime.utcnow())
+        # Keyed by id: one UPSERT batch can't touch the same row twice
+        rows = {
+            m_data["id"]: {
+                "id": m_data["id"],
+                "question": m_data["question"],
+                "category": m_data["category"],
+                "yes_price": m_data["yes_price"],
+                "no_price": m_data["no_price"],
+                "volume_24h": m_data["volume_24h"],
+                "total_volume": m_data["total_volume"],
+                "resolution_date": parse_resolution_date(m_data["resolution_date"]),
+                **deadlines,
+            }
+            for m_data in markets
+        }
+        if not rows:
+            return
+        
+        changed = {
+            market_id: row for market_id, row in rows.items()
+            if _last_written.get(market_id) != tuple(row[name] for name in PRICE_COLUMNS)
+        }
+        unchanged = [market_id for market_id in rows if market_id not in changed]
+        
+        # Existing rows only get pricing, volume and freshness updated;
+        # last_updated is stamped by the database
+        table = MarketCacheModel.__table__
+        stmt = DIALECT_INSERTS[engine.dialect.name](table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.id],
+            set_={
+                **{
+                    name: stmt.excluded[name]
+                    for name in (*PRICE_COLUMNS, "stale_after", "hard_expire_at")
+                },
+                "last_updated": utcnow(),
+            },
+        )
+        
         async with async_session() as session:
-            for m_data in markets:
-                # Check if market exists
+            if changed:
+                await session.execute(stmt, list(changed.values()))
+            if unchanged:
+                # Same data as last cycle: one UPDATE with shared values
                 result = await session.execute(
-                    select(MarketCacheModel).where(MarketCacheModel.id == m_data["id"])
+                    update(MarketCacheModel)
+                    .where(MarketCacheModel.id.in_(unchanged))
+                    .values(**deadlines, last_updated=utcnow())
                 )
-                existing = result.scalar_one_or_none()
-                
-                res_date = None
-                if m_data["resolution_date"]:
-                    try:
-                        res_date = datetime.fromisoformat(m_data["resolution_date"].replace("Z", "+00:00"))
-                    except ValueError:
-                        pass
-
-                if existing:
-                    # Update pricing and volume
-                    existing.yes_price = m_data["yes_price"]
-                    existing.no_price = m_data["no_price"]
-                    existing.volume_24h = m_data["volume_24h"]
-                    existing.total_volume = m_data["total_volume"]
-                    existing.last_updated = datetime.utcnow()
-                else:
-                    # Create new cache entry
-                    new_market = MarketCacheModel(
-                        id=m_data["id"],
-                        question=m_data["question"],
-                        category=m_data["category"],
-                        yes_price=m_data["yes_price"],
-                        no_price=m_data["no_price"],
-                        volume_24h=m_data["volume_24h"],
-                        total_volume=m_data["total_volume"],
-                        resolution_date=res_date,
-                        last_updated=datetime.utcnow()
-                    )
-                    session.add(new_market)
-            
+                if result.rowcount < len(unchanged):
+                    # Rows went missing underneath us; rewrite everything next cycle
+                    _last_written.clear()
+            # No-op for forecasts that already have their market fields
+            await backfill_forecast_markets(session, list(rows))
             await session.commit()
-            logger.info("Market cache successfully updated.")
+            
+        _last_written.update(
+            (market_id, tuple(row[name] for name in PRICE_COLUMNS))
+            for market_id, row in changed.items()
+        )
+        logger.info(f"Market cache successfully updated ({len(changed)} changed, {len(unchanged)} unchanged).")
             
     except Exception as e:
         logger.error(f"Error syncing markets: {e}")
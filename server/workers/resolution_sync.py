@@ -10,14 +10,13 @@ enabling the AI forecasting benchmark functionality.
 
 import asyncio
 import logging
-from datetime import datetime
+from sqlalchemy import and_, update
 
-from sqlalchemy import select, and_
-
-from server.db.database import async_session, engine
+from server.db.database import DIALECT_INSERTS, async_session, engine
 from server.db.models import MarketCacheModel, ForecastModel, Base
-from server.services.polymarket import PolymarketClient
-from server.services.scoring import score_forecasts_for_market
+from server.services.market_cache import parse_resolution_date
+from server.services.polymarket import get_polymarket_client
+from server.services.scoring import score_resolved_markets
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("resolution_sync")
@@ -32,7 +31,7 @@ async def sync_resolved_markets():
     2. Updates market cache with resolution status
     3. Calculates Brier scores for all forecasts on resolved markets
     """
-    client = PolymarketClient()
+    client = get_polymarket_client()
 
     try:
         logger.info("Fetching resolved markets from Polymarket...")
@@ -45,61 +44,44 @@ async def sync_resolved_markets():
         ]
         logger.info(f"Found {len(markets_with_outcomes)} markets with resolution outcomes.")
 
-        total_scored = 0
+        # Keyed by id: one UPSERT batch can't touch the same row twice
+        rows = {
+            m_data["id"]: {
+                "id": m_data["id"],
+                "question": m_data["question"],
+                "category": m_data["category"],
+                "yes_price": m_data["yes_price"],
+                "no_price": m_data["no_price"],
+                "volume_24h": m_data["volume_24h"],
+                "total_volume": m_data["total_volume"],
+                "resolution_date": parse_resolution_date(m_data["resolution_date"]),
+                "resolved": True,
+                "resolution_outcome": m_data["resolution_outcome"],
+            }
+            for m_data in markets_with_outcomes
+        }
+
+        # Cached markets only pick up the resolution the first time; rows
+        # already marked resolved are left alone
+        table = MarketCacheModel.__table__
+        stmt = DIALECT_INSERTS[engine.dialect.name](table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.id],
+            set_={
+                name: stmt.excluded[name]
+                for name in ("resolved", "resolution_outcome", "resolution_date")
+            },
+            where=table.c.resolved.is_not(True),
+        )
 
         async with async_session() as session:
-            for m_data in markets_with_outcomes:
-                market_id = m_data["id"]
-                resolution_outcome = m_data["resolution_outcome"]
+            if rows:
+                await session.execute(stmt, list(rows.values()))
 
-                # Check if market exists in cache
-                result = await session.execute(
-                    select(MarketCacheModel).where(MarketCacheModel.id == market_id)
-                )
-                existing = result.scalar_one_or_none()
-
-                # Parse resolution date
-                res_date = None
-                if m_data["resolution_date"]:
-                    try:
-                        res_date = datetime.fromisoformat(
-                            m_data["resolution_date"].replace("Z", "+00:00")
-                        )
-                    except ValueError:
-                        pass
-
-                if existing:
-                    # Update market with resolution status
-                    if not existing.resolved:
-                        logger.info(f"Marking market {market_id} as resolved (outcome: {resolution_outcome})")
-                        existing.resolved = True
-                        existing.resolution_outcome = resolution_outcome
-                        existing.resolution_date = res_date
-                        existing.last_updated = datetime.utcnow()
-                else:
-                    # Create new market cache entry with resolution
-                    new_market = MarketCacheModel(
-                        id=market_id,
-                        question=m_data["question"],
-                        category=m_data["category"],
-                        yes_price=m_data["yes_price"],
-                        no_price=m_data["no_price"],
-                        volume_24h=m_data["volume_24h"],
-                        total_volume=m_data["total_volume"],
-                        resolution_date=res_date,
-                        resolved=True,
-                        resolution_outcome=resolution_outcome,
-                        last_updated=datetime.utcnow(),
-                    )
-                    session.add(new_market)
-
-                # Score all forecasts for this market
-                scored = await score_forecasts_for_market(
-                    session, market_id, resolution_outcome
-                )
-                if scored > 0:
-                    logger.info(f"Scored {scored} forecasts for market {market_id}")
-                    total_scored += scored
+            # Score all forecasts for these markets in one bulk write
+            total_scored = await score_resolved_markets(session, {
+                market_id: row["resolution_outcome"] for market_id, row in rows.items()
+            })
 
             await session.commit()
 
@@ -120,37 +102,22 @@ async def score_pending_forecasts():
     logger.info("Checking for unscored forecasts on resolved markets...")
 
     async with async_session() as session:
-        # Find resolved markets with unscored forecasts
+        # One UPDATE ... FROM market_cache: no per-market lookups and no
+        # separate pass to find which resolved markets have unscored forecasts
         result = await session.execute(
-            select(MarketCacheModel).where(
+            update(ForecastModel)
+            .where(
                 and_(
+                    ForecastModel.market_id == MarketCacheModel.id,
+                    ForecastModel.outcome.is_(None),
                     MarketCacheModel.resolved == True,
                     MarketCacheModel.resolution_outcome.is_not(None),
                 )
             )
+            .values(outcome=MarketCacheModel.resolution_outcome)
+            .execution_options(synchronize_session=False)
         )
-        resolved_markets = result.scalars().all()
-
-        total_scored = 0
-
-        for market in resolved_markets:
-            # Check for unscored forecasts
-            forecast_result = await session.execute(
-                select(ForecastModel).where(
-                    and_(
-                        ForecastModel.market_id == market.id,
-                        ForecastModel.brier_score.is_(None),
-                    )
-                )
-            )
-            unscored = forecast_result.scalars().all()
-
-            if unscored:
-                scored = await score_forecasts_for_market(
-                    session, market.id, market.resolution_outcome
-                )
-                total_scored += scored
-                logger.info(f"Backfilled {scored} forecast scores for market {market.id}")
+        total_scored = result.rowcount
 
         await session.commit()
 
@@ -7,6 +7,7 @@ from skill.client import (
     Position,
     TradeResult,
 )
+from skill.transport import close_shared_transport
 
 __all__ = [
     "TradingClawConfig",
@@ -15,4 +16,5 @@ __all__ = [
     "Forecast",
     "Position",
     "TradeResult",
+    "close_shared_transport",
 ]
@@ -5,19 +5,35 @@ Client for interacting with TradingClaw platform.
 """
 
 import asyncio
-import json
+import time
 from dataclasses import dataclass
-from datetime import datetime
 from decimal import Decimal
-from typing import Any
+from functools import cached_property
+from typing import Any, AsyncIterator
 
 import httpx
+import ijson
+import orjson
 from eth_account import Account
+from eth_account.signers.local import LocalAccount
 from eth_account.messages import encode_defunct
 from web3 import Web3
 
+from skill.transport import get_shared_transport
 
-@dataclass
+
+# Most forecasts/markets the platform accepts per batch request
+MAX_BATCH_SIZE = 100
+
+# Seconds read-only responses are reused before being fetched again
+MARKETS_CACHE_TTL = 60
+LEADERBOARD_CACHE_TTL = 300
+CONSENSUS_CACHE_TTL = 30
+
+# Expired responses are pruned once the cache holds this many
+RESPONSE_CACHE_PRUNE_SIZE = 1024
+
+@dataclass(slots=True)
 class TradingClawConfig:
     """Configuration for TradingClaw skill."""
     platform_url: str
@@ -33,13 +49,14 @@ class TradingClawConfig:
     scan_interval_hours: int = 4
     healthcheck_url: str | None = None
     heartbeat_interval_seconds: int = 300
+    max_concurrent_opportunities: int = 10  # Opportunities forecast at once per cycle
     
     def __post_init__(self):
         if self.categories is None:
             self.categories = ["politics", "crypto"]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Forecast:
     """Probability forecast."""
     market_id: str
@@ -48,7 +65,7 @@ class Forecast:
     reasoning: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     """Current position in a market."""
     market_id: str
@@ -60,7 +77,7 @@ class Position:
     unrealized_pnl: Decimal
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TradeResult:
     """Result of a trade execution."""
     success: bool
@@ -79,68 +96,138 @@ class TradingClawClient:
     Handles authentication, forecast submission, and trade execution.
     """
     
-    def __init__(self, config: TradingClawConfig):
+    def __init__(self, config: TradingClawConfig, transport: httpx.AsyncBaseTransport | None = None):
         self.config = config
         self.session_token: str | None = None
         self.agent_id: str | None = None
         self.w3 = Web3()
+        self._client: httpx.AsyncClient | None = None
+        # Replaces the shared transport (e.g. httpx.MockTransport for replays)
+        self._transport = transport
+        # Successful read-only responses: key -> (expires_at, data)
+        self._cache: dict[tuple, tuple[float, Any]] = {}
+    
+    @cached_property
+    def _account(self) -> LocalAccount:
+        """Signing account, parsed from the private key once on first use."""
+        return Account.from_key(self.config.private_key)
+    
+    async def _get_client(self) -> httpx.AsyncClient:
+        """
+        Long-lived client for the platform API, created on first use.
+        
+        Its connections come from the process-wide shared transport, so every
+        call (from this and any other client) reuses keep-alive (HTTP/2)
+        connections instead of paying a TCP+TLS handshake per request. The
+        base URL and auth headers stay per client.
+        """
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.config.platform_url,
+                headers=self._headers(),
+                transport=self._transport or get_shared_transport(),
+                # Fail fast when the platform is degraded instead of
+                # holding the caller for a full 30s per request
+                timeout=httpx.Timeout(connect=5.0, read=10.0, write=5.0, pool=5.0),
+            )
+        return self._client
+    
+    async def close(self):
+        """
+        Release the client.
+        
+        The shared connection pool stays open for other clients; the host
+        closes it once on shutdown with close_shared_transport().
+        """
+        self._client = None
+    
+    async def __aenter__(self) -> "TradingClawClient":
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.close()
+    
+    async def _cached_get(self, key: tuple, ttl: float, url: str, params: dict | None = None) -> Any:
+        """GET `url`, reusing a successful response for `ttl` seconds."""
+        now = time.monotonic()
+        hit = self._cache.get(key)
+        if hit is not None and hit[0] > now:
+            return hit[1]
+        
+        client = await self._get_client()
+        response = await client.get(url, params=params)
+        data = orjson.loads(response.content)
+        if response.is_success:
+            if len(self._cache) >= RESPONSE_CACHE_PRUNE_SIZE:
+                self._cache = {k: v for k, v in self._cache.items() if v[0] > now}
+            self._cache[key] = (now + ttl, data)
+        return data
+    
+    def invalidate(self, *prefix) -> None:
+        """Drop cached responses whose key starts with `prefix` (all of them if empty)."""
+        n = len(prefix)
+        self._cache = {k: v for k, v in self._cache.items() if k[:n] != prefix}
     
     async def authenticate(self) -> bool:
         """
         Authenticate with TradingClaw using wallet signature.
         """
         # Create message to sign
-        timestamp = int(datetime.utcnow().timestamp())
+        timestamp = int(time.time())
         message = f"TradingClaw Authentication\nTimestamp: {timestamp}"
         
-        # Sign with private key
-        account = Account.from_key(self.config.private_key)
-        signed = account.sign_message(encode_defunct(text=message))
+        # Sign with private key (CPU-bound ECDSA, kept off the event loop)
+        signed = await asyncio.to_thread(self._account.sign_message, encode_defunct(text=message))
         
         # Send to platform
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.config.platform_url}/api/v1/auth/login",
-                json={
-                    "wallet_address": self.config.wallet_address,
-                    "message": message,
-                    "signature": signed.signature.hex(),
-                }
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                self.session_token = data["token"]
-                self.agent_id = data["agent_id"]
-                return True
-            
+        client = await self._get_client()
+        response = await client.post(
+            "/api/v1/auth/login",
+            content=orjson.dumps({
+                "wallet_address": self.config.wallet_address,
+                "message": message,
+                "signature": signed.signature.hex(),
+            }),
+        )
+        
+        # Rejections short-circuit before any body is decoded
+        if response.status_code != 200:
             return False
+        
+        data = orjson.loads(response.content)
+        self.session_token = data["token"]
+        self.agent_id = data["agent_id"]
+        # Every later request on the pooled client carries the token
+        client.headers.update(self._headers())
+        return True
     
     async def register(self) -> dict:
         """Register agent on TradingClaw platform."""
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.config.platform_url}/api/v1/agents/register",
-                json={
-                    "agent_id": f"agent_{self.config.wallet_address[:8]}",
-                    "display_name": self.config.agent_name,
-                    "public_key": Account.from_key(self.config.private_key).address,
-                    "wallet_address": self.config.wallet_address,
-                    "strategy": self.config.strategy,
-                    "kelly_fraction": self.config.kelly_fraction,
-                    "max_position_pct": self.config.max_position_pct,
-                    "categories": self.config.categories,
-                    "healthcheck_url": self.config.healthcheck_url,
-                }
-            )
-            return response.json()
+        client = await self._get_client()
+        response = await client.post(
+            "/api/v1/agents/register",
+            content=orjson.dumps({
+                "agent_id": f"agent_{self.config.wallet_address[:8]}",
+                "display_name": self.config.agent_name,
+                "public_key": self._account.address,
+                "wallet_address": self.config.wallet_address,
+                "strategy": self.config.strategy,
+                "kelly_fraction": self.config.kelly_fraction,
+                "max_position_pct": self.config.max_position_pct,
+                "categories": self.config.categories,
+                "healthcheck_url": self.config.healthcheck_url,
+            }),
+        )
+        # Error pages (e.g. an HTML 502 from a proxy) aren't worth parsing
+        response.raise_for_status()
+        return orjson.loads(response.content)
     
     def _headers(self) -> dict:
-        """Get headers with auth token."""
-        return {
-            "Authorization": f"Bearer {self.session_token}",
-            "Content-Type": "application/json",
-        }
+        """Get headers with auth token (the pooled client's defaults)."""
+        headers = {"Content-Type": "application/json"}
+        if self.session_token:
+            headers["Authorization"] = f"Bearer {self.session_token}"
+        return headers
     
     async def get_markets(
         self,
@@ -148,82 +235,129 @@ class TradingClawClient:
         min_volume: float = 1000,
     ) -> list[dict]:
         """Fetch active markets."""
-        async with httpx.AsyncClient() as client:
-            params = {"min_volume": min_volume}
-            if category:
-                params["category"] = category
-            
-            response = await client.get(
-                f"{self.config.platform_url}/api/v1/markets",
-                params=params,
-                headers=self._headers(),
-            )
-            return response.json()
+        params = {"min_volume": min_volume}
+        if category:
+            params["category"] = category
+        
+        return await self._cached_get(
+            ("markets", category, min_volume), MARKETS_CACHE_TTL, "/api/v1/markets", params
+        )
     
     async def get_opportunities(self, min_edge: float = 0.05) -> list[dict]:
         """Get high-edge trading opportunities."""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.config.platform_url}/api/v1/markets/opportunities/all",
-                params={"min_edge": min_edge},
-                headers=self._headers(),
-            )
-            return response.json()
+        client = await self._get_client()
+        response = await client.get(
+            "/api/v1/markets/opportunities/all",
+            params={"min_edge": min_edge},
+        )
+        return orjson.loads(response.content)
+    
+    async def iter_opportunities(self, min_edge: float = 0.05) -> AsyncIterator[dict]:
+        """Yield trading opportunities as they are parsed off the response stream."""
+        client = await self._get_client()
+        async with client.stream(
+            "GET",
+            "/api/v1/markets/opportunities/all",
+            params={"min_edge": min_edge},
+        ) as response:
+            # Fail loudly on 401/5xx rather than parsing the error body as an
+            # empty list
+            response.raise_for_status()
+            
+            # Push-style parser: each chunk yields whichever items it completes
+            parsed = ijson.sendable_list()
+            parser = ijson.items_coro(parsed, "item", use_float=True)
+            async for chunk in response.aiter_bytes():
+                parser.send(chunk)
+                for opp in parsed:
+                    yield opp
+                parsed.clear()
+            parser.close()
+            for opp in parsed:
+                yield opp
     
     async def submit_forecast(self, forecast: Forecast) -> dict:
         """Submit a probability forecast."""
         if not self.config.share_forecasts:
             return {"status": "skipped", "reason": "share_forecasts disabled"}
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.config.platform_url}/api/v1/forecasts",
-                json={
-                    "market_id": forecast.market_id,
-                    "probability": forecast.probability,
-                    "confidence": forecast.confidence,
-                    "reasoning": forecast.reasoning,
-                },
-                headers=self._headers(),
-            )
-            return response.json()
+        client = await self._get_client()
+        response = await client.post(
+            "/api/v1/forecasts",
+            content=orjson.dumps({
+                "market_id": forecast.market_id,
+                "probability": forecast.probability,
+                "confidence": forecast.confidence,
+                "reasoning": forecast.reasoning,
+            }),
+        )
+        # The market's consensus now includes this forecast
+        self.invalidate("consensus", forecast.market_id)
+        return orjson.loads(response.content)
     
     async def get_consensus(self, market_id: str) -> dict:
         """Get community consensus for a market."""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.config.platform_url}/api/v1/forecasts/consensus/{market_id}",
-                headers=self._headers(),
+        return await self._cached_get(
+            ("consensus", market_id), CONSENSUS_CACHE_TTL, f"/api/v1/forecasts/consensus/{market_id}"
+        )
+    
+    async def submit_forecasts_bulk(self, forecasts: list[Forecast]) -> list[dict]:
+        """Submit many forecasts with one request per MAX_BATCH_SIZE."""
+        if not self.config.share_forecasts:
+            return []
+        
+        client = await self._get_client()
+        results = []
+        for start in range(0, len(forecasts), MAX_BATCH_SIZE):
+            response = await client.post(
+                "/api/v1/forecasts/batch",
+                content=orjson.dumps([
+                    {
+                        "market_id": forecast.market_id,
+                        "probability": forecast.probability,
+                        "confidence": forecast.confidence,
+                        "reasoning": forecast.reasoning,
+                    }
+                    for forecast in forecasts[start:start + MAX_BATCH_SIZE]
+                ]),
+            )
+            response.raise_for_status()
+            results.extend(orjson.loads(response.content))
+        
+        for forecast in forecasts:
+            self.invalidate("consensus", forecast.market_id)
+        return results
+    
+    async def get_consensus_bulk(self, market_ids: list[str]) -> dict[str, dict]:
+        """Get consensus for many markets, keyed by market ID (markets without forecasts are left out)."""
+        client = await self._get_client()
+        consensus = {}
+        for start in range(0, len(market_ids), MAX_BATCH_SIZE):
+            response = await client.post(
+                "/api/v1/forecasts/consensus/batch",
+                content=orjson.dumps(market_ids[start:start + MAX_BATCH_SIZE]),
             )
-            return response.json()
+            response.raise_for_status()
+            consensus.update(orjson.loads(response.content))
+        return consensus
     
     async def get_leaderboard(self, limit: int = 20) -> list[dict]:
         """Get top agents leaderboard."""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.config.platform_url}/api/v1/leaderboard",
-                params={"limit": limit},
-                headers=self._headers(),
-            )
-            return response.json()
+        return await self._cached_get(
+            ("leaderboard", limit), LEADERBOARD_CACHE_TTL, "/api/v1/leaderboard", {"limit": limit}
+        )
     
     async def get_my_rank(self) -> dict:
         """Get current agent's rank."""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.config.platform_url}/api/v1/leaderboard/agent/{self.agent_id}/rank",
-                headers=self._headers(),
-            )
-            return response.json()
+        client = await self._get_client()
+        response = await client.get(f"/api/v1/leaderboard/agent/{self.agent_id}/rank")
+        return orjson.loads(response.content)
     
     async def send_heartbeat(self) -> dict:
         """Send heartbeat to signal autonomous participation."""
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.config.platform_url}/api/v1/protocol/heartbeat",
-                headers=self._headers(),
-            )
-            return response.json()
+        client = await self._get_client()
+        response = await client.post("/api/v1/protocol/heartbeat")
+        return orjson.loads(response.content)
     
     async def get_positions(self) -> list[Position]:
         """Get current positions (from Polymarket, not TradingClaw)."""
@@ -233,12 +367,9 @@ class TradingClawClient:
     
     async def get_pnl(self) -> dict:
         """Get P&L summary."""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.config.platform_url}/api/v1/agents/{self.agent_id}/stats",
-                headers=self._headers(),
-            )
-            return response.json()
+        client = await self._get_client()
+        response = await client.get(f"/api/v1/agents/{self.agent_id}/stats")
+        return orjson.loads(response.content)
 
 
 class TradingClawSkill:
@@ -248,17 +379,41 @@ class TradingClawSkill:
     Handles the autonomous trading loop and commands.
     """
     
-    def __init__(self, config: TradingClawConfig):
+    def __init__(self, config: TradingClawConfig, transport: httpx.AsyncBaseTransport | None = None):
         self.config = config
-        self.client = TradingClawClient(config)
+        self.client = TradingClawClient(config, transport=transport)
         self.running = False
+        # Caps opportunities being forecast at once (each may call out to an LLM)
+        self._opportunity_slots = asyncio.Semaphore(config.max_concurrent_opportunities)
     
     async def start(self):
         """Start the autonomous trading loop."""
-        # Authenticate
-        if not await self.client.authenticate():
-            # Try to register first
-            await self.client.register()
+        # Authenticate, registering speculatively alongside so a cold start
+        # doesn't wait for the failed login before registering
+        auth_task = asyncio.create_task(self.client.authenticate(), name="authenticate")
+        register_task = asyncio.create_task(self.client.register(), name="register")
+        try:
+            authenticated = await auth_task
+        except BaseException:
+            # Don't leave the speculative registration in flight
+            register_task.cancel()
+            await asyncio.gather(register_task, return_exceptions=True)
+            raise
+        
+        if authenticated:
+            # Already registered: the duplicate registration is moot (409)
+            register_task.cancel()
+            await asyncio.gather(register_task, return_exceptions=True)
+        else:
+            # 409 just means the agent already exists (the login failing
+            # below reports that case); any other registration error is
+            # the real cause, so raise it
+            (registration,) = await asyncio.gather(register_task, return_exceptions=True)
+            if isinstance(registration, BaseException) and not (
+                isinstance(registration, httpx.HTTPStatusError)
+                and registration.response.status_code == 409
+            ):
+                raise registration
             if not await self.client.authenticate():
                 raise Exception("Failed to authenticate with TradingClaw")
         
@@ -289,40 +444,68 @@ class TradingClawSkill:
     async def stop(self):
         """Stop the trading loop."""
         self.running = False
+        await self.client.close()
     
     async def _trading_cycle(self):
         """Execute one trading cycle."""
-        # 1. Get opportunities
-        opportunities = await self.client.get_opportunities()
+        # 1-2. Stream opportunities, starting each forecast as soon as its
+        # opportunity arrives rather than after the whole list
+        opportunities = []
+        tasks = []
+        try:
+            async for opp in self.client.iter_opportunities():
+                opportunities.append(opp)
+                tasks.append(asyncio.create_task(
+                    self._forecast_opportunity(opp), name=f"forecast {opp['market']['id']}"
+                ))
+        except BaseException:
+            # Don't leave forecasts started before a mid-stream error running
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        results = await asyncio.gather(*tasks, return_exceptions=True)
         
-        for opp in opportunities:
-            market_id = opp["market"]["id"]
-            
-            # 2. Generate forecast (would use LLM here)
-            # This is a placeholder - real implementation would call LLM
-            forecast = Forecast(
-                market_id=market_id,
-                probability=opp["consensus_probability"],
-                confidence="medium",
-                reasoning="Based on consensus",
-            )
-            
-            # 3. Submit forecast
-            if self.config.share_forecasts:
-                await self.client.submit_forecast(forecast)
-            
-            # 4. Get consensus (if enabled)
-            if self.config.use_consensus:
-                consensus = await self.client.get_consensus(market_id)
-                # Could blend with own forecast here
-            
+        forecasted = []
+        for opp, result in zip(opportunities, results):
+            if isinstance(result, Exception):
+                print(f"Opportunity {opp['market']['id']} failed: {result}")
+            else:
+                forecasted.append((opp, result))
+        if not forecasted:
+            return
+        
+        # 3-4. Submit all forecasts and get their consensus, one batch
+        # request each (independent, so together)
+        forecasts = [forecast for _, forecast in forecasted]
+        calls = []
+        if self.config.share_forecasts:
+            calls.append(self.client.submit_forecasts_bulk(forecasts))
+        if self.config.use_consensus:
+            calls.append(self.client.get_consensus_bulk([f.market_id for f in forecasts]))
+            # Could blend with own forecasts here
+        await asyncio.gather(*calls)
+        
+        for opp, forecast in forecasted:
             # 5. Decide on trade
             edge = opp["edge"]
             direction = opp["edge_direction"]
             
             # 6. Execute trade
             # This would use py-clob-client for actual execution
-            print(f"Would trade {direction} on {market_id} with {edge:.1%} edge")
+            print(f"Would trade {direction} on {forecast.market_id} with {edge:.1%} edge")
+    
+    async def _forecast_opportunity(self, opp: dict) -> Forecast:
+        """Generate the agent's forecast for one opportunity."""
+        async with self._opportunity_slots:
+            # Generate forecast (would use LLM here)
+            # This is a placeholder - real implementation would call LLM
+            return Forecast(
+                market_id=opp["market"]["id"],
+                probability=opp["consensus_probability"],
+                confidence="medium",
+                reasoning="Based on consensus",
+            )
     
     # Command handlers
     
@@ -338,25 +521,23 @@ class TradingClawSkill:
         if not opportunities:
             return "No opportunities found with current edge threshold"
         
-        lines = ["📊 **Opportunities Found:**"]
-        for opp in opportunities[:5]:
-            lines.append(
-                f"- {opp['market']['question'][:50]}... | "
-                f"{opp['edge_direction']} {opp['edge']:.1%} edge"
-            )
-        return "\n".join(lines)
+        return "📊 **Opportunities Found:**\n" + "\n".join(
+            f"- {opp['market']['question'][:50]}... | {opp['edge_direction']} {opp['edge']:.1%} edge"
+            for opp in opportunities[:5]
+        )
     
     async def cmd_leaderboard(self) -> str:
         """Handle /tradingclaw leaderboard command."""
         leaders = await self.client.get_leaderboard(limit=10)
         
-        lines = ["🏆 **Top Agents:**"]
-        for entry in leaders:
-            lines.append(
+        return "\n".join([
+            "🏆 **Top Agents:**",
+            *(
                 f"{entry['rank']}. {entry['display_name']} | "
                 f"ROI: {entry['roi']:.1%} | Brier: {entry['brier_score']:.3f}"
-            )
-        return "\n".join(lines)
+                for entry in leaders
+            ),
+        ])
     
     async def cmd_pnl(self) -> str:
         """Handle /tradingclaw pnl command."""
@@ -5,11 +5,20 @@ Tracks agent research and predictions as markdown files.
 Agents do their OWN research - we just log what they found and predicted.
 """
 
+import asyncio
 import os
 import re
-from datetime import datetime
+import threading
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, TextIO
+
+import numpy as np
+
+
+# Slug cleanup: drop punctuation, then collapse whitespace/underscore/dash runs
+_SLUG_STRIP = re.compile(r'[^\w\s-]')
+_SLUG_DASHES = re.compile(r'[\s_-]+')
 
 
 class ResearchTracker:
@@ -26,10 +35,69 @@ class ResearchTracker:
         self.agent_id = agent_id
         self.base_path = Path(base_path) / agent_id
         self.research_path = self.base_path / "research"
+        self._agent_line = f"**Agent**: `{agent_id}`"
+        
+        # Headers written once, when a running log is first created
+        self._log_headers = {
+            "predictions.md": f"# 🔮 Predictions Log\n\n{self._agent_line}\n\n---\n",
+            "performance.md": "\n".join([
+                "# 🏆 Performance Scorecard",
+                "",
+                self._agent_line,
+                "",
+                "## Historical Accuracy",
+                "",
+                "| Date | Market | Signal | Outcome | Accuracy | Brier Score |",
+                "| :--- | :--- | :--- | :--- | :--- | :--- |",
+            ]) + "\n",
+        }
+        
+        # Long-lived append handles for the running logs, by file name; the
+        # lock keeps entries whole when the async variants write from threads
+        self._log_files: dict[str, TextIO] = {}
+        self._log_lock = threading.Lock()
         
         # Ensure directories exist
         self.research_path.mkdir(parents=True, exist_ok=True)
     
+    def __enter__(self) -> "ResearchTracker":
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def flush(self) -> None:
+        """Write buffered log entries through to disk."""
+        with self._log_lock:
+            for log_file in self._log_files.values():
+                log_file.flush()
+    
+    def close(self) -> None:
+        """Flush and close the log files (reopened on the next write)."""
+        with self._log_lock:
+            for log_file in self._log_files.values():
+                log_file.close()
+            self._log_files.clear()
+    
+    def _append(self, name: str, text: str) -> None:
+        """
+        Append to one of the running logs, writing its header first if the file is new.
+        
+        The file stays open across calls, so logging an entry doesn't pay an
+        open/close per write. Each call's text is flushed as one write before
+        returning, so a crash can't lose entries that were already logged.
+        """
+        with self._log_lock:
+            log_file = self._log_files.get(name)
+            if log_file is None:
+                log_file = open(self.base_path / name, "a", encoding="utf-8", buffering=64 * 1024)
+                # Only checked when the handle is opened, not per entry
+                if log_file.tell() == 0:
+                    log_file.write(self._log_headers[name])
+                self._log_files[name] = log_file
+            log_file.write(text)
+            log_file.flush()
+    
     def log_research(
         self,
         market_id: str,
@@ -37,13 +105,15 @@ class ResearchTracker:
         research_notes: str,
         sources: list[str] | None = None,
         metadata: dict[str, Any] | None = None,
+        now: datetime | None = None,
     ) -> Path:
         """
         Save the agent's autonomous research to a markdown file.
+        
+        Pass `now` to share one timestamp across a batch of log calls.
         """
-        timestamp = datetime.utcnow()
-        date_str = timestamp.strftime("%Y-%m-%d")
-        time_str = timestamp.strftime("%H:%M:%S UTC")
+        date_str, time_str = self._timestamp_parts(now)
+        time_str += " UTC"
         
         # Create a unique filename for this market research
         slug = self._slugify(market_question)[:50]
@@ -51,35 +121,29 @@ class ResearchTracker:
         filepath = self.research_path / filename
         
         # Format the markdown document
-        content = [
-            f"# Research: {market_question}",
-            "",
-            f"**Market ID**: `{market_id}`",
-            f"**Agent**: `{self.agent_id}`",
-            f"**Timestamp**: {date_str} at {time_str}",
-            "",
-            "---",
-            "",
-            "## 🔍 Research Notes",
-            "",
-            research_notes,
-            "",
-        ]
+        content = f"""# Research: {market_question}
+
+**Market ID**: `{market_id}`
+{self._agent_line}
+**Timestamp**: {date_str} at {time_str}
+
+---
+
+## 🔍 Research Notes
+
+{research_notes}
+"""
         
         if sources:
-            content.append("## 🌐 Sources")
-            for source in sources:
-                content.append(f"- {source}")
-            content.append("")
+            sources_block = "\n".join(f"- {source}" for source in sources)
+            content += f"\n## 🌐 Sources\n{sources_block}\n"
         
         if metadata:
-            content.append("## 📊 Metadata")
-            for key, value in metadata.items():
-                content.append(f"- **{key}**: {value}")
-            content.append("")
+            metadata_block = "\n".join(f"- **{key}**: {value}" for key, value in metadata.items())
+            content += f"\n## 📊 Metadata\n{metadata_block}\n"
         
         # Write the file
-        filepath.write_text("\n".join(content))
+        filepath.write_text(content, encoding="utf-8")
         return filepath
     
     def log_prediction(
@@ -91,14 +155,13 @@ class ResearchTracker:
         reasoning: str,
         market_price: float,
         research_file: Path | None = None,
+        now: datetime | None = None,
     ) -> None:
         """
         Append the prediction details to a central predictions.md log.
         """
-        predictions_file = self.base_path / "predictions.md"
-        
-        timestamp = datetime.utcnow()
-        date_str = timestamp.strftime("%Y-%m-%d %H:%M UTC")
+        date_str, time_str = self._timestamp_parts(now)
+        date_str = f"{date_str} {time_str[:5]} UTC"
         
         # Calculate market vs agent edge
         edge = prediction - market_price
@@ -130,28 +193,20 @@ class ResearchTracker:
         
         entry.append("\n---\n")
         
-        # Ensure header exists
-        if not predictions_file.exists():
-            header = f"# 🔮 Predictions Log\n\n**Agent**: `{self.agent_id}`\n\n---\n"
-            predictions_file.write_text(header)
-        
-        # Append entry
-        with open(predictions_file, "a") as f:
-            f.write("\n".join(entry))
+        # Append entry (header first on a new log)
+        self._append("predictions.md", "\n".join(entry))
     
     def log_outcome(
         self,
         market_id: str,
         outcome: bool,  # True if YES won
         agent_prediction: float,
+        now: datetime | None = None,
     ) -> None:
         """
         Log the final resolution and update the performance scorecard.
         """
-        performance_file = self.base_path / "performance.md"
-        
-        timestamp = datetime.utcnow()
-        date_str = timestamp.strftime("%Y-%m-%d")
+        date_str, _ = self._timestamp_parts(now)
         
         # Calculate accuracy (Brier Score)
         actual = 1.0 if outcome else 0.0
@@ -166,27 +221,71 @@ class ResearchTracker:
         
         row = f"| {date_str} | `{market_id[:10]}...` | {agent_prediction:.1%} | {outcome_str} | {status_icon} | {brier_score:.4f} |"
         
-        # Ensure header exists
-        if not performance_file.exists():
-            header = [
-                "# 🏆 Performance Scorecard",
-                "",
-                f"**Agent**: `{self.agent_id}`",
-                "",
-                "## Historical Accuracy",
-                "",
-                "| Date | Market | Signal | Outcome | Accuracy | Brier Score |",
-                "| :--- | :--- | :--- | :--- | :--- | :--- |",
-            ]
-            performance_file.write_text("\n".join(header) + "\n")
+        # Append row (header first on a new scorecard)
+        self._append("performance.md", row + "\n")
+    
+    def log_outcomes_bulk(
+        self,
+        outcomes: list[tuple[str, bool, float]],
+        now: datetime | None = None,
+    ) -> None:
+        """
+        Log many (market_id, outcome, agent_prediction) resolutions at once.
+        
+        Produces the same rows as calling log_outcome() for each, but scores
+        them in one NumPy pass and appends them with a single write.
+        """
+        if not outcomes:
+            return
+        
+        date_str, _ = self._timestamp_parts(now)
+        
+        predictions = np.fromiter((p for _, _, p in outcomes), dtype=np.float64, count=len(outcomes))
+        resolved_yes = np.fromiter((o for _, o, _ in outcomes), dtype=bool, count=len(outcomes))
+        brier_scores = (predictions - resolved_yes) ** 2
+        correct = (predictions >= 0.5) == resolved_yes
         
-        # Append row
-        with open(performance_file, "a") as f:
-            f.write(row + "\n")
+        rows = [
+            f"| {date_str} | `{market_id[:10]}...` | {prediction:.1%} | {'YES' if outcome else 'NO'} "
+            f"| {'✅' if hit else '❌'} | {brier_score:.4f} |\n"
+            for (market_id, outcome, prediction), brier_score, hit in zip(
+                outcomes, brier_scores.tolist(), correct.tolist()
+            )
+        ]
+        self._append("performance.md", "".join(rows))
+    
+    # Async variants for use inside the trading loop: the file I/O runs in a
+    # worker thread so slow (e.g. network-mounted) log directories don't
+    # stall the event loop
+    
+    async def log_research_async(self, *args, **kwargs) -> Path:
+        """log_research() without blocking the event loop."""
+        return await asyncio.to_thread(self.log_research, *args, **kwargs)
+    
+    async def log_prediction_async(self, *args, **kwargs) -> None:
+        """log_prediction() without blocking the event loop."""
+        await asyncio.to_thread(self.log_prediction, *args, **kwargs)
+    
+    async def log_outcome_async(self, *args, **kwargs) -> None:
+        """log_outcome() without blocking the event loop."""
+        await asyncio.to_thread(self.log_outcome, *args, **kwargs)
+    
+    async def log_outcomes_bulk_async(self, *args, **kwargs) -> None:
+        """log_outcomes_bulk() without blocking the event loop."""
+        await asyncio.to_thread(self.log_outcomes_bulk, *args, **kwargs)
+    
+    @staticmethod
+    def _timestamp_parts(now: datetime | None = None) -> tuple[str, str]:
+        """UTC ("YYYY-MM-DD", "HH:MM:SS") for `now` (default: the current time; naive = UTC)."""
+        if now is None:
+            now = datetime.now(timezone.utc)
+        elif now.tzinfo is not None:
+            now = now.astimezone(timezone.utc)
+        return (
+            f"{now.year:04d}-{now.month:02d}-{now.day:02d}",
+            f"{now.hour:02d}:{now.minute:02d}:{now.second:02d}",
+        )
     
     def _slugify(self, text: str) -> str:
         """Create a clean filename from strings."""
-        text = text.lower()
-        text = re.sub(r'[^\w\s-]', '', text)
-        text = re.sub(r'[\s_-]+', '-', text)
-        return text.strip('-')
+        return _SLUG_DASHES.sub('-', _SLUG_STRIP.sub('', text.lower())).strip('-')
@@ -0,0 +1,36 @@
+"""
+TradingClaw OpenClaw Skill - Shared Transport
+
+One pooled HTTP transport for every TradingClawClient in the process, so
+several skills (or several agents) talking to the platform share their
+keep-alive connections instead of each holding its own pool.
+"""
+
+import httpx
+
+
+_transport: httpx.AsyncHTTPTransport | None = None
+
+
+def get_shared_transport() -> httpx.AsyncHTTPTransport:
+    """Process-wide HTTP/2 connection pool, created on first use."""
+    global _transport
+    if _transport is None:
+        _transport = httpx.AsyncHTTPTransport(
+            http2=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        )
+    return _transport
+
+
+async def close_shared_transport():
+    """
+    Close the shared connection pool (call from the host's shutdown/lifespan hook).
+
+    Pooled connections belong to the event loop that opened them, so close
+    the pool before that loop ends; the next client after this opens a new one.
+    """
+    global _transport
+    if _transport is not None:
+        await _transport.aclose()
+        _transport = None